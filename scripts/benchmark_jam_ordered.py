@@ -0,0 +1,39 @@
+import logging
+import os
+
+from rich.logging import RichHandler
+
+from smooth_criminal.benchmark import benchmark_jam
+
+
+log_level = os.getenv("LOG_LEVEL", "WARNING").upper()
+numeric_level = getattr(logging, log_level, logging.WARNING)
+
+logging.basicConfig(
+    level=numeric_level,
+    format="%(message)s",
+    handlers=[RichHandler(rich_tracebacks=True, markup=True)],
+    force=True,
+)
+
+logger = logging.getLogger("SmoothCriminal")
+
+
+def work(x):
+    total = 0
+    for i in range(200):
+        total += (x * i) % 7
+    return total
+
+
+if __name__ == "__main__":
+    numbers = list(range(200_000))
+    backends = ["thread", "process"]
+    for ordered in (False, True):
+        data = benchmark_jam(work, numbers, backends, workers=4, ordered=ordered)
+        for metric in data["metrics"]:
+            throughput = len(numbers) / metric["duration"]
+            print(
+                f"ordered={ordered!s:<5} backend={metric['backend']:<7} "
+                f"{metric['duration']:.3f}s  {throughput:,.0f} items/s"
+            )
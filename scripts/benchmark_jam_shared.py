@@ -0,0 +1,36 @@
+import logging
+import os
+import time
+
+import numpy as np
+from rich.logging import RichHandler
+
+from smooth_criminal.core import jam
+
+
+log_level = os.getenv("LOG_LEVEL", "WARNING").upper()
+numeric_level = getattr(logging, log_level, logging.WARNING)
+
+logging.basicConfig(
+    level=numeric_level,
+    format="%(message)s",
+    handlers=[RichHandler(rich_tracebacks=True, markup=True)],
+    force=True,
+)
+
+logger = logging.getLogger("SmoothCriminal")
+
+
+def normalize(row):
+    return row / np.linalg.norm(row)
+
+
+if __name__ == "__main__":
+    data = np.random.default_rng(0).random((20_000, 512))
+    for shared in (False, True):
+        wrapped = jam(workers=4, backend="process", shared_memory=shared)(normalize)
+        start = time.perf_counter()
+        wrapped(data)
+        duration = time.perf_counter() - start
+        label = "shared_memory" if shared else "pickle"
+        print(f"{label:<13} {duration:.3f}s  {data.nbytes / duration / 1e6:,.0f} MB/s")
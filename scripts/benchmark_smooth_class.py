@@ -0,0 +1,73 @@
+import logging
+import os
+import time
+
+import numpy as np
+from numba import float64
+from rich.logging import RichHandler
+
+from smooth_criminal.core import smooth
+
+
+log_level = os.getenv("LOG_LEVEL", "WARNING").upper()
+numeric_level = getattr(logging, log_level, logging.WARNING)
+
+logging.basicConfig(
+    level=numeric_level,
+    format="%(message)s",
+    handlers=[RichHandler(rich_tracebacks=True, markup=True)],
+    force=True,
+)
+
+STEPS = int(os.getenv("STEPS", "1000000"))
+PARTICLES = int(os.getenv("PARTICLES", "64"))
+
+
+class Particles:
+    """Sistema de partículas con muchos accesos a atributos por iteración."""
+
+    x: float64[:]
+    v: float64[:]
+    gravity: float
+    damping: float
+    bounces: int
+
+    def __init__(self, n, gravity, damping):
+        self.x = np.linspace(1.0, 2.0, n)
+        self.v = np.zeros(n)
+        self.gravity = gravity
+        self.damping = damping
+        self.bounces = 0
+
+    def step(self, dt, steps):
+        n = self.x.shape[0]
+        for s in range(steps):
+            i = s % n
+            self.v[i] -= self.gravity * dt
+            self.x[i] += self.v[i] * dt
+            if self.x[i] < 0.0:
+                self.x[i] = -self.x[i]
+                self.v[i] = -self.v[i] * self.damping
+                self.bounces += 1
+        return self.bounces
+
+
+SmoothParticles = smooth(Particles)
+
+
+def run_seconds(cls):
+    system = cls(PARTICLES, 9.8, 0.9)
+    system.step(1e-3, 10)  # compila antes de medir
+    start = time.perf_counter()
+    bounces = system.step(1e-3, STEPS)
+    return time.perf_counter() - start, bounces
+
+
+if __name__ == "__main__":
+    python_s, python_bounces = run_seconds(Particles)
+    smooth_s, smooth_bounces = run_seconds(SmoothParticles)
+    assert python_bounces == smooth_bounces
+    print(f"{'class':<10} {'seconds':>10}")
+    print(f"{'python':<10} {python_s:>10.4f}")
+    print(f"{'@smooth':<10} {smooth_s:>10.4f}")
+    print(f"speedup: {python_s / smooth_s:.1f}x ({STEPS} steps, {PARTICLES} particles)")
@@ -0,0 +1,101 @@
+import asyncio
+import logging
+import os
+import time
+
+import numpy as np
+from numba import guvectorize, njit, vectorize
+from rich.logging import RichHandler
+
+from smooth_criminal.core import (
+    bad,
+    guvectorized,
+    moonwalk,
+    set_log_mode,
+    smooth,
+    vectorized,
+)
+
+
+log_level = os.getenv("LOG_LEVEL", "WARNING").upper()
+numeric_level = getattr(logging, log_level, logging.WARNING)
+
+logging.basicConfig(
+    level=numeric_level,
+    format="%(message)s",
+    handlers=[RichHandler(rich_tracebacks=True, markup=True)],
+    force=True,
+)
+
+logger = logging.getLogger("SmoothCriminal")
+
+CALLS = int(os.getenv("CALLS", "200000"))
+MODES = ("always", "once", "sample", "off")
+
+
+def add(a, b):
+    return a + b
+
+
+def cumsum(x, out):
+    acc = 0.0
+    for i in range(x.shape[0]):
+        acc += x[i]
+        out[i] = acc
+
+
+def per_call_ns(func, *args):
+    func(*args)  # compila antes de medir
+    start = time.perf_counter()
+    for _ in range(CALLS):
+        func(*args)
+    return (time.perf_counter() - start) / CALLS * 1e9
+
+
+def per_await_ns(func, *args):
+    async def run():
+        for _ in range(CALLS // 10):
+            await func(*args)
+
+    start = time.perf_counter()
+    asyncio.run(run())
+    return (time.perf_counter() - start) / (CALLS // 10) * 1e9
+
+
+async def async_add(a, b):
+    return a + b
+
+
+def build(mode):
+    set_log_mode(mode)
+    return {
+        "smooth": (smooth(add), (1.0, 2.0)),
+        "bad": (bad()(add), (1.0, 2.0)),
+        "vectorized": (vectorized(["float64(float64, float64)"])(add), (1.0, 2.0)),
+        "guvectorized": (
+            guvectorized(["void(float64[:], float64[:])"], "(n)->(n)")(cumsum),
+            (np.ones(4), np.empty(4)),
+        ),
+        "moonwalk": (moonwalk(async_add), (1, 2)),
+    }
+
+
+if __name__ == "__main__":
+    baseline = {
+        "smooth": (njit(cache=True)(add), (1.0, 2.0)),
+        "bad": (njit(fastmath=True, cache=True)(add), (1.0, 2.0)),
+        "vectorized": (vectorize(["float64(float64, float64)"])(add), (1.0, 2.0)),
+        "guvectorized": (
+            guvectorize(["void(float64[:], float64[:])"], "(n)->(n)")(cumsum),
+            (np.ones(4), np.empty(4)),
+        ),
+        "moonwalk": (async_add, (1, 2)),
+    }
+    wrapped = {mode: build(mode) for mode in MODES}
+
+    print(f"{'decorator':<13} {'numba':>9} " + " ".join(f"{mode:>9}" for mode in MODES))
+    for name, (func, args) in baseline.items():
+        measure = per_await_ns if name == "moonwalk" else per_call_ns
+        row = [measure(func, *args)]
+        row += [measure(wrapped[mode][name][0], *args) for mode in MODES]
+        print(f"{name:<13} " + " ".join(f"{ns:>7.0f}ns" for ns in row))
@@ -24,6 +24,7 @@ setup(
     ],
     extras_require={
         "tinydb": ["tinydb"],
+        "cloudpickle": ["cloudpickle"],
         "sqlite": [],
     },
     entry_points={
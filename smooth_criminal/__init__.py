@@ -1,24 +1,79 @@
-"""Paquete principal de Smooth Criminal."""
+"""Paquete principal de Smooth Criminal.
+
+Los nombres públicos se cargan al usarlos por primera vez: ``import
+smooth_criminal`` no importa NumPy ni Numba, y Numba solo se importa cuando
+se aplica el primer decorador JIT.
+"""
+
+import importlib
+from typing import TYPE_CHECKING, Any, List
 
 __version__ = "0.5.0"
 
-from .core import (
-    smooth,
-    vectorized,
-    guvectorized,
-    moonwalk,
-    thriller,
-    jam,
-    black_or_white,
-    beat_it,
-    bad,
-    dangerous,
-    bad_and_dangerous,
-    profile_it,
-    mj_mode,
-)
-
-from .benchmark import benchmark_jam, detect_fastest_backend
+# Nombre público -> submódulo que lo define.
+_LAZY = {
+    "smooth": "core",
+    "vectorized": "core",
+    "guvectorized": "core",
+    "moonwalk": "core",
+    "thriller": "core",
+    "jam": "core",
+    "black_or_white": "core",
+    "beat_it": "core",
+    "bad": "core",
+    "dangerous": "core",
+    "bad_and_dangerous": "core",
+    "profile_it": "core",
+    "mj_mode": "core",
+    "set_log_mode": "core",
+    "available_backends": "core",
+    "gil_enabled": "core",
+    "warmup_all": "core",
+    "benchmark_jam": "benchmark",
+    "detect_fastest_backend": "benchmark",
+    "shutdown_pools": "pools",
+    "JamResult": "deadlines",
+    "Args": "workers",
+}
+
+if TYPE_CHECKING:
+    from .core import (
+        smooth,
+        vectorized,
+        guvectorized,
+        moonwalk,
+        thriller,
+        jam,
+        black_or_white,
+        beat_it,
+        bad,
+        dangerous,
+        bad_and_dangerous,
+        profile_it,
+        mj_mode,
+        set_log_mode,
+        available_backends,
+        gil_enabled,
+        warmup_all,
+    )
+    from .benchmark import benchmark_jam, detect_fastest_backend
+    from .deadlines import JamResult
+    from .workers import Args
+    from .pools import shutdown_pools
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY))
+
 
 __all__ = [
     "smooth",
@@ -34,7 +89,14 @@ __all__ = [
     "bad_and_dangerous",
     "profile_it",
     "mj_mode",
+    "set_log_mode",
+    "available_backends",
+    "gil_enabled",
+    "warmup_all",
     "benchmark_jam",
     "detect_fastest_backend",
+    "shutdown_pools",
+    "JamResult",
+    "Args",
     "__version__",
 ]
@@ -28,3 +28,553 @@ def analyze_ast(func):
     for finding in analyzer.findings:
         logger.info(f"  {finding}")
     return analyzer.findings
+
+
+# ---------------------------------------------------------------------------
+# Reescritura de bucles ``range`` a ``numba.prange`` para ``bad(parallel=True)``
+
+#: Nombre con el que el código reescrito ve a ``numba.prange``.
+PRANGE_NAME = "__smooth_prange__"
+
+# Métodos que modifican el objeto sobre el que se llaman.
+_MUTATING_METHODS = {
+    "append", "extend", "insert", "pop", "remove", "clear", "update", "add",
+    "discard", "setdefault", "popitem", "sort", "reverse", "fill", "resize", "put",
+}
+
+# Operadores de reducción que Numba sabe paralelizar.
+_REDUCTION_OPS = (ast.Add, ast.Sub, ast.Mult)
+
+
+# Funciones y métodos que devuelven siempre un arreglo nuevo.
+_ALLOCATORS = {
+    "zeros", "ones", "empty", "full", "zeros_like", "ones_like", "empty_like",
+    "full_like", "array", "copy", "arange", "linspace",
+}
+_COPY_METHODS = {"copy", "astype"}
+# Llamadas y atributos que devuelven escalares o metadatos, nunca una vista.
+_SCALAR_CALLS = {"range", "len", "int", "float", "bool", "abs", "round", "min", "max", "sum"}
+_SCALAR_ATTRS = {"shape", "size", "ndim", "dtype", "itemsize", "nbytes"}
+
+
+def _alias_roots(node):
+    """Nombres con los que el resultado de ``node`` puede compartir memoria.
+
+    ``a``, ``a[1:]``, ``a.T`` o ``a.reshape(...)`` devuelven ``{"a"}``; las
+    operaciones aritméticas y los constructores de NumPy (``np.zeros``,
+    ``a.copy()``...) crean arreglos nuevos.  Cualquier otra llamada puede
+    devolver uno de sus argumentos.
+    """
+    if isinstance(node, ast.Name):
+        return {node.id}
+    if isinstance(node, ast.Attribute) and node.attr in _SCALAR_ATTRS:
+        return set()
+    if isinstance(node, (ast.Subscript, ast.Attribute, ast.Starred)):
+        return _alias_roots(node.value)
+    if isinstance(node, ast.IfExp):
+        return _alias_roots(node.body) | _alias_roots(node.orelse)
+    if isinstance(node, (ast.Tuple, ast.List)):
+        return set().union(*(_alias_roots(e) for e in node.elts))
+    if isinstance(node, ast.NamedExpr):
+        return _alias_roots(node.value)
+    if isinstance(node, ast.Call):
+        func = node.func
+        name = func.attr if isinstance(func, ast.Attribute) else getattr(func, "id", None)
+        if isinstance(func, ast.Attribute) and name in _COPY_METHODS:
+            return set()
+        if name in _ALLOCATORS or (isinstance(func, ast.Name) and name in _SCALAR_CALLS):
+            return set()
+        roots = set()
+        if isinstance(func, ast.Attribute):
+            roots |= _alias_roots(func.value)
+        for arg in (*node.args, *(k.value for k in node.keywords)):
+            roots |= _alias_roots(arg)
+        return roots
+    return set()
+
+
+def _bindings(func_def):
+    """``(nombre, posibles alias)`` de cada asignación de la función."""
+    for node in ast.walk(func_def):
+        if isinstance(node, ast.Assign):
+            pairs = [(t, node.value) for t in node.targets]
+        elif isinstance(node, (ast.AnnAssign, ast.NamedExpr)) and node.value is not None:
+            pairs = [(node.target, node.value)]
+        elif isinstance(node, ast.For):
+            pairs = [(node.target, node.iter)]
+        else:
+            continue
+        for target, value in pairs:
+            if (
+                isinstance(target, (ast.Tuple, ast.List))
+                and isinstance(value, (ast.Tuple, ast.List))
+                and len(target.elts) == len(value.elts)
+            ):
+                for t, v in zip(target.elts, value.elts):
+                    yield from _bound_names(t, _alias_roots(v))
+            else:
+                yield from _bound_names(target, _alias_roots(value))
+
+
+def _bound_names(target, roots):
+    if isinstance(target, ast.Name):
+        yield target.id, roots
+    elif isinstance(target, (ast.Tuple, ast.List)):
+        for element in target.elts:
+            yield from _bound_names(element, roots)
+    elif isinstance(target, ast.Starred):
+        yield from _bound_names(target.value, roots)
+
+
+def _var_position(index, var):
+    """Posición de la variable del bucle, sola, en un índice (``None`` si no está)."""
+    elements = index.elts if isinstance(index, ast.Tuple) else [index]
+    for position, element in enumerate(elements):
+        if isinstance(element, ast.Name) and element.id == var:
+            return position
+    return None
+
+
+def _aliasing_problem(func_def, loop, var, writes):
+    """Motivo por el que los arreglos de ``loop`` pueden solaparse, o ``None``.
+
+    Un arreglo escrito no puede tomarse de otro nombre ni prestarse a otro.
+    Además, mientras se escribe algún arreglo, solo se puede leer otro en un
+    índice distinto de la variable del bucle si se sabe que no es el mismo
+    objeto: al menos uno de los dos se crea en la función con un
+    constructor (``np.zeros``, ``np.empty_like``, ``a.copy()``...).
+    """
+    if not writes:
+        return None
+    sources = {}
+    for name, roots in _bindings(func_def):
+        sources.setdefault(name, set()).update(roots - {name})
+        for root in roots - {name}:
+            if name in writes:
+                return f"'{name}' may alias '{root}'"
+            if root in writes:
+                return f"'{name}' may alias written array '{root}'"
+    params = {
+        a.arg
+        for a in (*func_def.args.posonlyargs, *func_def.args.args, *func_def.args.kwonlyargs)
+    }
+    fresh = {name for name, roots in sources.items() if not roots and name not in params}
+
+    def distinct(a, b):
+        return a != b and (a in fresh or b in fresh)
+
+    positions = {name: _var_position(index, var) for name, index in writes.items()}
+    for node in ast.walk(ast.Module(body=loop.body, type_ignores=[])):
+        if not (isinstance(node, ast.Subscript) and isinstance(node.ctx, ast.Load)):
+            continue
+        root = _subscript_root(node)
+        if root is None or root[0] in writes:
+            continue
+        name, indices = root
+        position = _var_position(indices[0], var) if len(indices) == 1 else None
+        for written, write_position in positions.items():
+            if distinct(name, written):
+                continue
+            if position is None or position != write_position:
+                return (
+                    f"'{name}' is read at another index while '{written}' is written "
+                    "and they may be the same array"
+                )
+    return None
+
+
+def _is_range_loop(node):
+    return (
+        isinstance(node, ast.For)
+        and isinstance(node.iter, ast.Call)
+        and isinstance(node.iter.func, ast.Name)
+        and node.iter.func.id == "range"
+    )
+
+
+def _outer_loops(stmts):
+    """Bucles ``for`` de ``stmts`` que no están dentro de otro bucle."""
+    for stmt in stmts:
+        if isinstance(stmt, (ast.For, ast.While)):
+            yield stmt
+        elif isinstance(stmt, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            continue
+        else:
+            for field in ("body", "orelse", "finalbody", "handlers"):
+                yield from _outer_loops(getattr(stmt, field, []) or [])
+
+
+def _subscript_root(node):
+    """Devuelve ``(nombre, índices)`` de ``a[i][j]`` o ``None`` si la base no es un nombre."""
+    indices = []
+    while isinstance(node, ast.Subscript):
+        indices.append(node.slice)
+        node = node.value
+    if isinstance(node, ast.Name):
+        return node.id, indices
+    return None
+
+
+def _indexed_by(indices, var):
+    for index in indices:
+        elements = index.elts if isinstance(index, ast.Tuple) else [index]
+        if any(isinstance(e, ast.Name) and e.id == var for e in elements):
+            return True
+    return False
+
+
+class _LoopBody:
+    """Recorre el cuerpo de un bucle en orden de ejecución buscando dependencias."""
+
+    def __init__(self, var, stored):
+        self.var = var
+        # Variables asignadas en algún punto del cuerpo.
+        self.stored = stored
+        # Operador de cada variable de reducción (``+=``, ``*=``...).
+        self.reductions = {}
+        # Variables con alguna asignación simple (no aumentada) en el cuerpo.
+        self.plain_stores = set()
+        self.writes = {}
+        # Índice (nodo) con el que se escribe cada arreglo.
+        self.write_index = {}
+        self.problem = None
+
+    def fail(self, reason):
+        if self.problem is None:
+            self.problem = reason
+
+    def collect_writes(self, stmts):
+        """Anota de antemano el índice con el que se escribe cada arreglo."""
+        module = ast.Module(body=stmts, type_ignores=[])
+        augmented = {
+            id(node.target) for node in ast.walk(module) if isinstance(node, ast.AugAssign)
+        }
+        self.plain_stores = {
+            node.id
+            for node in ast.walk(module)
+            if isinstance(node, ast.Name)
+            and isinstance(node.ctx, ast.Store)
+            and id(node) not in augmented
+        }
+        for node in ast.walk(module):
+            if isinstance(node, ast.Subscript) and isinstance(node.ctx, ast.Store):
+                root = _subscript_root(node)
+                if root is None:
+                    continue
+                key = ast.dump(ast.Subscript(value=node.value, slice=node.slice, ctx=ast.Load()))
+                if len(root[1]) == 1:
+                    self.write_index.setdefault(root[0], root[1][0])
+                else:
+                    self.write_index.setdefault(root[0], ast.Tuple(elts=[], ctx=ast.Load()))
+                if self.writes.setdefault(root[0], key) != key:
+                    self.fail(f"'{root[0]}' is written at different indices")
+
+    # -- expresiones -------------------------------------------------------
+    def loads(self, node, assigned):
+        for sub in ast.walk(node):
+            if isinstance(sub, ast.Name) and isinstance(sub.ctx, ast.Load):
+                self.load(sub.id, assigned)
+            elif isinstance(sub, ast.Subscript) and isinstance(sub.ctx, ast.Load):
+                root = _subscript_root(sub)
+                if root and root[0] in self.writes:
+                    if ast.dump(sub) != self.writes[root[0]]:
+                        self.fail(f"'{root[0]}' is read at a different index than it is written")
+            elif isinstance(sub, ast.Call) and isinstance(sub.func, ast.Attribute):
+                if sub.func.attr in _MUTATING_METHODS and isinstance(sub.func.value, ast.Name):
+                    self.fail(f"'{sub.func.value.id}.{sub.func.attr}()' mutates shared state")
+            elif isinstance(sub, (ast.Yield, ast.YieldFrom, ast.Await, ast.NamedExpr)):
+                self.fail(f"unsupported expression '{type(sub).__name__}'")
+        # Un arreglo escrito en el bucle solo puede aparecer indexado.
+        bases = {
+            id(sub.value)
+            for sub in ast.walk(node)
+            if isinstance(sub, ast.Subscript) and isinstance(sub.value, ast.Name)
+        }
+        for sub in ast.walk(node):
+            if (
+                isinstance(sub, ast.Name)
+                and sub.id in self.writes
+                and id(sub) not in bases
+            ):
+                self.fail(f"'{sub.id}' is used as a whole while being written")
+
+    def load(self, name, assigned):
+        if name in self.reductions:
+            self.fail(f"reduction variable '{name}' is also read inside the loop")
+        elif name in self.stored and name not in assigned:
+            self.fail(f"'{name}' carries a value from the previous iteration")
+
+    # -- destinos ----------------------------------------------------------
+    def store(self, target, assigned, augmented=False):
+        if isinstance(target, ast.Name):
+            if target.id == self.var:
+                self.fail(f"loop variable '{self.var}' is reassigned")
+            elif target.id in self.reductions:
+                self.fail(f"reduction variable '{target.id}' is also assigned inside the loop")
+            assigned.add(target.id)
+        elif isinstance(target, (ast.Tuple, ast.List)):
+            for element in target.elts:
+                self.store(element, assigned)
+        elif isinstance(target, ast.Subscript):
+            root = _subscript_root(target)
+            if root is None:
+                self.fail("store into a complex subscript")
+                return
+            name, indices = root
+            if not _indexed_by(indices, self.var):
+                self.fail(f"write to '{name}' is not indexed by '{self.var}'")
+            for index in indices:
+                self.loads(index, assigned)
+        elif isinstance(target, ast.Starred):
+            self.store(target.value, assigned)
+        else:
+            self.fail(f"store into {type(target).__name__.lower()}")
+
+    # -- sentencias --------------------------------------------------------
+    def run(self, stmts, assigned):
+        for stmt in stmts:
+            if self.problem:
+                return assigned
+            assigned = self.statement(stmt, assigned)
+        return assigned
+
+    def statement(self, stmt, assigned):
+        if isinstance(stmt, ast.Assign):
+            self.loads(stmt.value, assigned)
+            for target in stmt.targets:
+                self.store(target, assigned)
+        elif isinstance(stmt, ast.AnnAssign):
+            if stmt.value is not None:
+                self.loads(stmt.value, assigned)
+                self.store(stmt.target, assigned)
+        elif isinstance(stmt, ast.AugAssign):
+            self.loads(stmt.value, assigned)
+            if isinstance(stmt.target, ast.Name):
+                name = stmt.target.id
+                op = type(stmt.op)
+                if name in self.reductions:
+                    if self.reductions[name] is not op:
+                        self.fail(f"reduction variable '{name}' mixes operators")
+                elif name not in assigned:
+                    if not isinstance(stmt.op, _REDUCTION_OPS):
+                        self.fail(f"'{name}' carries a value from the previous iteration")
+                    elif name in self.plain_stores:
+                        self.fail(
+                            f"reduction variable '{name}' is also assigned inside the loop"
+                        )
+                    else:
+                        self.reductions[name] = op
+            else:
+                self.store(stmt.target, assigned)
+        elif isinstance(stmt, ast.If):
+            self.loads(stmt.test, assigned)
+            body = self.run(stmt.body, set(assigned))
+            orelse = self.run(stmt.orelse, set(assigned))
+            assigned = body & orelse
+        elif isinstance(stmt, (ast.For, ast.While)):
+            inner = set(assigned)
+            if isinstance(stmt, ast.For):
+                self.loads(stmt.iter, assigned)
+                self.store(stmt.target, inner)
+            else:
+                self.loads(stmt.test, assigned)
+            self.run(stmt.body, inner)
+            self.run(stmt.orelse, set(assigned))
+        elif isinstance(stmt, (ast.Expr, ast.Assert)):
+            for child in ast.iter_child_nodes(stmt):
+                self.loads(child, assigned)
+        elif isinstance(stmt, (ast.Pass, ast.Continue)):
+            pass
+        elif isinstance(stmt, ast.Break):
+            self.fail("loop contains 'break'")
+        else:
+            self.fail(f"loop contains '{type(stmt).__name__.lower()}'")
+        return assigned
+
+
+def _contains_escape(loop):
+    """Sentencias que no pueden aparecer en ningún punto de un bucle ``prange``."""
+    for node in ast.walk(loop):
+        if isinstance(node, ast.Return):
+            return "loop contains 'return'"
+        if isinstance(node, (ast.Global, ast.Nonlocal)):
+            return f"loop contains '{type(node).__name__.lower()}'"
+    return None
+
+
+def _check_loop(loop, loads_after, func_def=None):
+    """Motivo por el que ``loop`` no puede ser ``prange`` o ``None`` si puede."""
+    if loop.orelse:
+        return "for-else loop"
+    if not isinstance(loop.target, ast.Name):
+        return "loop target is not a single name"
+    if len(loop.iter.args) == 3:
+        return "range() with a step"
+    if loop.iter.keywords:
+        return "range() with keyword arguments"
+    reason = _contains_escape(loop)
+    if reason:
+        return reason
+
+    var = loop.target.id
+    stored = {
+        node.id
+        for node in ast.walk(ast.Module(body=loop.body, type_ignores=[]))
+        if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Store)
+    }
+    body = _LoopBody(var, stored)
+    body.collect_writes(loop.body)
+    body.run(loop.body, {var})
+    if body.problem:
+        return body.problem
+    if func_def is not None:
+        reason = _aliasing_problem(func_def, loop, var, body.write_index)
+        if reason:
+            return reason
+    escaping = sorted((stored - body.reductions.keys() | {var}) & loads_after)
+    if escaping:
+        return f"'{escaping[0]}' is used after the loop"
+    return None
+
+
+def _loads_after(func_def, end):
+    """Nombres leídos después de la línea ``end``.
+
+    No cuentan las lecturas de la variable de un bucle posterior dentro de
+    ese bucle, que ya no ven el valor anterior (``for i ...`` reutilizado).
+    """
+    rebound = set()
+    for node in ast.walk(func_def):
+        if isinstance(node, ast.For) and node.lineno > end and isinstance(node.target, ast.Name):
+            name = node.target.id
+            rebound.update(
+                id(sub)
+                for stmt in node.body
+                for sub in ast.walk(stmt)
+                if isinstance(sub, ast.Name) and sub.id == name
+            )
+    return {
+        node.id
+        for node in ast.walk(func_def)
+        if isinstance(node, ast.Name)
+        and isinstance(node.ctx, ast.Load)
+        and node.lineno > end
+        and id(node) not in rebound
+    }
+
+
+def _loop_header(loop):
+    return f"for {ast.unparse(loop.target)} in {ast.unparse(loop.iter)}"
+
+
+def plan_prange(tree, first_line=1):
+    """Decide qué bucles de la función ``tree`` pueden pasar a ``prange``.
+
+    Solo se consideran los bucles ``for ... in range(...)`` exteriores.  Un
+    bucle se rechaza si contiene ``break`` o ``return``, si lee en una
+    iteración un valor escalar de la anterior (salvo reducciones ``+=``,
+    ``-=`` o ``*=``), si escribe en un arreglo sin indexarlo con la variable
+    del bucle o lo lee en otro índice, si llama a métodos que modifican
+    objetos compartidos o si deja variables que se usan después del bucle.
+    También si un arreglo escrito puede ser otro nombre de la función (ver
+    :func:`_aliasing_problem`): los parámetros pueden recibir el mismo
+    arreglo, así que ``b[i] = a[i - 1]`` se queda en serie.
+
+    Devuelve ``(convertibles, informe)``; ``informe`` tiene las listas
+    ``converted`` y ``rejected`` con la línea del fichero, la cabecera del
+    bucle y, para los rechazados, el motivo.
+    """
+
+    func_def = tree.body[0]
+    report = {"converted": [], "rejected": []}
+    accepted = []
+    for loop in _outer_loops(func_def.body):
+        if not _is_range_loop(loop):
+            continue
+        loads_after = _loads_after(func_def, loop.end_lineno)
+        entry = {"line": loop.lineno + first_line - 1, "loop": _loop_header(loop)}
+        reason = _check_loop(loop, loads_after, func_def)
+        if reason is None:
+            accepted.append(loop)
+            report["converted"].append(entry)
+        else:
+            report["rejected"].append({**entry, "reason": reason})
+    return accepted, report
+
+
+def parallelize_loops(func):
+    """Devuelve una copia de ``func`` con los bucles seguros sobre ``numba.prange``.
+
+    Usa :func:`plan_prange` sobre el código fuente de ``func`` y compila la
+    versión reescrita con los mismos globales, valores por defecto y
+    variables libres.  Si no hay nada que convertir, o el código fuente no
+    está disponible, devuelve ``func`` sin cambios.  El segundo valor es el
+    informe de :func:`plan_prange`.
+    """
+
+    import textwrap
+    import types
+
+    from numba import prange
+
+    if hasattr(func, "__wrapped__"):
+        return func, {"converted": [], "rejected": [], "error": "function is already decorated"}
+    try:
+        source = textwrap.dedent(inspect.getsource(func))
+        tree = ast.parse(source)
+    except (OSError, TypeError, SyntaxError) as e:
+        return func, {"converted": [], "rejected": [], "error": f"source unavailable: {e}"}
+    func_def = tree.body[0] if tree.body else None
+    if not isinstance(func_def, ast.FunctionDef):
+        return func, {"converted": [], "rejected": [], "error": "not a function definition"}
+
+    first_line = func.__code__.co_firstlineno
+    loops, report = plan_prange(tree, first_line)
+    for entry in report["converted"]:
+        logger.info(f"🔀 prange: line {entry['line']} `{entry['loop']}` runs in parallel.")
+    for entry in report["rejected"]:
+        logger.info(f"🔒 prange: line {entry['line']} stays serial ({entry['reason']}).")
+    if not loops:
+        return func, report
+
+    for loop in loops:
+        loop.iter.func = ast.Name(id=PRANGE_NAME, ctx=ast.Load())
+    func_def.decorator_list = []
+
+    # Una función fábrica aporta ``prange`` y las variables libres de ``func``
+    # como celdas, sin tocar el espacio de nombres del módulo.
+    freevars = func.__code__.co_freevars
+    try:
+        cells = [cell.cell_contents for cell in func.__closure__ or ()]
+    except ValueError:
+        report["error"] = "closure variable is not bound yet"
+        report["rejected"] += [{**e, "reason": report["error"]} for e in report.pop("converted")]
+        report["converted"] = []
+        return func, report
+    factory = ast.FunctionDef(
+        name="__smooth_factory__",
+        args=ast.arguments(
+            posonlyargs=[],
+            args=[ast.arg(arg=name) for name in (PRANGE_NAME, *freevars)],
+            kwonlyargs=[],
+            kw_defaults=[],
+            defaults=[],
+        ),
+        body=[func_def, ast.Return(value=ast.Name(id=func_def.name, ctx=ast.Load()))],
+        decorator_list=[],
+    )
+    for node in (factory, *factory.body[1:]):
+        ast.copy_location(node, func_def)
+    module = ast.Module(body=[factory], type_ignores=[])
+    ast.fix_missing_locations(module)
+    ast.increment_lineno(module, first_line - 1)
+    code = compile(module, func.__code__.co_filename, "exec")
+    factory_code = next(c for c in code.co_consts if isinstance(c, types.CodeType))
+    build = types.FunctionType(factory_code, func.__globals__)
+    rewritten = build(prange, *cells)
+    rewritten.__defaults__ = func.__defaults__
+    rewritten.__kwdefaults__ = func.__kwdefaults__
+    rewritten.__qualname__ = func.__qualname__
+    rewritten.__module__ = func.__module__
+    rewritten.__doc__ = func.__doc__
+    return rewritten, report
@@ -1,24 +1,40 @@
 """Utilities to benchmark ``jam`` backends.
 
 This module provides :func:`benchmark_jam` to measure execution time of a
-function across the available ``jam`` backends (``thread``, ``process`` and
-``async``).  It also exposes :func:`detect_fastest_backend` which runs the
-benchmark and returns the fastest backend.
+function across the available ``jam`` backends (``thread``, ``process``,
+``async`` and, on Python 3.14+, ``interpreter``).  It also exposes
+:func:`detect_fastest_backend` which runs the benchmark and returns the
+fastest backend.
 """
 
 from __future__ import annotations
 
 import asyncio
 import time
-from typing import Any, Callable, Dict, List, Sequence
+from typing import Any, Callable, Dict, List, Optional, Sequence
 
-from .core import jam
+from .core import available_backends, gil_enabled, jam
 
 Backends = Sequence[str]
 
 
+def runs_in_parallel(backend: str) -> bool:
+    """Return whether ``backend`` runs CPU-bound Python code in parallel.
+
+    ``process`` and ``interpreter`` always do; ``thread`` only on a
+    free-threaded build with the GIL disabled.
+    """
+
+    if backend in ("process", "interpreter"):
+        return True
+    return backend == "thread" and not gil_enabled()
+
+
 def benchmark_jam(
-    func: Callable[[Any], Any], args: Sequence[Any], backends: Backends
+    func: Callable[[Any], Any],
+    args: Sequence[Any],
+    backends: Optional[Backends] = None,
+    **jam_kwargs: Any,
 ) -> Dict[str, Any]:
     """Benchmark ``func`` using ``jam`` with different backends.
 
@@ -30,21 +46,39 @@ def benchmark_jam(
     args:
         Sequence of arguments that will be fed to the function.
     backends:
-        Iterable with backend names (``thread``, ``process`` or ``async``).
+        Iterable with backend names (``thread``, ``process``,
+        ``interpreter`` or ``async``).  Defaults to
+        :func:`~smooth_criminal.core.available_backends`.
+    **jam_kwargs:
+        Extra options forwarded to :func:`~smooth_criminal.core.jam` (for
+        example ``ordered=True`` or ``chunksize``).  ``workers`` defaults to
+        ``len(args)``.
 
     Returns
     -------
     dict
         A dictionary containing a ``metrics`` list with timing information for
-        each backend and the name of the ``fastest`` backend.
+        each backend and the name of the ``fastest`` backend.  Each metric
+        also records whether the backend is ``parallel`` on this runtime and,
+        for ``cluster``, the throughput of each node in items per second
+        under ``nodes``.  Pass ``nodes=[...]`` through ``jam_kwargs`` to
+        benchmark the ``cluster`` backend.
     """
 
+    if backends is None:
+        backends = available_backends()
     metrics: List[Dict[str, Any]] = []
     for backend in backends:
-        metric: Dict[str, Any] = {"backend": backend, "success": False}
-        wrapped = jam(workers=len(args), backend=backend)(func)
-        start = time.perf_counter()
+        metric: Dict[str, Any] = {
+            "backend": backend,
+            "success": False,
+            "parallel": runs_in_parallel(backend),
+        }
+        options = {"workers": len(args), **jam_kwargs}
         try:
+            # An option this backend rejects only marks this backend as failed.
+            wrapped = jam(backend=backend, **options)(func)
+            start = time.perf_counter()
             if backend == "async":
                 asyncio.run(wrapped(args))
             else:
@@ -54,6 +88,11 @@ def benchmark_jam(
         else:
             end = time.perf_counter()
             metric.update({"duration": end - start, "success": True})
+            stats = getattr(wrapped, "stats", None)
+            if stats and "nodes" in stats:
+                metric["nodes"] = {
+                    node["node"]: node["throughput"] for node in stats["nodes"]
+                }
         metrics.append(metric)
 
     successful = [m for m in metrics if m.get("success")]
@@ -66,7 +105,9 @@ def benchmark_jam(
 
 
 def detect_fastest_backend(
-    func: Callable[[Any], Any], args: Sequence[Any], backends: Backends
+    func: Callable[[Any], Any],
+    args: Sequence[Any],
+    backends: Optional[Backends] = None,
 ) -> str:
     """Return the fastest backend for ``func`` over ``args``.
 
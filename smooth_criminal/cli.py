@@ -5,36 +5,34 @@ import inspect
 import logging
 import os
 import json
+import sys
 
-from rich.console import Console
 from rich.logging import RichHandler
-from rich.table import Table
-
-from smooth_criminal.analizer import analyze_ast
-from smooth_criminal.benchmark import benchmark_jam
-from smooth_criminal.dashboard import render_dashboard
-from smooth_criminal.memory import (
-    suggest_boost,
-    clear_execution_history,
-    export_execution_history,
-    score_function,
-)
-from smooth_criminal.core import play_mj_effect, set_mj_mode
-
-
-log_level = os.getenv("LOG_LEVEL", "INFO").upper()
-numeric_level = getattr(logging, log_level, logging.INFO)
-
-logging.basicConfig(
-    level=numeric_level,
-    format="%(message)s",
-    handlers=[RichHandler(rich_tracebacks=True, markup=True)],
-    force=True,
-)
+
+# El resto de dependencias (Numba, NumPy, el dashboard, las exportaciones...)
+# se importan dentro de cada comando para que la CLI arranque rápido.
+
 
 logger = logging.getLogger("SmoothCriminal")
 
+
+def configure_logging():
+    """Configura el registro de la CLI (nivel en ``LOG_LEVEL``, INFO por defecto).
+
+    La biblioteca no toca la configuración de ``logging``; solo la CLI, que es
+    la aplicación, instala su manejador.
+    """
+    log_level = os.getenv("LOG_LEVEL", "INFO").upper()
+    logging.basicConfig(
+        level=getattr(logging, log_level, logging.INFO),
+        format="%(message)s",
+        handlers=[RichHandler(rich_tracebacks=True, markup=True)],
+        force=True,
+    )
+
+
 def main():
+    configure_logging()
     parser = argparse.ArgumentParser(description="Smooth Criminal CLI")
     parser.add_argument(
         "--mj-mode",
@@ -92,8 +90,50 @@ def main():
         help="Muestra solo el resultado en formato JSON",
     )
 
+    # Comando 'worker'
+    worker_parser = subparsers.add_parser(
+        "worker", help="Arranca un nodo del backend cluster de jam"
+    )
+    worker_parser.add_argument(
+        "--listen",
+        default="127.0.0.1:6789",
+        help="Dirección host:puerto en la que escuchar",
+    )
+    worker_parser.add_argument(
+        "--authkey",
+        default=None,
+        help="Clave compartida (por defecto SMOOTH_CRIMINAL_AUTHKEY)",
+    )
+
+    # Comando 'cache'
+    cache_parser = subparsers.add_parser(
+        "cache", help="Gestiona la caché en disco de Numba"
+    )
+    cache_parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help="Directorio de la caché (por defecto SMOOTH_CRIMINAL_CACHE_DIR)",
+    )
+    cache_subparsers = cache_parser.add_subparsers(dest="cache_command")
+    prewarm_parser = cache_subparsers.add_parser(
+        "prewarm", help="Importa un módulo y compila sus funciones registradas"
+    )
+    prewarm_parser.add_argument("module", help="Módulo a precompilar")
+    cache_subparsers.add_parser(
+        "stats", help="Muestra tamaño, entradas y aciertos de la caché"
+    )
+    clear_parser = cache_subparsers.add_parser(
+        "clear", help="Elimina las entradas obsoletas de la caché"
+    )
+    clear_parser.add_argument(
+        "--all", action="store_true", help="Elimina también las entradas vigentes"
+    )
+
     args = parser.parse_args()
-    set_mj_mode(args.mj_mode)
+    if args.mj_mode:
+        from smooth_criminal.core import set_mj_mode
+
+        set_mj_mode(True)
     if not getattr(args, "silent", False):
         show_intro()
 
@@ -102,6 +142,8 @@ def main():
     elif args.command == "suggest":
         handle_suggestion(args.func_name)
     elif args.command == "dashboard":
+        from smooth_criminal.dashboard import render_dashboard
+
         render_dashboard()
     elif args.command == "clean":
         handle_clean()
@@ -113,6 +155,15 @@ def main():
         handle_jam_test(
             args.func_path, args.workers, args.reps, args.silent, args.mj_mode
         )
+    elif args.command == "worker":
+        handle_worker(args.listen, args.authkey)
+    elif args.command == "cache":
+        handle_cache(
+            args.cache_command,
+            args.cache_dir,
+            module=getattr(args, "module", None),
+            everything=getattr(args, "all", False),
+        )
 
     else:
         logger.warning(
@@ -130,6 +181,8 @@ def show_intro():
     )
 
 def analyze_file(filepath):
+    from smooth_criminal.analizer import analyze_ast
+
     logger.info(
         f"\n🎤 [cyan]Analyzing [bold]{filepath}[/bold] for optimization opportunities...[/cyan]\n"
     )
@@ -152,6 +205,8 @@ def analyze_file(filepath):
         analyze_ast(func)
 
 def handle_suggestion(func_name):
+    from smooth_criminal.memory import suggest_boost
+
     logger.info(
         f"\n🧠 [bold cyan]Consulting memory for:[/bold cyan] [white]{func_name}[/white]\n"
     )
@@ -159,12 +214,16 @@ def handle_suggestion(func_name):
     logger.info(suggestion)
 
 def handle_clean():
+    from smooth_criminal.memory import clear_execution_history
+
     if clear_execution_history():
         logger.info("[green]Historial de ejecuciones borrado exitosamente.[/green]")
     else:
         logger.warning("[yellow]No se encontró historial para borrar.[/yellow]")
 
 def handle_export(filepath, format):
+    from smooth_criminal.memory import export_execution_history
+
     success = export_execution_history(filepath, format)
     if success:
         logger.info(
@@ -174,6 +233,8 @@ def handle_export(filepath, format):
         logger.warning("[yellow]No hay historial para exportar.[/yellow]")
 
 def handle_score(func_name):
+    from smooth_criminal.memory import score_function
+
     score, summary = score_function(func_name)
     if score is None:
         logger.warning(f"[yellow]{summary}[/yellow]")
@@ -186,11 +247,17 @@ def handle_score(func_name):
 def handle_jam_test(
     func_path: str, workers: int, reps: int, silent: bool, mj_mode: bool
 ) -> None:
+    from rich.console import Console
+    from rich.table import Table
+
+    from smooth_criminal.benchmark import benchmark_jam
+    from smooth_criminal.core import available_backends, play_mj_effect
+
     module_name, func_name = func_path.split(":", 1)
     module = importlib.import_module(module_name)
     func = getattr(module, func_name)
 
-    backends = ["thread", "process", "async"]
+    backends = available_backends()
     args = list(range(workers))
     if silent:
         logging.disable(logging.CRITICAL)
@@ -234,5 +301,68 @@ def handle_jam_test(
     logger.info("🎶 Just jammin' through those CPU cores! 🧠🕺")
 
 
+def handle_worker(listen: str, authkey=None) -> None:
+    from smooth_criminal.cluster import serve_worker
+
+    try:
+        serve_worker(listen, authkey)
+    except ValueError as e:
+        logger.error(f"[red]{e}[/red]")
+    except KeyboardInterrupt:
+        logger.info("🎤 Worker stopped. This is it!")
+
+
+def handle_cache(command, cache_dir=None, module=None, everything=False) -> None:
+    from rich.console import Console
+    from rich.table import Table
+
+    from smooth_criminal import jitcache
+
+    if cache_dir:
+        jitcache.configure_cache_dir(cache_dir)
+
+    if command == "prewarm":
+        if os.getcwd() not in sys.path:
+            sys.path.insert(0, os.getcwd())
+        report = jitcache.prewarm(module)
+        if not report["functions"]:
+            logger.warning(
+                f"[yellow]No hay funciones registradas en {module}.[/yellow]"
+            )
+            return
+        for name, signatures in report["functions"].items():
+            logger.info(f"🔥 [cyan]{name}[/cyan]: {', '.join(signatures) or '-'}")
+        logger.info(
+            f"[green]Cache hits: {report['hits']} · misses: {report['misses']}[/green]"
+        )
+    elif command == "stats":
+        stats = jitcache.cache_stats()
+        table = Table(title=f"Caché de Numba en {stats['path']}")
+        table.add_column("Métrica")
+        table.add_column("Valor", justify="right")
+        table.add_row("Tamaño (KiB)", f"{stats['size'] / 1024:.1f}")
+        table.add_row("Funciones", str(stats["functions"]))
+        table.add_row("Entradas", str(stats["entries"]))
+        table.add_row("Obsoletas", str(len(stats["stale"])))
+        table.add_row("Huérfanas", str(stats["orphans"]))
+        table.add_row("Hits (último prewarm)", str(stats["hits"]))
+        table.add_row("Misses (último prewarm)", str(stats["misses"]))
+        Console().print(table)
+        for index, reason in stats["stale"].items():
+            logger.info(f"[yellow]{index}[/yellow]: {reason}")
+    elif command == "clear":
+        result = jitcache.clear_cache(everything=everything)
+        logger.info(
+            f"[green]Eliminados {result['removed']} ficheros "
+            f"({result['freed'] / 1024:.1f} KiB).[/green]"
+        )
+    else:
+        logger.warning(
+            "Use '[green]smooth-criminal cache prewarm <module>[/green]', "
+            "'[green]smooth-criminal cache stats[/green]' or "
+            "'[green]smooth-criminal cache clear[/green]'."
+        )
+
+
 if __name__ == "__main__":
     main()
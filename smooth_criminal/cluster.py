@@ -0,0 +1,213 @@
+"""Backend ``cluster`` de :func:`smooth_criminal.core.jam` sobre varias máquinas.
+
+Cada nodo es un *worker* independiente que se arranca con
+``smooth-criminal worker --listen host:puerto`` (o :func:`serve_worker`) y
+recibe porciones de la entrada a través de :mod:`multiprocessing.connection`
+sobre TCP.  Las conexiones se autentican con una clave compartida que se pasa
+explícitamente o mediante la variable de entorno ``SMOOTH_CRIMINAL_AUTHKEY``.
+
+En el cliente hay un hilo por nodo que toma porciones de una cola común, de
+modo que los nodos más rápidos procesan más trabajo.  Si un nodo se cae, la
+porción que tenía en curso vuelve a la cola y la terminan los demás.  La
+función se envía por referencia (módulo y nombre), así que debe poder
+importarse en todos los nodos.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import queue
+import threading
+import time
+from multiprocessing.connection import Client, Listener
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+logger = logging.getLogger("SmoothCriminal")
+
+#: Variable de entorno con la clave compartida por cliente y nodos.
+AUTHKEY_ENV = "SMOOTH_CRIMINAL_AUTHKEY"
+
+Address = Tuple[str, int]
+
+
+def parse_address(address: Union[str, Address]) -> Address:
+    """Convierte ``"host:puerto"`` en la tupla que espera ``multiprocessing``."""
+    if isinstance(address, tuple):
+        return address[0], int(address[1])
+    host, sep, port = address.rpartition(":")
+    if not sep or not port.isdigit():
+        raise ValueError(f"Invalid node address: {address!r} (expected host:port)")
+    return host or "127.0.0.1", int(port)
+
+
+def resolve_authkey(authkey: Union[str, bytes, None] = None) -> bytes:
+    """Devuelve la clave explícita o la de ``SMOOTH_CRIMINAL_AUTHKEY``."""
+    if authkey is None:
+        authkey = os.environ.get(AUTHKEY_ENV)
+    if not authkey:
+        raise ValueError(
+            f"The cluster backend requires an authkey or the {AUTHKEY_ENV} variable"
+        )
+    return authkey.encode() if isinstance(authkey, str) else authkey
+
+
+def _handle(conn) -> None:
+    """Atiende una conexión de cliente hasta que se cierra."""
+    from smooth_criminal.workers import apply_chunk
+
+    with conn:
+        while True:
+            try:
+                message = conn.recv()
+            except (EOFError, OSError):
+                return
+            kind = message[0]
+            if kind == "close":
+                return
+            if kind == "ping":
+                conn.send(("pong", os.getpid()))
+                continue
+            _, chunk_id, ref, chunk = message
+            start = time.perf_counter()
+            try:
+                results = apply_chunk(ref.resolve(), chunk)
+            except Exception as e:
+                conn.send(("error", chunk_id, f"{type(e).__name__}: {e}"))
+                continue
+            conn.send(("result", chunk_id, results, time.perf_counter() - start))
+
+
+def serve_worker(
+    address: Union[str, Address],
+    authkey: Union[str, bytes, None] = None,
+    *,
+    ready: Optional[Callable[[Address], Any]] = None,
+) -> None:
+    """Arranca un nodo del backend ``cluster`` y atiende conexiones sin fin.
+
+    Cada conexión se procesa en su propio hilo.  ``ready`` recibe la dirección
+    real en la que escucha el nodo (útil con el puerto ``0``).
+    """
+
+    listener = Listener(parse_address(address), authkey=resolve_authkey(authkey))
+    host, port = listener.address
+    logger.info(f"🕺 Smooth worker listening on {host}:{port}")
+    if ready is not None:
+        ready(listener.address)
+    with listener:
+        while True:
+            try:
+                conn = listener.accept()
+            except OSError as e:
+                # Incluye los fallos de autenticación: se rechaza solo ese cliente.
+                logger.warning(f"Rejected cluster connection: {e}")
+                continue
+            threading.Thread(target=_handle, args=(conn,), daemon=True).start()
+
+
+def run_cluster(
+    nodes: Sequence[Union[str, Address]],
+    ref: Any,
+    args_list: Sequence[Any],
+    chunksize: int,
+    authkey: Union[str, bytes, None] = None,
+    *,
+    poll: float = 0.05,
+) -> Tuple[List[Tuple[int, List[Any]]], Dict[str, Any]]:
+    """Reparte ``args_list`` entre ``nodes`` y recoge los resultados.
+
+    Devuelve pares ``(inicio, resultados)`` y estadísticas por nodo con las
+    porciones, elementos, tiempo de cómputo, rendimiento (elementos por
+    segundo) y si el nodo siguió vivo hasta el final.  Si todos los nodos
+    fallan con trabajo pendiente se lanza ``RuntimeError``.
+    """
+
+    if not nodes:
+        raise ValueError("The cluster backend requires at least one node")
+    key = resolve_authkey(authkey)
+    addresses = [parse_address(node) for node in nodes]
+
+    pending: "queue.Queue[Tuple[int, Sequence[Any]]]" = queue.Queue()
+    for start in range(0, len(args_list), chunksize):
+        pending.put((start, args_list[start : start + chunksize]))
+    outstanding = [pending.qsize()]
+    lock = threading.Lock()
+    outputs: List[Tuple[int, List[Any]]] = []
+    errors: List[str] = []
+    stats = [
+        {
+            "node": f"{host}:{port}",
+            "chunks": 0,
+            "items": 0,
+            "busy": 0.0,
+            "resubmitted": 0,
+            "alive": True,
+        }
+        for host, port in addresses
+    ]
+
+    def finished() -> bool:
+        with lock:
+            return outstanding[0] == 0 or bool(errors)
+
+    def drive(index: int) -> None:
+        node = stats[index]
+        try:
+            conn = Client(addresses[index], authkey=key)
+        except Exception as e:
+            logger.warning(f"Cluster node {node['node']} unreachable: {e}")
+            node["alive"] = False
+            return
+        with conn:
+            while not finished():
+                try:
+                    start, chunk = pending.get(timeout=poll)
+                except queue.Empty:
+                    continue
+                try:
+                    conn.send(("chunk", start, ref, chunk))
+                    reply = conn.recv()
+                except Exception as e:
+                    logger.warning(
+                        f"Cluster node {node['node']} died, resubmitting chunk {start}: {e}"
+                    )
+                    node["alive"] = False
+                    node["resubmitted"] += 1
+                    pending.put((start, chunk))
+                    return
+                if reply[0] == "error":
+                    with lock:
+                        errors.append(f"{node['node']}: {reply[2]}")
+                    return
+                _, _, results, compute = reply
+                node["chunks"] += 1
+                node["items"] += len(chunk)
+                node["busy"] += compute
+                with lock:
+                    outputs.append((start, results))
+                    outstanding[0] -= 1
+            try:
+                conn.send(("close",))
+            except Exception:
+                pass
+
+    wall_start = time.perf_counter()
+    threads = [
+        threading.Thread(target=drive, args=(i,), daemon=True)
+        for i in range(len(addresses))
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - wall_start
+
+    if errors:
+        raise RuntimeError(f"Cluster chunk failed on {errors[0]}")
+    if outstanding[0]:
+        raise RuntimeError("All cluster nodes failed with work still pending")
+
+    for node in stats:
+        node["throughput"] = node["items"] / wall if wall > 0 else 0.0
+    return outputs, {"schedule": "cluster", "wall": wall, "nodes": stats}
@@ -0,0 +1,136 @@
+"""Conversión de listas y diccionarios a tipos que Numba recibe sin copias.
+
+Numba solo admite listas de Python como *reflected lists* (obsoletas, se
+copian en cada llamada) y no admite ``dict``.  :func:`to_numba` convierte:
+
+* listas numéricas homogéneas (también anidadas y rectangulares) en
+  :class:`numpy.ndarray` con el modo ``"array"``;
+* el resto de listas homogéneas, o todas con el modo ``"typed"``, en
+  ``numba.typed.List``;
+* diccionarios con claves y valores homogéneos en ``numba.typed.Dict``.
+
+Lo que no se puede convertir se devuelve tal cual.  :class:`ConversionCache`
+recuerda las conversiones por identidad del objeto original para no
+repetirlas en llamadas sucesivas con la misma lista o diccionario.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Any, Tuple
+
+import numpy as np
+
+#: Modos de conversión admitidos por :func:`to_numba`.
+MODES = ("array", "typed")
+
+#: Conversiones que guarda cada :class:`ConversionCache`.
+CACHE_SIZE = 64
+
+_NUMERIC_KINDS = "biufc"
+
+
+def to_numba(value: Any, mode: str = "array") -> Any:
+    """Convierte ``value`` en un arreglo o contenedor tipado de Numba.
+
+    Devuelve el mismo objeto si no es una lista o un diccionario, si está
+    vacío (no hay tipo que inferir) o si sus elementos no son homogéneos.
+
+    >>> to_numba([1.0, 2.0])
+    array([1., 2.])
+    >>> to_numba((1, 2))
+    (1, 2)
+    """
+
+    if mode not in MODES:
+        raise ValueError(f"convert must be one of {MODES}")
+    if isinstance(value, list):
+        return _convert_list(value, mode)
+    if isinstance(value, dict):
+        return _convert_dict(value, mode)
+    return value
+
+
+def _convert_list(value: list, mode: str) -> Any:
+    if not value:
+        return value
+    if mode == "array":
+        try:
+            array = np.asarray(value)
+        except ValueError:  # listas anidadas de distinta longitud
+            array = None
+        if array is not None and array.dtype.kind in _NUMERIC_KINDS:
+            return array
+    from numba.typed import List
+
+    try:
+        return List(to_numba(item, mode) for item in value)
+    except Exception:
+        return value
+
+
+def _convert_dict(value: dict, mode: str) -> Any:
+    if not value:
+        return value
+    from numba import typeof
+    from numba.typed import Dict
+
+    try:
+        items = [(key, to_numba(item, mode)) for key, item in value.items()]
+        key, item = items[0]
+        typed = Dict.empty(key_type=typeof(key), value_type=typeof(item))
+        for key, item in items:
+            typed[key] = item
+    except Exception:
+        return value
+    return typed
+
+
+class ConversionCache:
+    """Conversiones recientes indexadas por la identidad del objeto original.
+
+    Se guarda una referencia al original, de modo que su ``id`` no puede
+    reutilizarse mientras la entrada exista, y su longitud: si cambia, se
+    vuelve a convertir.  Los cambios de elementos sin cambiar la longitud no
+    se detectan; tras modificar una entrada en el sitio hay que llamar a
+    :meth:`clear`.
+    """
+
+    def __init__(self, mode: str = "array", size: int = CACHE_SIZE) -> None:
+        if mode not in MODES:
+            raise ValueError(f"convert must be one of {MODES}")
+        self.mode = mode
+        self.size = size
+        self.hits = 0
+        self.conversions = 0
+        self._entries: "OrderedDict[int, Tuple[Any, int, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def convert(self, value: Any) -> Tuple[Any, bool]:
+        """Devuelve ``(convertido, nuevo)``; ``nuevo`` indica si se acaba de convertir."""
+
+        if not isinstance(value, (list, dict)):
+            return value, False
+        key = id(value)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] is value and entry[1] == len(value):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[2], False
+        converted = to_numba(value, self.mode)
+        with self._lock:
+            self._entries[key] = (value, len(value), converted)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+            if converted is not value:
+                self.conversions += 1
+        return converted, converted is not value
+
+    def clear(self) -> None:
+        """Olvida todas las conversiones."""
+
+        with self._lock:
+            self._entries.clear()
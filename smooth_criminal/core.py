@@ -1,23 +1,34 @@
 import statistics
-from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    as_completed,
+    wait,
+)
 import inspect
+import itertools
+import math
 import ast
 import sys
+import threading
 import os
 import random
+import functools
+import typing
+import weakref
 
-from numba import jit, vectorize as nb_vectorize, guvectorize as nb_guvectorize
-import numpy as np
 import asyncio
 import logging
 import time
 from functools import wraps
 from typing import (
     Any,
+    Set,
     Awaitable,
     Callable,
     Dict,
     Iterable,
+    Iterator,
     List,
     Optional,
     ParamSpec,
@@ -29,12 +40,59 @@ from typing import (
     Literal,
 )
 
-from smooth_criminal import memory
+from smooth_criminal import jitcache, memory, shipping
 from smooth_criminal.memory import log_execution_stats
+from smooth_criminal.deadlines import CancelScope, JamResult
+from smooth_criminal.workers import (
+    MISSING as _MISSING,
+    FuncRef as _FuncRef,
+    apply_batch as _apply_batch,
+    apply_chunk as _apply_chunk,
+    bind as _bind,
+    process_batch as _process_batch,
+    process_chunk as _process_chunk,
+    process_chunk_timed as _process_chunk_timed,
+)
+from smooth_criminal.pools import (
+    WorkerPool,
+    abandon_executor,
+    borrow_executor,
+    create_executor,
+    get_pool,
+    supports,
+)
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("SmoothCriminal")
 
+# ``SMOOTH_CRIMINAL_CACHE_DIR`` debe aplicarse antes de decorar nada.
+jitcache.configure_cache_dir()
+
+
+def _numba():
+    """Devuelve :mod:`numba`, que no se importa hasta el primer decorador JIT."""
+
+    import numba
+
+    return numba
+
+
+def _numpy():
+    """Devuelve :mod:`numpy`, que tampoco se importa al cargar el paquete."""
+
+    import numpy
+
+    return numpy
+
+
+def _is_ndarray(value: Any) -> bool:
+    """``isinstance(value, numpy.ndarray)`` sin importar NumPy.
+
+    Si nadie ha importado NumPy todavía, ``value`` no puede ser un arreglo.
+    """
+
+    numpy = sys.modules.get("numpy")
+    return numpy is not None and isinstance(value, numpy.ndarray)
+
 # Flag global para activar efectos de MJ
 MJ_MODE = False
 
@@ -57,6 +115,112 @@ def set_mj_mode(enabled: bool) -> None:
     MJ_MODE = enabled
 
 
+LogMode = Literal["always", "once", "sample", "off"]
+_LOG_MODES = ("always", "once", "sample", "off")
+
+
+
+def _env_log_mode(default: str = "always") -> str:
+    """Lee ``SMOOTH_CRIMINAL_LOG_MODE``; un valor desconocido deja ``default``."""
+
+    mode = os.getenv("SMOOTH_CRIMINAL_LOG_MODE", default).lower()
+    if mode not in _LOG_MODES:
+        logger.warning(
+            f"Beat it! Ignoring SMOOTH_CRIMINAL_LOG_MODE={mode!r}: expected one of "
+            f"{', '.join(_LOG_MODES)}; using {default!r}."
+        )
+        return default
+    return mode
+
+
+def _env_log_sample(default: int = 100) -> int:
+    """Lee ``SMOOTH_CRIMINAL_LOG_SAMPLE``; un valor no válido deja ``default``.
+
+    Un error de configuración no debe impedir importar el paquete.
+    """
+
+    raw = os.getenv("SMOOTH_CRIMINAL_LOG_SAMPLE")
+    if raw is None:
+        return default
+    try:
+        rate = int(raw)
+    except ValueError:
+        rate = 0
+    if rate < 1:
+        logger.warning(
+            f"Beat it! Ignoring SMOOTH_CRIMINAL_LOG_SAMPLE={raw!r}: expected a "
+            f"positive integer; using {default}."
+        )
+        return default
+    return rate
+
+
+# Modo de registro de los envoltorios de ``smooth``, ``vectorized``,
+# ``guvectorized``, ``bad`` y ``moonwalk`` (ver :func:`set_log_mode`).
+LOG_MODE: str = _env_log_mode()
+LOG_SAMPLE_RATE: int = _env_log_sample()
+
+
+def set_log_mode(mode: LogMode, sample_rate: Optional[int] = None) -> None:
+    """Elige cuánto registran los decoradores en cada llamada.
+
+    El modo se aplica a las funciones que se decoren a partir de ese momento,
+    por lo que debe fijarse antes de importar el código decorado (también
+    puede hacerse con las variables de entorno ``SMOOTH_CRIMINAL_LOG_MODE`` y
+    ``SMOOTH_CRIMINAL_LOG_SAMPLE``).
+
+    Parameters
+    ----------
+    mode:
+        ``"always"`` registra cada llamada (por defecto), ``"once"`` solo la
+        primera de cada función, ``"sample"`` una de cada ``sample_rate`` y
+        ``"off"`` ninguna: ``smooth``, ``bad``, ``vectorized`` y
+        ``guvectorized`` devuelven directamente el *dispatcher* de Numba, sin
+        envoltorio ni *fallback* en tiempo de ejecución.
+    sample_rate:
+        Frecuencia de muestreo del modo ``"sample"``.
+    """
+
+    global LOG_MODE, LOG_SAMPLE_RATE
+    if mode not in _LOG_MODES:
+        raise ValueError(f"Unknown log mode: {mode}")
+    if sample_rate is not None:
+        if sample_rate < 1:
+            raise ValueError("sample_rate must be a positive integer")
+        LOG_SAMPLE_RATE = sample_rate
+    LOG_MODE = mode
+
+
+def _hot_path_log(message: str) -> Optional[Callable[[], None]]:
+    """Prepara el registro por llamada de un envoltorio según :data:`LOG_MODE`.
+
+    Devuelve ``None`` con el modo ``"off"``, para que el decorador prescinda
+    del envoltorio.
+    """
+
+    if LOG_MODE == "off":
+        return None
+    if LOG_MODE == "once":
+        pending = [True]
+
+        def log_once() -> None:
+            if pending[0]:
+                pending[0] = False
+                logger.info(message)
+
+        return log_once
+    if LOG_MODE == "sample":
+        counter = itertools.count()
+        rate = LOG_SAMPLE_RATE
+
+        def log_sample() -> None:
+            if next(counter) % rate == 0:
+                logger.info(message)
+
+        return log_sample
+    return functools.partial(logger.info, message)
+
+
 def play_mj_effect(improvement: float, mj_mode: bool | None = None, *, threshold: float = 10.0) -> None:
     """Reproduce un efecto especial al mejorar el rendimiento.
 
@@ -117,28 +281,761 @@ def mj_mode(func: Callable[P, T]) -> Callable[P, T]:
     return decorator(func)
 
 
-def _process_worker(module_name: str, func_name: str, q) -> List[T]:
-    from queue import Empty
-    import importlib
+#: Backends de ``jam`` que ejecutan la función fuera del intérprete actual y
+#: reciben porciones serializadas junto con una :class:`_FuncRef`.
+_REMOTE_BACKENDS = ("process", "interpreter")
+
+
+def gil_enabled() -> bool:
+    """Indica si el intérprete actual ejecuta con GIL.
+
+    En las compilaciones *free-threaded* de CPython (3.13t en adelante) con el
+    GIL desactivado los hilos de ``jam(backend="thread")`` corren en paralelo
+    real también con código Python puro.
+    """
+
+    check = getattr(sys, "_is_gil_enabled", None)
+    return True if check is None else bool(check())
+
+
+def available_backends() -> List[str]:
+    """Devuelve los backends de :func:`jam` que admite este intérprete.
+
+    ``interpreter`` solo aparece cuando existe
+    :class:`concurrent.futures.InterpreterPoolExecutor` (Python 3.14+).
+
+    Ejemplo
+    -------
+    >>> {"thread", "process", "async"} <= set(available_backends())
+    True
+    """
+
+    backends = ["thread", "process"]
+    if supports("interpreter"):
+        backends.append("interpreter")
+    backends.append("async")
+    return backends
+
+
+def _index_counter() -> Callable[[], int]:
+    """Devuelve una función que reparte índices consecutivos entre hilos.
+
+    Con GIL, ``next`` sobre :func:`itertools.count` es atómico y no necesita
+    lock.  Sin GIL los hilos avanzan de verdad a la vez, así que el contador se
+    protege con un lock propio.
+    """
+
+    if gil_enabled():
+        return itertools.count().__next__
+    lock = threading.Lock()
+    counter = itertools.count()
+
+    def next_index() -> int:
+        with lock:
+            return next(counter)
+
+    return next_index
+
+
+def _default_chunksize(total: int, workers: int) -> int:
+    """Calcula un ``chunksize`` razonable al estilo de ``multiprocessing.Pool.map``.
+
+    Reparte la entrada en unas cuatro porciones por *worker*, suficiente para
+    amortizar el coste de IPC sin dejar a ningún proceso rezagado.
+    """
+
+    chunksize, extra = divmod(total, max(workers, 1) * 4)
+    if extra:
+        chunksize += 1
+    return max(chunksize, 1)
+
+
+class _ChunkTuner:
+    """Ajusta el tamaño de porción de ``jam`` a partir de lo que mide.
+
+    Cada porción completada aporta su tiempo de cómputo y su tiempo de ida y
+    vuelta; la diferencia es el coste de envío.  El tamaño se elige para que
+    ese coste no supere ``overhead_ratio`` del cómputo de la porción, sin
+    crecer más de ``max_growth`` veces por paso y limitado por lo que queda de
+    entrada para que ningún *worker* se quede rezagado al final.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        initial: int = 1,
+        *,
+        overhead_ratio: float = 0.05,
+        smoothing: float = 0.5,
+        max_growth: int = 4,
+    ) -> None:
+        self.workers = max(workers, 1)
+        self.size = max(initial, 1)
+        self.overhead_ratio = overhead_ratio
+        self.smoothing = smoothing
+        self.max_growth = max_growth
+        self.per_item: Optional[float] = None
+        self.overhead: Optional[float] = None
+
+    def _blend(self, previous: Optional[float], value: float) -> float:
+        if previous is None:
+            return value
+        return previous + self.smoothing * (value - previous)
+
+    def record(self, items: int, compute: float, roundtrip: float) -> None:
+        """Registra una porción de ``items`` elementos y recalcula el tamaño."""
+        if items <= 0:
+            return
+        self.per_item = self._blend(self.per_item, compute / items)
+        self.overhead = self._blend(self.overhead, max(roundtrip - compute, 0.0))
+        if self.per_item > 0:
+            ideal = self.overhead / (self.overhead_ratio * self.per_item)
+        else:
+            ideal = float(self.size * self.max_growth)
+        self.size = max(int(min(ideal, self.size * self.max_growth)), 1)
+
+    def next_size(self, remaining: int) -> int:
+        """Tamaño de la siguiente porción cuando quedan ``remaining`` entradas."""
+        straggler_cap = -(-remaining // self.workers)
+        return max(min(self.size, straggler_cap), 1)
+
+
+def _learned_chunksize(func_name: str) -> Optional[int]:
+    """Último ``chunksize`` que el autoajuste de ``jam`` guardó para ``func_name``."""
+    try:
+        history = memory.get_execution_history(func_name)
+    except Exception:  # pragma: no cover - historial ilegible
+        return None
+    for entry in reversed(history):
+        metadata = entry.get("metadata") or {}
+        if entry.get("decorator") == "@jam" and metadata.get("chunksize"):
+            return int(metadata["chunksize"])
+    return None
+
+
+async def _drain_async(
+    call: Callable[[A], Awaitable[T]], args_list: Sequence[A], workers: int
+) -> List[T]:
+    """Ejecuta ``call`` sobre ``args_list`` con como mucho ``workers`` tareas.
+
+    Un número fijo de tareas comparte un único iterador sobre la entrada, de
+    modo que nunca hay más de ``workers`` corrutinas pendientes.  Los
+    resultados conservan el orden de la entrada y el primer error se propaga
+    tras cancelar al resto de tareas, igual que con :func:`asyncio.gather`.
+    """
+
+    results: List[Any] = [None] * len(args_list)
+    pending = enumerate(args_list)
+
+    async def worker() -> None:
+        for index, arg in pending:
+            results[index] = await call(arg)
+
+    tasks = [
+        asyncio.ensure_future(worker())
+        for _ in range(max(1, min(workers, len(args_list))))
+    ]
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+    return results
+
+
+def _split_batches(
+    args_list: Sequence[A], workers: int, chunksize: Optional[int], axis: int
+) -> List[Any]:
+    """Divide la entrada en porciones para el modo ``batch`` de ``jam``."""
+    if _is_ndarray(args_list):
+        np = _numpy()
+        length = args_list.shape[axis]
+        if chunksize:
+            bounds = list(range(chunksize, length, chunksize))
+            return np.split(args_list, bounds, axis=axis)
+        return np.array_split(args_list, max(min(workers, length), 1), axis=axis)
+    size = chunksize or max(-(-len(args_list) // max(workers, 1)), 1)
+    return [args_list[i : i + size] for i in range(0, len(args_list), size)]
+
+
+def _scalar_batch(out: Any) -> bool:
+    """Indica si una porción de ``batch`` devolvió un único valor."""
+    if _is_ndarray(out):
+        return out.ndim == 0
+    return isinstance(out, (str, bytes)) or not isinstance(out, Iterable)
+
+
+def _join_batches(outputs: List[Any], axis: int) -> Any:
+    """Concatena los resultados del modo ``batch`` respetando el orden.
+
+    Una porción que devuelve un escalar o un arreglo de dimensión 0 (por
+    ejemplo, una reducción) aporta un único elemento.
+
+    >>> import numpy as np
+    >>> _join_batches([[1, 2], 3, np.float64(4.0)], axis=0)
+    [1, 2, 3, np.float64(4.0)]
+    >>> _join_batches([np.array(1.0), np.array(2.0)], axis=0)
+    array([1., 2.])
+    """
+    outputs = [out for out in outputs if out is not _MISSING]
+    if outputs and all(_is_ndarray(out) for out in outputs):
+        if all(out.ndim == 0 for out in outputs):
+            return _numpy().stack(outputs)
+        if all(out.ndim > 0 for out in outputs):
+            return _numpy().concatenate(outputs, axis=axis)
+    joined: List[Any] = []
+    for out in outputs:
+        if _scalar_batch(out):
+            joined.append(out)
+        else:
+            joined.extend(out)
+    return joined
 
-    module = importlib.import_module(module_name)
-    func: Callable[[A], T] = getattr(module, func_name)
 
-    local_results: List[T] = []
+def _iter_chunks(iterable: Iterable[A], size: int) -> Iterator[List[A]]:
+    """Consume ``iterable`` de forma perezosa en listas de ``size`` elementos."""
+    iterator = iter(iterable)
     while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+def _describe_arg(value: Any) -> str:
+    if _is_ndarray(value):
+        return f"ndarray[{value.dtype}, {value.ndim}d]"
+    if isinstance(value, (list, tuple)):
+        inner = _describe_arg(value[0]) if value else ""
+        return f"{type(value).__name__}[{inner}]"
+    return type(value).__name__
+
+
+def _signature_key(args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Tuple[str, ...]:
+    """Firma de una llamada según los tipos de sus argumentos.
+
+    Los arreglos se distinguen por ``dtype`` y ``ndim``; las listas y tuplas,
+    por el tipo de su primer elemento.
+    """
+
+    key = tuple(_describe_arg(arg) for arg in args)
+    if kwargs:
+        key += tuple(f"{name}={_describe_arg(value)}" for name, value in sorted(kwargs.items()))
+    return key
+
+
+def _fallback_wrapper(
+    func: Callable[P, T],
+    jit_func: Callable[P, T],
+    log: Callable[[], None],
+    decorator: str,
+    message: str,
+) -> Callable[P, T]:
+    """Envoltorio con *fallback* que recuerda las firmas en las que Numba falla.
+
+    Cuando ``jit_func`` falla y ``func`` resuelve la misma llamada, la firma
+    de los argumentos se guarda en ``failed_signatures`` (con el error de
+    Numba) y las llamadas siguientes con esa firma van directas a Python.  La
+    primera vez se anota en el historial con el decorador
+    ``"<decorator>:fallback"``.  Si ``func`` también falla, el error es del
+    código y no se recuerda nada.
+    """
+
+    failures: Dict[Tuple[str, ...], str] = {}
+
+    def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+        log()
+        if failures and _signature_key(args, kwargs) in failures:
+            return func(*args, **kwargs)
+        try:
+            return jit_func(*args, **kwargs)
+        except Exception as e:
+            logger.warning(message)
+            error = e
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        duration = time.perf_counter() - start
+        key = _signature_key(args, kwargs)
+        reason = str(error).strip().splitlines()[0] if str(error).strip() else ""
+        failures[key] = f"{type(error).__name__}: {reason}".rstrip(": ")
+        memory.log_execution_stats(
+            func_name=func.__name__,
+            input_type=f"({', '.join(key)})",
+            decorator_used=f"{decorator}:fallback",
+            duration=duration,
+            metadata={"signature": list(key), "error": failures[key]},
+        )
+        return result
+
+    wrapper.failed_signatures = failures
+    return wrapper
+
+
+#: Funciones compiladas con :func:`smooth`, :func:`bad`, :func:`vectorized` o
+#: :func:`guvectorized` que :func:`warmup_all` debe preparar, por
+#: ``"modulo.nombre"``.
+_WARMUP_REGISTRY: "weakref.WeakValueDictionary[str, Callable[..., Any]]" = (
+    weakref.WeakValueDictionary()
+)
+
+
+def _attach_warmup(
+    wrapper: Callable[..., Any],
+    func: Callable[..., Any],
+    jit_func: Any,
+    signatures: Optional[Sequence[Any]],
+    eager: bool = True,
+    compile: Optional[Callable[[Any], Any]] = None,
+) -> None:
+    """Añade ``warmup`` a ``wrapper`` y compila ya las ``signatures`` declaradas.
+
+    Con ``eager=False`` las firmas se registran pero no se compilan todavía.
+    ``compile`` sustituye a ``jit_func.compile`` cuando el envoltorio decide
+    qué *dispatcher* compila cada firma.
+    """
+
+    compile = compile or jit_func.compile
+
+    declared = list(signatures or ())
+
+    def warmup(*sample_args: Any) -> List[str]:
+        """Compila por adelantado y devuelve las firmas preparadas.
+
+        Con argumentos de ejemplo compila la firma de sus tipos; sin ellos,
+        las firmas declaradas y las que la caché en disco ya conoce.
+        """
+
+        from numba import typeof
+        from numba.core.sigutils import normalize_signature
+
+        if sample_args:
+            targets = [tuple(typeof(arg) for arg in sample_args)]
+        else:
+            targets = declared + shipping.cached_signatures(jit_func)
+        compiled: List[str] = []
+        for sig in targets:
+            try:
+                args = str(normalize_signature(sig)[0])
+                if args in compiled:
+                    continue
+                compile(sig)
+            except Exception as e:
+                logger.warning(f"Beat it! Could not compile {func.__qualname__} for {sig}: {e}")
+                continue
+            compiled.append(args)
+        return compiled
+
+    wrapper.warmup = warmup
+    if wrapper is not jit_func:
+        wrapper.signatures = declared
+    _WARMUP_REGISTRY[f"{func.__module__}.{func.__qualname__}"] = wrapper
+    if declared and eager:
+        warmup()
+
+
+def _attach_ufunc_warmup(wrapper: Callable[..., Any], func: Callable[..., Any], jit_func: Any) -> None:
+    """Añade ``warmup`` al envoltorio de :func:`vectorized` o :func:`guvectorized`.
+
+    Con firmas explícitas Numba ya compila el *ufunc* al decorar, así que
+    ``warmup()`` solo devuelve sus tipos.  Los dinámicos compilan cada tipo en
+    su primera llamada: ``warmup(*ejemplo)`` la hace con argumentos de ejemplo
+    (en :func:`guvectorized`, incluida la salida).
+    """
+
+    kernels = list(getattr(jit_func, "targets", {}).values()) or [jit_func]
+
+    def warmup(*sample_args: Any) -> List[str]:
+        """Compila con argumentos de ejemplo y devuelve los tipos preparados."""
+        if sample_args:
+            for kernel in kernels:
+                try:
+                    kernel(*sample_args)
+                except Exception as e:
+                    logger.warning(
+                        f"Beat it! Could not compile {func.__qualname__} for the sample arguments: {e}"
+                    )
+        return list(dict.fromkeys(t for kernel in kernels for t in kernel.types))
+
+    wrapper.warmup = warmup
+    _WARMUP_REGISTRY[f"{func.__module__}.{func.__qualname__}"] = wrapper
+
+
+def warmup_all() -> Dict[str, List[str]]:
+    """Compila todas las funciones registradas por los decoradores JIT.
+
+    Son las de :func:`smooth`, :func:`bad`, :func:`vectorized` y
+    :func:`guvectorized`.  Pensado para el arranque de un servicio: tras llamarla, ninguna petición
+    con una firma declarada (o ya presente en la caché en disco) dispara la
+    compilación de Numba.  Devuelve las firmas preparadas por función.
+    """
+
+    return {name: wrapper.warmup() for name, wrapper in list(_WARMUP_REGISTRY.items())}
+
+
+def _background_jit(
+    func: Callable[P, T],
+    jit_func: Any,
+    signatures: Optional[Sequence[Any]],
+    compile_budget: Optional[float],
+    log: Optional[Callable[[], None]],
+) -> Callable[P, T]:
+    """Envoltorio de :func:`smooth` que compila en un hilo aparte.
+
+    Cada firma de Numba se sigue por separado: la primera llamada con una
+    firma nueva la encola para compilar en segundo plano y, hasta que está
+    lista, esa firma se sirve con ``func`` en Python.  Las firmas cuya
+    compilación falla o supera ``compile_budget`` segundos se quedan en
+    Python y se anotan en ``failed_signatures``, como en
+    :func:`_fallback_wrapper`.
+    """
+
+    from numba import typeof
+    from numba.core.sigutils import normalize_signature
+
+    lock = threading.Lock()
+    # Firma de Numba -> "compiling" | "compiled" | "python"
+    states: Dict[Tuple[Any, ...], str] = {}
+    deadlines: Dict[Tuple[Any, ...], float] = {}
+    pending: deque = deque()
+    draining = {"active": False}
+    compiled = _fallback_wrapper(
+        func, jit_func, lambda: None, "@smooth", "Beat it! Numba failed at runtime. Falling back."
+    )
+    failures = compiled.failed_signatures
+
+    def give_up(
+        sig: Optional[Tuple[Any, ...]],
+        key: Tuple[str, ...],
+        reason: str,
+        duration: float = 0.0,
+    ) -> None:
+        with lock:
+            if sig is not None:
+                if states.get(sig) != "compiling":
+                    return
+                states[sig] = "python"
+            failures[key] = reason
+        logger.warning(f"Beat it! {func.__qualname__}{sig or ''} stays in Python: {reason}.")
+        memory.log_execution_stats(
+            func_name=func.__name__,
+            input_type=f"({', '.join(key)})",
+            decorator_used="@smooth:fallback",
+            duration=duration,
+            metadata={"signature": list(key), "error": reason},
+        )
+
+    def compile_one(sig: Tuple[Any, ...], target: Any, key: Tuple[str, ...]) -> None:
+        start = time.perf_counter()
         try:
-            arg = q.get_nowait()
-        except Empty:
-            break
+            jit_func.compile(target)
+        except Exception as e:
+            reason = str(e).strip().splitlines()[0] if str(e).strip() else type(e).__name__
+            elapsed = time.perf_counter() - start
+            give_up(sig, key, f"background compilation failed ({reason})", elapsed)
+            return
+        elapsed = time.perf_counter() - start
+        if compile_budget is not None and elapsed > compile_budget:
+            reason = f"compilation took {elapsed:.2f}s (budget {compile_budget}s)"
+            give_up(sig, key, reason, elapsed)
+            return
+        with lock:
+            if states.get(sig) == "compiling":
+                states[sig] = "compiled"
+                logger.info(f"Smooth Criminal compiled {func.__qualname__}{sig} in {elapsed:.2f}s")
+
+    def drain() -> None:
+        # Un solo hilo compila las firmas en orden; el presupuesto de cada
+        # una cuenta desde que empieza su compilación, no desde que se encola.
+        while True:
+            with lock:
+                if not pending:
+                    draining["active"] = False
+                    return
+                sig, target, key = pending.popleft()
+                if compile_budget is not None:
+                    deadlines[sig] = time.perf_counter() + compile_budget
+            compile_one(sig, target, key)
+
+    def enqueue(sig: Tuple[Any, ...], target: Any, key: Tuple[str, ...]) -> None:
+        with lock:
+            if sig in states:
+                return
+            if sig in jit_func.overloads:  # ya compilada con ``warmup``
+                states[sig] = "compiled"
+                return
+            states[sig] = "compiling"
+            pending.append((sig, target, key))
+            if draining["active"]:
+                return
+            draining["active"] = True
+        threading.Thread(
+            target=drain, name=f"smooth-jit-{func.__qualname__}", daemon=True
+        ).start()
+
+    def observed_signature(args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Tuple[Any, ...]:
+        if kwargs:
+            bound = inspect.signature(func).bind(*args, **kwargs)
+            bound.apply_defaults()
+            args = tuple(bound.arguments.values())
+        return tuple(typeof(arg) for arg in args)
+
+    @wraps(func)
+    def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+        if log is not None:
+            log()
+        if failures and _signature_key(args, kwargs) in failures:
+            return func(*args, **kwargs)
         try:
-            local_results.append(func(arg))
+            sig = observed_signature(args, kwargs)
         except Exception as e:
-            logger.warning(f"Worker failed on input {arg}: {e}")
-    return local_results
+            give_up(None, _signature_key(args, kwargs), f"cannot type the arguments ({e})")
+            return func(*args, **kwargs)
+        status = states.get(sig)
+        if status == "compiled":
+            return compiled(*args, **kwargs)
+        if status is None:
+            enqueue(sig, sig, _signature_key(args, kwargs))
+        elif status == "compiling" and sig in deadlines:
+            if time.perf_counter() > deadlines[sig]:
+                give_up(
+                    sig,
+                    _signature_key(args, kwargs),
+                    f"compilation exceeded the {compile_budget}s budget",
+                )
+        return func(*args, **kwargs)
+
+    def jit_status() -> str:
+        with lock:
+            values = set(states.values())
+        for status in ("compiling", "compiled", "python"):
+            if status in values:
+                return status
+        return "python" if failures else "idle"
+
+    wrapper.jit_status = jit_status
+    wrapper.failed_signatures = failures
+    _attach_warmup(wrapper, func, jit_func, signatures, eager=False)
+    for declared in signatures or ():
+        sig = tuple(normalize_signature(declared)[0])
+        enqueue(sig, declared, tuple(str(arg) for arg in sig))
+    return wrapper
+
+
+def _converting_kernel(
+    func: Callable[P, T], jit_func: Any, convert: str
+) -> Callable[P, T]:
+    """Llama a ``jit_func`` tras convertir listas y diccionarios de la llamada.
+
+    La conversión (ver :mod:`smooth_criminal.containers`) se cachea por
+    identidad del argumento.  Cuando alguno se convierte por primera vez se
+    anota en el historial una entrada ``"@smooth:convert"`` con el tiempo de
+    conversión y el del *kernel* por separado (``compiled`` indica si ese
+    tiempo incluye compilar); las llamadas con todo ya convertido no anotan
+    nada.
+    """
+
+    from smooth_criminal.containers import ConversionCache
+
+    cache = ConversionCache(convert)
+    totals = {"seconds": 0.0}
+
+    def kernel(*args: P.args, **kwargs: P.kwargs) -> T:
+        start = time.perf_counter()
+        fresh: List[str] = []
+        call_args = []
+        for arg in args:
+            value, new = cache.convert(arg)
+            call_args.append(value)
+            if new:
+                fresh.append(f"{_describe_arg(arg)} -> {_describe_arg(value)}")
+        call_kwargs = {}
+        for name, arg in kwargs.items():
+            value, new = cache.convert(arg)
+            call_kwargs[name] = value
+            if new:
+                fresh.append(f"{name}={_describe_arg(arg)} -> {_describe_arg(value)}")
+        conversion = time.perf_counter() - start
+        totals["seconds"] += conversion
+        if not fresh:
+            return jit_func(*call_args, **call_kwargs)
+        known = len(jit_func.signatures)
+        start = time.perf_counter()
+        result = jit_func(*call_args, **call_kwargs)
+        duration = time.perf_counter() - start
+        memory.log_execution_stats(
+            func_name=func.__name__,
+            input_type=f"({', '.join(_signature_key(args, kwargs))})",
+            decorator_used="@smooth:convert",
+            duration=duration,
+            metadata={
+                "conversion": conversion,
+                "kernel": duration,
+                "compiled": len(jit_func.signatures) > known,
+                "converted": fresh,
+            },
+        )
+        return result
+
+    def conversion_stats() -> Dict[str, Any]:
+        """Conversiones hechas, reutilizadas desde la caché y segundos invertidos."""
+
+        return {
+            "conversions": cache.conversions,
+            "cache_hits": cache.hits,
+            "seconds": totals["seconds"],
+        }
+
+    kernel.conversion_stats = conversion_stats
+    kernel.clear_conversions = cache.clear
+    return kernel
+
+
+#: Versiones de Numba (``[mínima, máxima)``) con las que se ha probado el
+#: *fallback* por método de las clases ``@smooth``, que depende de detalles
+#: internos de ``jitclass``.  Con otras la clase se queda en Python.
+_JITCLASS_NUMBA_VERSIONS = ((0, 57), (0, 69))
+
+
+def _jitclass_boxing() -> Any:
+    """Devuelve el módulo ``boxing`` de ``jitclass`` o lanza ``RuntimeError``.
+
+    Es la única pieza interna de Numba que usa :func:`_smooth_class` y solo
+    se acepta en las versiones de :data:`_JITCLASS_NUMBA_VERSIONS`.
+    """
+
+    version = _numba().__version__
+    try:
+        major_minor = tuple(int(part) for part in version.split(".")[:2])
+    except ValueError:
+        major_minor = ()
+    low, high = _JITCLASS_NUMBA_VERSIONS
+    if not low <= major_minor < high:
+        raise RuntimeError(f"numba {version} is not supported for @smooth classes")
+    from numba.experimental.jitclass import boxing
+
+    if not hasattr(boxing, "_specialize_box"):
+        raise RuntimeError(f"numba {version} is not supported for @smooth classes")
+    return boxing
+
+
+def _smooth_class(cls: type) -> type:
+    """Compila ``cls`` como ``jitclass`` de Numba a partir de sus anotaciones.
+
+    Los atributos anotados (``int``, ``float``, ``bool``, ``complex`` o tipos
+    de Numba como ``float64[:]``) forman la estructura de la clase y sus
+    métodos se compilan en modo *nopython* la primera vez que se llaman.  Un
+    método que Numba no sabe compilar se ejecuta en Python sobre la misma
+    instancia (sus atributos siguen accesibles) y la firma se recuerda como
+    en :func:`_fallback_wrapper`.  El constructor no tiene *fallback*: todas
+    las instancias son del mismo tipo, así que si Numba no puede crearla se
+    lanza su error.  Si la clase no puede ser una ``jitclass`` (atributos sin
+    anotar, miembros de clase, métodos especiales no soportados, una versión
+    de Numba no probada...) se devuelve ``cls`` tal cual, con sus métodos
+    estáticos compilados por separado.
+
+    La clase devuelta expone ``jitclass_error`` (``None`` si se compiló) y
+    ``failed_signatures`` por método.
+    """
+
+    from numba.experimental import jitclass
+
+    try:
+        if not typing.get_type_hints(cls):
+            raise TypeError("no annotated attributes")
+        boxing = _jitclass_boxing()
+        jit_cls = jitclass(cls)
+        box = boxing._specialize_box(jit_cls.class_type.instance_type)
+    except Exception as e:
+        reason = str(e).strip().splitlines()[0] if str(e).strip() else ""
+        error = f"{type(e).__name__}: {reason}".rstrip(": ")
+        logger.warning(
+            f"Beat it! Numba can't compile class {cls.__name__} ({error}). Keeping Python methods."
+        )
+        for name, member in list(vars(cls).items()):
+            if isinstance(member, staticmethod):
+                setattr(cls, name, staticmethod(smooth(member.__func__)))
+        cls.jitclass_error = error
+        cls.failed_signatures = {}
+        return cls
+
+    jit_cls.jitclass_error = None
+    jit_cls.failed_signatures = {}
+    log = _hot_path_log("You've been hit by... a Smooth Criminal class!")
+    if log is None:
+        return jit_cls
+
+    def no_log() -> None:
+        pass
+
+    class_type = jit_cls.class_type
+    for name, dispatcher in class_type.jit_methods.items():
+        if name == "__init__":
+            continue
+        method = _fallback_wrapper(
+            dispatcher.py_func,
+            getattr(box, name),
+            no_log,
+            "@smooth",
+            f"Beat it! Numba failed in {cls.__name__}.{name}. Falling back.",
+        )
+        setattr(box, name, wraps(dispatcher.py_func)(method))
+        jit_cls.failed_signatures[name] = method.failed_signatures
+    for name, dispatcher in class_type.jit_static_methods.items():
+        static = _fallback_wrapper(
+            dispatcher.py_func,
+            dispatcher,
+            no_log,
+            "@smooth",
+            f"Beat it! Numba failed in {cls.__name__}.{name}. Falling back.",
+        )
+        setattr(jit_cls, name, staticmethod(wraps(dispatcher.py_func)(static)))
+        setattr(box, name, staticmethod(wraps(dispatcher.py_func)(static)))
+        jit_cls.failed_signatures[name] = static.failed_signatures
+    return jit_cls
 
-def smooth(func: Callable[P, T]) -> Callable[P, T]:
+
+def smooth(
+    func: Optional[Callable[P, T]] = None,
+    *,
+    signatures: Optional[Sequence[Any]] = None,
+    background: bool = False,
+    compile_budget: Optional[float] = None,
+    convert: Optional[str] = None,
+) -> Callable[P, T]:
     """Compila ``func`` con Numba para acelerar su ejecución.
 
+    Parámetros
+    ----------
+    signatures: lista, opcional
+        Firmas de Numba (``"float64(float64)"`` o tuplas de tipos) que se
+        compilan al decorar en lugar de en la primera llamada.  El resto de
+        tipos se sigue compilando bajo demanda.
+    background: bool, opcional
+        Si es ``True`` la compilación no bloquea: la primera llamada con
+        cada firma nueva la encola para compilar en un hilo (las declaradas,
+        ya al decorar) y, hasta que termina, las llamadas con esa firma se
+        sirven con ``func`` en Python.  Después pasan al código compilado.
+        ``jit_status()`` devuelve ``"idle"``, ``"compiling"`` (alguna firma
+        en curso), ``"compiled"`` o ``"python"`` (ninguna compilada).
+    compile_budget: float, opcional
+        Segundos que puede durar la compilación en segundo plano de cada
+        firma.  Las que los superan o fallan se quedan en Python y aparecen
+        en ``failed_signatures``.
+    convert: str, opcional
+        Convierte listas y diccionarios antes de llamar a Numba en lugar de
+        pasarlos como *reflected lists* o recurrir a Python.  Con
+        ``"array"`` las listas numéricas pasan a arreglos NumPy y el resto a
+        ``numba.typed.List``; con ``"typed"`` todas pasan a
+        ``numba.typed.List``.  Los diccionarios pasan a ``numba.typed.Dict``.
+        Las conversiones se reutilizan mientras se pase el mismo objeto (con
+        la misma longitud); los cambios que hace el *kernel* no se reflejan
+        en el original.  ``conversion_stats()`` resume su coste y
+        ``clear_conversions()`` vacía la caché.
+
+    La función devuelta expone ``warmup(*ejemplo)``, que compila la firma de
+    los argumentos de ejemplo (o, sin ellos, las declaradas), y se registra
+    para :func:`warmup_all`.
+
     Ejemplo
     -------
     >>> import logging
@@ -148,34 +1045,201 @@ def smooth(func: Callable[P, T]) -> Callable[P, T]:
     ...     return a + b
     >>> suma(2, 3)
     5
+    >>> @smooth(signatures=["float64(float64)"])
+    ... def mitad(x):
+    ...     return x / 2
+    >>> mitad(3.0)
+    1.5
     """
+    if compile_budget is not None and compile_budget <= 0:
+        raise ValueError("compile_budget must be a positive number of seconds")
+    if compile_budget is not None and not background:
+        raise ValueError("compile_budget requires background=True")
+    if convert is not None:
+        from smooth_criminal.containers import MODES
+
+        if convert not in MODES:
+            raise ValueError(f"convert must be one of {MODES}")
+        if background:
+            raise ValueError("convert is not supported with background=True")
+    if isinstance(func, type):
+        if signatures is not None or background or convert is not None:
+            raise ValueError("signatures, background and convert are not supported on classes")
+        return _smooth_class(func)
+    if func is None:
+        return functools.partial(
+            smooth,
+            signatures=signatures,
+            background=background,
+            compile_budget=compile_budget,
+            convert=convert,
+        )
     try:
-        jit_func = jit(nopython=True, cache=True)(func)
-
-        def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
-            logger.info("You've been hit by... a Smooth Criminal!")
-            try:
-                return jit_func(*args, **kwargs)
-            except Exception:
-                logger.warning("Beat it! Numba failed at runtime. Falling back.")
-                return func(*args, **kwargs)
-
+        jit_func = _numba().jit(nopython=True, cache=True)(func)
+        log = _hot_path_log("You've been hit by... a Smooth Criminal!")
+        if background:
+            return _background_jit(func, jit_func, signatures, compile_budget, log)
+        kernel = jit_func if convert is None else _converting_kernel(func, jit_func, convert)
+        if log is None:
+            if kernel is not jit_func:
+                kernel = wraps(func)(kernel)
+            _attach_warmup(kernel, func, jit_func, signatures)
+            return kernel
+
+        wrapper = _fallback_wrapper(
+            func, kernel, log, "@smooth", "Beat it! Numba failed at runtime. Falling back."
+        )
+        if kernel is not jit_func:
+            wrapper.conversion_stats = kernel.conversion_stats
+            wrapper.clear_conversions = kernel.clear_conversions
+        _attach_warmup(wrapper, func, jit_func, signatures)
         return wrapper
     except Exception:
         def fallback(*args: P.args, **kwargs: P.kwargs) -> T:
             logger.warning("Beat it! Numba failed. Falling back.")
             return func(*args, **kwargs)
 
+        fallback.warmup = lambda *sample_args: []
+        fallback.signatures = list(signatures or ())
         return fallback
 
 
-def vectorized(ftylist_or_function=(), **kws):
+def _attach_stream(
+    wrapper: Any, kernel: Any, func: Callable[..., Any], layout: Optional[str] = None
+) -> None:
+    """Añade ``stream(*entradas, out, block_size=None, threads=1)`` a ``wrapper``."""
+
+    def stream(*args: Any, out: Any = None, block_size: Optional[int] = None, threads: int = 1):
+        """Aplica el *kernel* por bloques y escribe en ``out`` (ver :mod:`smooth_criminal.streaming`).
+
+        ``out`` puede ir también como último argumento posicional.
+        """
+
+        from smooth_criminal.streaming import stream as run
+
+        if out is None:
+            if len(args) != kernel.nin + 1:
+                raise TypeError("stream() needs an output array or .npy path as out")
+            *args, out = args
+        return run(
+            kernel, func, args, out, layout=layout, block_size=block_size, threads=threads
+        )
+
+    wrapper.stream = stream
+
+
+def _size_dispatch(
+    func: Callable[..., Any],
+    serial: Callable[..., Any],
+    parallel: Callable[..., Any],
+    crossover: Optional[int],
+) -> Callable[..., Any]:
+    """Reparte las llamadas entre ``serial`` y ``parallel`` según su tamaño.
+
+    Sin ``crossover`` se usa el calibrado en esta máquina o, si no existe,
+    la primera llamada que recibe un arreglo lanza la calibración en un hilo
+    aparte y las llamadas se sirven con ``serial`` hasta que termina
+    (:mod:`smooth_criminal.crossover`).  ``calibrate(*ejemplo)`` calibra en
+    el momento, por ejemplo al arrancar un servicio.
+    """
+
+    from smooth_criminal import crossover as xo
+
+    name = f"{func.__module__}.{func.__qualname__}"
+    state: Dict[str, Any] = {
+        "crossover": crossover if crossover is not None else xo.load_crossover(name),
+        "calibrating": False,
+    }
+    lock = threading.Lock()
+
+    def calibrate(*args: Any, **kwargs: Any) -> float:
+        """Calibra el punto de cruce con argumentos de ejemplo y lo guarda."""
+        value = xo.calibrate(serial, parallel, args, kwargs)
+        xo.save_crossover(name, value)
+        with lock:
+            state["crossover"] = value
+        logger.info(
+            f"🎚 {func.__qualname__} stays on the cpu target."
+            if math.isinf(value)
+            else f"🎚 {func.__qualname__} goes parallel from {value} elements."
+        )
+        return value
+
+    def calibrate_in_background(args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> None:
+        try:
+            calibrate(*args, **kwargs)
+        except Exception as e:
+            # Sin punto de cruce fiable se queda en ``serial`` hasta el
+            # próximo proceso, sin reintentar en cada llamada.
+            logger.warning(f"Beat it! Could not calibrate {func.__qualname__}: {e}")
+            with lock:
+                state["crossover"] = math.inf
+        finally:
+            with lock:
+                state["calibrating"] = False
+
+    def start_calibration(args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> None:
+        with lock:
+            if state["calibrating"] or state["crossover"] is not None:
+                return
+            state["calibrating"] = True
+        sample_args, sample_kwargs = xo.snapshot(args, kwargs)
+        threading.Thread(
+            target=calibrate_in_background,
+            args=(sample_args, sample_kwargs),
+            name=f"smooth-crossover-{func.__qualname__}",
+            daemon=True,
+        ).start()
+
+    def select(args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Callable[..., Any]:
+        size = xo.largest_size(args, kwargs)
+        value = state["crossover"]
+        if value is None:
+            if size:
+                start_calibration(args, kwargs)
+            return serial
+        return parallel if size >= value else serial
+
+    def dispatch(*args: Any, **kwargs: Any) -> Any:
+        return select(args, kwargs)(*args, **kwargs)
+
+    def select_target(*args: Any, **kwargs: Any) -> str:
+        """Target (``"cpu"`` o ``"parallel"``) que usaría una llamada con estos argumentos."""
+        return "parallel" if select(args, kwargs) is parallel else "cpu"
+
+    dispatch.select_target = select_target
+    dispatch.calibrate = calibrate
+    dispatch.crossover = lambda: state["crossover"]
+    dispatch.targets = {"cpu": serial, "parallel": parallel}
+    dispatch.nin = serial.nin
+    return dispatch
+
+
+def vectorized(
+    ftylist_or_function=(),
+    *,
+    auto_target: bool = False,
+    crossover: Optional[int] = None,
+    **kws,
+):
     """Envuelve ``numba.vectorize`` añadiendo registro y *fallback*.
 
     Parametros
     ----------
     ftylist_or_function : sequence or function, optional
         Igual que en :func:`numba.vectorize`.
+    auto_target : bool, optional
+        Compila el *ufunc* con ``target="cpu"`` y con ``target="parallel"`` y
+        elige en cada llamada según el tamaño del mayor arreglo: por debajo
+        del punto de cruce la versión serie, que no paga el arranque de los
+        hilos.  Requiere firmas explícitas.  La función devuelta expone
+        ``select_target(*args)``, ``crossover()``, ``calibrate(*ejemplo)`` y
+        ``targets``.
+    crossover : int, optional
+        Punto de cruce en número de elementos.  Si no se indica, se calibra
+        una vez por máquina y se guarda (ver :mod:`smooth_criminal.crossover`):
+        en segundo plano a partir de la primera llamada con arreglos, que
+        mientras tanto usa ``target="cpu"``, o al llamar a ``calibrate``.
     **kws : Any
         Argumentos adicionales para ``numba.vectorize``.
     """
@@ -186,23 +1250,48 @@ def vectorized(ftylist_or_function=(), **kws):
     else:
         func = None
         signatures = ftylist_or_function
+    if auto_target:
+        if not signatures:
+            raise ValueError("auto_target requires explicit signatures")
+        if "target" in kws:
+            raise ValueError("auto_target chooses the target; do not pass target=")
+    elif crossover is not None:
+        raise ValueError("crossover requires auto_target=True")
 
     def _compile(f: Callable):
         try:
-            jit_func = nb_vectorize(signatures, **kws)(f)
-
-            @wraps(f)
-            def wrapper(*args, **kwargs):
-                logger.info("Vectorization... that's smooth!")
-                try:
-                    return jit_func(*args, **kwargs)
-                except Exception:
-                    logger.warning(
-                        "Beat it! Numba vectorize failed at runtime. Falling back."
-                    )
-                    return f(*args, **kwargs)
-
-            return wrapper
+            if auto_target:
+                nb = _numba()
+                jit_func = _size_dispatch(
+                    f,
+                    nb.vectorize(signatures, target="cpu", **kws)(f),
+                    nb.vectorize(signatures, target="parallel", **kws)(f),
+                    crossover,
+                )
+            else:
+                jit_func = _numba().vectorize(signatures, **kws)(f)
+            log = _hot_path_log("Vectorization... that's smooth!")
+            if log is None:
+                if auto_target:
+                    jit_func = wraps(f)(jit_func)
+                _attach_stream(jit_func, jit_func, f)
+                return jit_func
+
+            wrapper = _fallback_wrapper(
+                f,
+                jit_func,
+                log,
+                "@vectorized",
+                "Beat it! Numba vectorize failed at runtime. Falling back.",
+            )
+            if auto_target:
+                wrapper.select_target = jit_func.select_target
+                wrapper.crossover = jit_func.crossover
+                wrapper.calibrate = jit_func.calibrate
+                wrapper.targets = jit_func.targets
+            _attach_stream(wrapper, jit_func, f)
+            _attach_ufunc_warmup(wrapper, f, jit_func)
+            return wraps(f)(wrapper)
         except Exception:
             logger.warning("Beat it! Numba vectorize failed. Falling back.")
             return f
@@ -228,20 +1317,23 @@ def guvectorized(*args, **kws):
 
     def _compile(f: Callable):
         try:
-            jit_func = nb_guvectorize(*sig_args, **kws)(f)
-
-            @wraps(f)
-            def wrapper(*w_args, **w_kwargs):
-                logger.info("GUVectorization in the groove!")
-                try:
-                    return jit_func(*w_args, **w_kwargs)
-                except Exception:
-                    logger.warning(
-                        "Beat it! Numba guvectorize failed at runtime. Falling back."
-                    )
-                    return f(*w_args, **w_kwargs)
-
-            return wrapper
+            jit_func = _numba().guvectorize(*sig_args, **kws)(f)
+            layout = jit_func.signature
+            log = _hot_path_log("GUVectorization in the groove!")
+            if log is None:
+                _attach_stream(jit_func, jit_func, f, layout)
+                return jit_func
+
+            wrapper = _fallback_wrapper(
+                f,
+                jit_func,
+                log,
+                "@guvectorized",
+                "Beat it! Numba guvectorize failed at runtime. Falling back.",
+            )
+            _attach_stream(wrapper, jit_func, f, layout)
+            _attach_ufunc_warmup(wrapper, f, jit_func)
+            return wraps(f)(wrapper)
         except Exception:
             logger.warning("Beat it! Numba guvectorize failed. Falling back.")
             return f
@@ -281,11 +1373,17 @@ def moonwalk(func: Callable[P, Any]) -> Callable[P, Awaitable[T]]:
     6
     """
 
+    is_coroutine = inspect.iscoroutinefunction(func)
+    log = _hot_path_log("Moonwalk complete — your async function is now gliding!")
+    if log is None and is_coroutine:
+        return func
+
     @wraps(func)
     async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
-        logger.info("Moonwalk complete — your async function is now gliding!")
+        if log is not None:
+            log()
 
-        if inspect.iscoroutinefunction(func):
+        if is_coroutine:
             return await func(*args, **kwargs)
 
         if hasattr(asyncio, "to_thread"):
@@ -359,16 +1457,125 @@ def thriller(func: Callable[P, T]) -> Callable[P, T]:
 def jam(
     workers: int = 4,
     *,
-    backend: Literal["thread", "process", "async"] = "thread",
+    backend: Literal["thread", "process", "interpreter", "async", "cluster"] = "thread",
+    chunksize: Union[int, Literal["auto"], None] = None,
+    persistent: bool = False,
+    prewarm: bool = False,
+    ordered: bool = False,
+    shared_memory: bool = False,
+    batch: bool = False,
+    axis: int = 0,
+    schedule: Literal["dynamic", "steal"] = "dynamic",
+    star: bool = False,
+    nodes: Optional[Sequence[Union[str, Tuple[str, int]]]] = None,
+    authkey: Union[str, bytes, None] = None,
+    timeout: Optional[float] = None,
+    deadline: Optional[float] = None,
 ) -> Callable[[Callable[[A], T]], Callable[[Sequence[A]], Any]]:
     """Ejecuta ``func`` en paralelo sobre una secuencia de argumentos.
 
     Parámetros
     ----------
     workers: int
-        Número de *workers* concurrentes.
-    backend: {"thread", "process", "async"}
-        Mecanismo de paralelización a utilizar.
+        Número de *workers* concurrentes.  Con ``backend="async"`` es el
+        número máximo de corrutinas en curso y el tamaño del executor que
+        ejecuta las funciones síncronas.
+    backend: {"thread", "process", "interpreter", "async", "cluster"}
+        Mecanismo de paralelización a utilizar.  ``interpreter`` usa
+        subintérpretes con GIL propio (Python 3.14+); como ``process``, envía
+        la entrada en porciones y la función debe poder importarse desde su
+        módulo (o serializarse con ``cloudpickle``).  Ni ella ni su módulo
+        pueden importar NumPy, Numba u otras extensiones sin soporte para
+        subintérpretes, por lo que no sirve para funciones de ``smooth``.
+        :func:`available_backends` indica los disponibles.  En una
+        compilación *free-threaded* sin GIL, ``thread`` ya es paralelo.
+        ``cluster`` reparte porciones entre nodos remotos (ver ``nodes``).
+    chunksize: int o "auto", opcional
+        Número de elementos que se envían juntos a cada proceso con
+        ``backend="process"``.  Cada porción viaja en un único mensaje y sus
+        resultados vuelven también de una vez.  Si es ``None`` se calcula
+        automáticamente a partir del tamaño de la entrada y de ``workers``.
+        Con ``"auto"`` el tamaño se ajusta durante la ejecución midiendo la
+        latencia por elemento y el coste de cada envío; el valor alcanzado se
+        guarda en el historial y sirve de punto de partida en la siguiente
+        llamada.
+    persistent: bool
+        Si es ``True`` los backends ``thread`` y ``process`` reutilizan un pool
+        compartido por ``(backend, workers)`` que sobrevive entre llamadas.
+        La función decorada expone ``pool`` (utilizable como gestor de
+        contexto) y ``shutdown()``; los pools restantes se cierran al salir.
+        Se mantienen como mucho :data:`~smooth_criminal.pools.MAX_POOLS`
+        pools: el menos usado se cierra y arranca de nuevo si se vuelve a usar.
+    prewarm: bool
+        Arranca los *workers* del pool persistente en el momento de decorar.
+        Implica ``persistent=True``.
+    ordered: bool
+        Si es ``True`` los resultados de ``thread`` y ``process`` se devuelven
+        en el orden de la entrada en lugar de en orden de finalización.  Cada
+        *worker* escribe en su propio búfer y estos se combinan una sola vez al
+        final.  Las entradas que fallan se omiten en ambos modos.
+    shared_memory: bool
+        Solo con ``backend="process"`` (con otro backend el decorador lanza
+        ``ValueError``).  Con una entrada ``numpy.ndarray``, copia la
+        entrada a memoria compartida y hace que los *workers* escriban en un
+        arreglo de salida compartido, sin serializar los datos.  Devuelve un
+        ``numpy.ndarray`` en el orden de la entrada.
+    batch: bool
+        Con ``thread`` y ``process``, cada *worker* llama a ``func`` una sola
+        vez con una porción completa de la entrada (una sublista o un
+        subarreglo) en lugar de elemento a elemento, de modo que un núcleo de
+        Numba o NumPy recorre el bucle en código compilado.  Sin ``chunksize``
+        se crea una porción por *worker*.  Los resultados se concatenan en el
+        orden de la entrada; una porción que devuelve un escalar aporta un
+        único elemento.
+    axis: int
+        Eje por el que se dividen y concatenan los ``numpy.ndarray`` en modo
+        ``batch``.
+    schedule: {"dynamic", "steal"}
+        ``"dynamic"`` reparte los elementos uno a uno (``thread``) o en
+        porciones fijas (``process``).  ``"steal"`` asigna a cada *worker* un
+        rango propio y deja que los que terminan antes roben la mitad del
+        trabajo pendiente de los más cargados, útil con costes muy
+        desiguales.  Tras cada llamada, ``stats`` de la función decorada
+        contiene el tiempo ocupado y ocioso de cada *worker*.
+    star: bool
+        Semántica *starmap*: cada tupla o lista se desempaqueta como
+        argumentos posicionales (``(a, b)`` llama a ``func(a, b)``) y un
+        :class:`~smooth_criminal.workers.Args` aporta además los nombrados
+        (``Args(a, b=2)`` llama a ``func(a, b=2)``).  Un par ``(lista, dict)``
+        son dos argumentos posicionales.  No es compatible con ``batch``.
+    nodes: lista de "host:puerto", opcional
+        Nodos del backend ``cluster``, arrancados con
+        ``smooth-criminal worker --listen host:puerto``.  Cada nodo toma
+        porciones de una cola común y, si cae, su porción en curso se reenvía
+        a otro.  Tras cada llamada ``stats["nodes"]`` recoge el rendimiento
+        de cada nodo.  Se ignora con los demás backends.
+    authkey: str o bytes, opcional
+        Clave compartida con los nodos de ``cluster``; por defecto se lee de
+        ``SMOOTH_CRIMINAL_AUTHKEY``.
+    timeout: float, opcional
+        Segundos máximos por elemento con ``thread`` y ``process``.  Los
+        elementos que lo superan se descartan y aparecen en ``timed_out`` del
+        :class:`~smooth_criminal.deadlines.JamResult` devuelto.  Un hilo no se
+        puede interrumpir: se abandona y otro continúa con la cola.  En los
+        procesos se usa ``signal.setitimer`` (solo Unix).
+    deadline: float, opcional
+        Segundos máximos para toda la llamada.  Al vencer se devuelven los
+        resultados parciales; lo que estaba en curso pasa a ``timed_out`` y lo
+        que no había empezado a ``cancelled``.
+
+    Los argumentos nombrados que se pasen en la llamada a la función decorada
+    (``func_jam(datos, escala=2)``) son constantes compartidas por todos los
+    elementos: se fijan una sola vez por *worker* en lugar de viajar con cada
+    elemento.  Con ``process`` e ``interpreter`` se serializan una vez por
+    llamada y cada *worker* las deserializa una sola vez por juego de
+    valores, sin depender del pool.
+
+    Con los backends ``thread`` y ``process`` la función decorada expone
+    además ``imap(iterable)``, que consume la entrada de forma perezosa y
+    produce los resultados a medida que están listos, y ``cancel()``, que
+    desde otro hilo deja de repartir elementos de las llamadas en curso; los
+    no iniciados se devuelven en ``cancelled``.
 
     Ejemplo
     -------
@@ -379,96 +1586,448 @@ def jam(
     ...     return x * x
     >>> sorted(cuadrado([1, 2, 3]))
     [1, 4, 9]
+    >>> from smooth_criminal.workers import Args
+    >>> @jam(workers=2, star=True, ordered=True)
+    ... def potencia(base: int, exp: int, factor: int = 1) -> int:
+    ...     return factor * base**exp
+    >>> potencia([(2, 3), Args(3, exp=2)], factor=10)
+    [80, 90]
     """
 
+    autotune = chunksize == "auto"
+    if not autotune and chunksize is not None and (
+        not isinstance(chunksize, int) or chunksize < 1
+    ):
+        raise ValueError("chunksize must be a positive integer or 'auto'")
+    fixed_chunksize: Optional[int] = None if autotune else chunksize
+    if schedule not in ("dynamic", "steal"):
+        raise ValueError(f"Unknown schedule: {schedule}")
+    if shared_memory and backend != "process":
+        raise ValueError(f"shared_memory requires the process backend, not: {backend}")
+    if backend == "interpreter" and not supports("interpreter"):
+        raise RuntimeError(
+            "The interpreter backend requires concurrent.futures.InterpreterPoolExecutor (Python 3.14+)"
+        )
+    if batch and backend not in ("thread",) + _REMOTE_BACKENDS:
+        raise ValueError(f"batch mode is not supported by backend: {backend}")
+    if batch and star:
+        raise ValueError("star and batch modes cannot be combined")
+    if backend == "cluster":
+        if not nodes:
+            raise ValueError("The cluster backend requires at least one node")
+        if schedule != "dynamic" or persistent or prewarm:
+            raise ValueError(
+                "The cluster backend does not support schedule='steal' or persistent pools"
+            )
+    for name, value in (("timeout", timeout), ("deadline", deadline)):
+        if value is not None and not value > 0:
+            raise ValueError(f"{name} must be a positive number of seconds")
+    with_deadlines = timeout is not None or deadline is not None
+    if with_deadlines and (
+        backend not in ("thread",) + _REMOTE_BACKENDS
+        or batch
+        or autotune
+        or schedule != "dynamic"
+    ):
+        raise ValueError(
+            "timeout and deadline require the thread or process backend with the dynamic schedule"
+        )
+
     def decorator(func: Callable[[A], T]) -> Callable[[Sequence[A]], Any]:
         if backend == "async":
+            async_pool: Optional[WorkerPool] = None
+            if persistent or prewarm:
+                async_pool = get_pool("thread", workers)
+                if prewarm:
+                    async_pool.warmup()
+
             if inspect.iscoroutinefunction(func):
-                async def async_wrapper(args_list: Sequence[A]) -> List[T]:
+                async def async_wrapper(args_list: Sequence[A], **constants: Any) -> List[T]:
                     logger.info(
                         f"🎶 Async jam session with {workers} workers (async func)"
                     )
-                    tasks = [func(arg) for arg in args_list]
-                    return await asyncio.gather(*tasks)
+                    call = _bind(func, star, constants)
+                    return await _drain_async(call, args_list, workers)
 
-                return wraps(func)(async_wrapper)
+            else:
+                async def async_wrapper(args_list: Sequence[A], **constants: Any) -> List[T]:
+                    logger.info(
+                        f"🎶 Async jam session with {workers} workers (sync func)"
+                    )
+                    loop = asyncio.get_running_loop()
+                    bound = _bind(func, star, constants)
+                    with borrow_executor("thread", workers, async_pool) as executor:
 
-            async def async_wrapper(args_list: Sequence[A]) -> List[T]:
-                logger.info(
-                    f"🎶 Async jam session with {workers} workers (sync func)"
-                )
-                loop = asyncio.get_event_loop()
-                tasks = [loop.run_in_executor(None, func, arg) for arg in args_list]
-                return await asyncio.gather(*tasks)
+                        def call(arg: A) -> Awaitable[T]:
+                            return loop.run_in_executor(executor, bound, arg)
+
+                        return await _drain_async(call, args_list, workers)
+
+            def async_shutdown(wait: bool = True) -> None:
+                if async_pool is not None:
+                    async_pool.shutdown(wait=wait)
 
+            async_wrapper.pool = async_pool
+            async_wrapper.shutdown = async_shutdown
             return wraps(func)(async_wrapper)
 
         module_name = func.__module__
         func_name = func.__name__
-        if backend == "process":
-            module = sys.modules.get(module_name)
-            orig_name = f"__jam_orig_{func_name}"
-            setattr(module, orig_name, func)
-            target_name = orig_name
-        else:
-            target_name = func_name
+        executor_options: Dict[str, Any] = {}
+        token: Optional[str] = None
+        if backend in _REMOTE_BACKENDS:
+            # La función viaja una vez por worker en el inicializador del pool
+            # y cada porción solo lleva su token (ver ``shipping``).
+            token = shipping.function_token(func)
+            shipping.register(token, func)
+
+            def initargs() -> Tuple[Any, ...]:
+                payload = shipping.serialize(func, inherit=backend == "process")
+                return token, payload, shipping.compiled_signatures(func)
+
+            executor_options = {"initializer": shipping.install, "initargs": initargs}
+
+        pool: Optional[WorkerPool] = None
+        if (persistent or prewarm) and backend != "cluster":
+            pool = get_pool(backend, workers, token=token, **executor_options)
+            if prewarm:
+                pool.warmup()
+        def make_ref(constants: Dict[str, Any]) -> Any:
+            if token is not None:
+                return shipping.ShippedRef(token, star, *shipping.pack_constants(constants))
+            return _FuncRef(module_name, func_name, star, constants)
+
+        active: Set[CancelScope] = set()
+
+        def thread_backend(args_list: Sequence[A], **constants: Any) -> List[T]:
+            scope = CancelScope()
+            active.add(scope)
+            try:
+                return dispatch(args_list, constants, scope)
+            finally:
+                active.discard(scope)
 
-        def thread_backend(args_list: Sequence[A]) -> List[T]:
+        def dispatch(
+            args_list: Sequence[A], constants: Dict[str, Any], scope: CancelScope
+        ) -> List[T]:
             logger.info(
                 f"🎶 Don't stop 'til you get enough... workers! (x{workers}, backend={backend})"
             )
             results: List[T] = []
+            call = _bind(func, star, constants)
+            ref = make_ref(constants)
 
-            if backend == "thread":
-                from queue import Queue, Empty
-                import threading
+            if batch:
+                return run_batches(args_list, call, ref)
 
-                q: Queue = Queue()
-                for arg in args_list:
-                    q.put(arg)
+            if schedule == "steal" and backend in ("thread",) + _REMOTE_BACKENDS:
+                return run_stealing(args_list, call, ref)
 
-                lock = threading.Lock()
+            if with_deadlines:
+                return run_with_deadlines(args_list, call, ref, scope)
 
-                def worker() -> None:
-                    while True:
-                        try:
-                            arg = q.get_nowait()
-                        except Empty:
+            if backend == "thread":
+                # Los workers reparten los índices con un contador compartido
+                # en lugar de una cola (ver ``_index_counter``).
+                next_index = _index_counter()
+                total = len(args_list)
+
+                def worker() -> List[Any]:
+                    buffer: List[Any] = []
+                    while not scope.cancelled:
+                        index = next_index()
+                        if index >= total:
                             break
+                        arg = args_list[index]
                         try:
-                            res = func(arg)
-                            with lock:
-                                results.append(res)
+                            res = call(arg)
                         except Exception as e:
                             logger.warning(f"Worker failed on input {arg}: {e}")
+                            continue
+                        buffer.append((index, res) if ordered else res)
+                    return buffer
 
-                with ThreadPoolExecutor(max_workers=workers) as executor:
+                with borrow_executor(backend, workers, pool, **executor_options) as executor:
                     futures = [executor.submit(worker) for _ in range(workers)]
-                    for future in as_completed(futures):
-                        future.result()
+                    buffers = [future.result() for future in as_completed(futures)]
+                # Tras una cancelación, el contador apunta al primer índice que
+                # ningún worker llegó a tomar.
+                cancelled = args_list[next_index() :] if scope.cancelled else ()
+
+                if not ordered:
+                    for buffer in buffers:
+                        results.extend(buffer)
+                    return JamResult(results, cancelled=cancelled)
+
+                slots: List[Any] = [_MISSING] * total
+                for buffer in buffers:
+                    for index, res in buffer:
+                        slots[index] = res
+                return JamResult(
+                    (res for res in slots if res is not _MISSING), cancelled=cancelled
+                )
 
+            if backend in _REMOTE_BACKENDS:
+                size = fixed_chunksize or _default_chunksize(len(args_list), workers)
+                if (
+                    shared_memory
+                    and _is_ndarray(args_list)
+                    and args_list.ndim > 0
+                ):
+                    from smooth_criminal.sharedmem import map_shared
+
+                    with borrow_executor(backend, workers, pool, **executor_options) as executor:
+                        return map_shared(executor, ref, call, args_list, size)
+
+                if autotune:
+                    with borrow_executor(backend, workers, pool, **executor_options) as executor:
+                        return autotuned(executor, args_list, ref)
+
+                chunks = [
+                    args_list[i : i + size] for i in range(0, len(args_list), size)
+                ]
+
+                cancelled: List[A] = []
+                with borrow_executor(backend, workers, pool, **executor_options) as executor:
+                    futures = {
+                        executor.submit(_process_chunk, ref, chunk): position
+                        for position, chunk in enumerate(chunks)
+                    }
+                    scope.track(futures)
+                    chunk_results: List[List[T]] = [[] for _ in chunks]
+                    for future in as_completed(futures):
+                        position = futures[future]
+                        if future.cancelled():
+                            cancelled.extend(chunks[position])
+                        elif ordered:
+                            chunk_results[position] = future.result()
+                        else:
+                            results.extend(future.result())
+
+                for chunk_result in chunk_results:
+                    results.extend(chunk_result)
+                return JamResult(results, cancelled=cancelled)
+
+            if backend == "cluster":
+                from smooth_criminal.cluster import run_cluster
+
+                size = fixed_chunksize or _default_chunksize(len(args_list), len(nodes))
+                outputs, stats = run_cluster(nodes, ref, args_list, size, authkey)
+                if ordered:
+                    outputs.sort(key=lambda pair: pair[0])
+                for _, chunk_results in outputs:
+                    results.extend(chunk_results)
+                thread_backend.stats = stats
                 return results
 
-            if backend == "process":
-                from multiprocessing import Manager
+            raise ValueError(f"Unknown backend: {backend}")
+
+        def run_with_deadlines(
+            args_list: Sequence[A], call, ref: Any, scope: CancelScope
+        ) -> JamResult:
+            from smooth_criminal.deadlines import (
+                process_chunk_deadline,
+                run_chunks,
+                run_threads,
+            )
+
+            if backend == "thread":
+                return run_threads(
+                    call,
+                    args_list,
+                    workers,
+                    scope,
+                    timeout=timeout,
+                    deadline=deadline,
+                    ordered=ordered,
+                )
+
+            def submit(executor, chunk):
+                return executor.submit(process_chunk_deadline, ref, chunk, timeout)
 
-                manager = Manager()
-                q = manager.Queue()
-                for arg in args_list:
-                    q.put(arg)
+            size = fixed_chunksize or _default_chunksize(len(args_list), workers)
+            executor = pool.executor if pool is not None else create_executor(backend, workers, **executor_options)
+            stuck = False
+            try:
+                result, stuck = run_chunks(
+                    executor,
+                    submit,
+                    args_list,
+                    size,
+                    workers,
+                    scope,
+                    deadline=deadline,
+                    ordered=ordered,
+                )
+            finally:
+                # Los procesos con porciones colgadas se terminan; un pool
+                # persistente se vuelve a crear en la siguiente llamada.
+                if stuck and pool is not None:
+                    pool.abandon()
+                elif stuck:
+                    abandon_executor(executor)
+                elif pool is None:
+                    executor.shutdown()
+            return result
 
-                with ProcessPoolExecutor(max_workers=workers) as executor:
+        def run_batches(args_list: Sequence[A], call, ref: Any) -> Any:
+            pieces = _split_batches(args_list, workers, fixed_chunksize, axis)
+            with borrow_executor(backend, workers, pool, **executor_options) as executor:
+                if backend in _REMOTE_BACKENDS:
                     futures = [
-                        executor.submit(_process_worker, module_name, target_name, q)
-                        for _ in range(workers)
+                        executor.submit(_process_batch, ref, piece)
+                        for piece in pieces
                     ]
-                    for future in as_completed(futures):
-                        results.extend(future.result())
-
-                return results
+                else:
+                    futures = [executor.submit(_apply_batch, call, piece) for piece in pieces]
+                outputs = [future.result() for future in futures]
+            return _join_batches(outputs, axis)
 
-            raise ValueError(f"Unknown backend: {backend}")
+        def run_stealing(args_list: Sequence[A], call, ref: Any) -> List[T]:
+            from smooth_criminal.scheduling import steal_processes, steal_threads
 
+            results: List[T] = []
+            with borrow_executor(backend, workers, pool, **executor_options) as executor:
+                if backend == "thread":
+                    buffers, stats = steal_threads(executor, call, args_list, workers)
+                    pairs = [pair for buffer in buffers for pair in buffer]
+                    if ordered:
+                        pairs.sort(key=lambda pair: pair[0])
+                    results.extend(res for _, res in pairs)
+                else:
+                    grain = fixed_chunksize or max(len(args_list) // (workers * 16), 1)
+
+                    def submit(executor, chunk):
+                        return executor.submit(_process_chunk_timed, ref, chunk)
+
+                    outputs, stats = steal_processes(
+                        executor, submit, args_list, workers, grain
+                    )
+                    if ordered:
+                        outputs.sort(key=lambda pair: pair[0])
+                    for _, chunk_results in outputs:
+                        results.extend(chunk_results)
+
+            thread_backend.stats = stats
+            return results
+
+        ordered_default = ordered
+        learned: Dict[str, Optional[int]] = {"chunksize": None}
+
+        def autotuned(executor, args_list: Sequence[A], ref: Any) -> List[T]:
+            if learned["chunksize"] is None:
+                learned["chunksize"] = _learned_chunksize(func_name)
+            tuner = _ChunkTuner(workers, learned["chunksize"] or 1)
+            total = len(args_list)
+            start_time = time.perf_counter()
+            pending: Dict[Any, Tuple[int, int, float]] = {}
+            by_start: Dict[int, List[T]] = {}
+            results: List[T] = []
+            position = 0
+
+            while position < total or pending:
+                while position < total and len(pending) < workers:
+                    size = tuner.next_size(total - position)
+                    chunk = args_list[position : position + size]
+                    future = executor.submit(_process_chunk_timed, ref, chunk)
+                    pending[future] = (position, len(chunk), time.perf_counter())
+                    position += len(chunk)
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    chunk_start, count, submitted = pending.pop(future)
+                    chunk_results, compute = future.result()
+                    tuner.record(count, compute, time.perf_counter() - submitted)
+                    if ordered:
+                        by_start[chunk_start] = chunk_results
+                    else:
+                        results.extend(chunk_results)
+
+            if ordered:
+                for chunk_start in sorted(by_start):
+                    results.extend(by_start[chunk_start])
+
+            learned["chunksize"] = tuner.size
+            logger.info(f"🎚 jam autotune settled on chunksize={tuner.size}")
+            memory.log_execution_stats(
+                func_name=func_name,
+                input_type=type(args_list),
+                decorator_used="@jam",
+                duration=round(time.perf_counter() - start_time, 6),
+                metadata={"backend": backend, "chunksize": tuner.size},
+            )
+            return results
+
+        def submit_chunk(executor, chunk: List[A], call, ref: Any):
+            if backend in _REMOTE_BACKENDS:
+                return executor.submit(_process_chunk, ref, chunk)
+            return executor.submit(_apply_chunk, call, chunk)
+
+        def imap(
+            iterable: Iterable[A],
+            *,
+            ordered: Optional[bool] = None,
+            prefetch: int = 2,
+            **constants: Any,
+        ) -> Iterator[T]:
+            """Aplica ``func`` de forma perezosa sobre cualquier iterable.
+
+            Solo hay ``workers * prefetch`` porciones en vuelo a la vez, por lo
+            que la memoria no crece con el tamaño de la entrada.  Los
+            resultados se producen según terminan o, con ``ordered=True``, en
+            el orden de la entrada.  Los argumentos nombrados restantes son
+            constantes para todos los elementos, como en la llamada directa.
+            """
+
+            if backend not in ("thread",) + _REMOTE_BACKENDS:
+                raise ValueError(f"imap is not supported by backend: {backend}")
+            if prefetch < 1:
+                raise ValueError("prefetch must be a positive integer")
+            keep_order = ordered_default if ordered is None else ordered
+            max_pending = workers * prefetch
+            call = _bind(func, star, constants)
+            ref = make_ref(constants)
+            chunks = _iter_chunks(iterable, fixed_chunksize or learned["chunksize"] or 1)
+
+            with borrow_executor(backend, workers, pool, **executor_options) as executor:
+                pending: deque = deque()
+                try:
+                    for chunk in chunks:
+                        if len(pending) >= max_pending:
+                            if keep_order:
+                                yield from pending.popleft().result()
+                            else:
+                                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                                for future in done:
+                                    pending.remove(future)
+                                    yield from future.result()
+                        pending.append(submit_chunk(executor, chunk, call, ref))
+
+                    if keep_order:
+                        while pending:
+                            yield from pending.popleft().result()
+                    else:
+                        for future in as_completed(pending):
+                            yield from future.result()
+                        pending.clear()
+                finally:
+                    for future in pending:
+                        future.cancel()
+
+        def shutdown(wait: bool = True) -> None:
+            if pool is not None:
+                pool.shutdown(wait=wait)
+
+        def cancel() -> None:
+            for scope in list(active):
+                scope.cancel()
+
+        thread_backend.pool = pool
+        thread_backend.cancel = cancel
+        thread_backend.shutdown = shutdown
+        thread_backend.stats = None
+        thread_backend.imap = imap
+        thread_backend._jam_target = func
         return wraps(func)(thread_backend)
 
     return decorator
@@ -495,7 +2054,7 @@ def black_or_white(mode: Mode = "auto") -> Callable[[Callable[P, T]], Callable[P
         def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
             converted_args: List[Any] = []
             for arg in args:
-                if isinstance(arg, np.ndarray):
+                if _is_ndarray(arg):
                     if mode == "light":
                         arg = _convert_to_light(arg)
                         logger.info(
@@ -523,6 +2082,7 @@ def black_or_white(mode: Mode = "auto") -> Callable[[Callable[P, T]], Callable[P
     return decorator
 
 def _convert_to_light(arr):
+    np = _numpy()
     if np.issubdtype(arr.dtype, np.integer):
         return arr.astype(np.int32)
     elif np.issubdtype(arr.dtype, np.floating):
@@ -530,6 +2090,7 @@ def _convert_to_light(arr):
     return arr
 
 def _convert_to_precise(arr):
+    np = _numpy()
     if np.issubdtype(arr.dtype, np.integer):
         return arr.astype(np.int64)
     elif np.issubdtype(arr.dtype, np.floating):
@@ -572,9 +2133,48 @@ def beat_it(
 
     return decorator
 
-def bad(parallel: bool = False) -> Callable[[Callable[P, T]], Callable[P, T]]:
+def _parallel_diagnostics(dispatcher: Any, sig: Any) -> Optional[str]:
+    """Texto de ``parallel_diagnostics`` de Numba para ``sig``.
+
+    Numba solo genera los diagnósticos al compilar; las firmas cargadas de la
+    caché en disco no los tienen.
+    """
+
+    import contextlib
+    import io
+
+    buffer = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(buffer):
+            dispatcher.parallel_diagnostics(sig, level=1)
+    except Exception:
+        if dispatcher.stats.cache_hits.get(sig):
+            return "unavailable: loaded from Numba's disk cache"
+        return None
+    return buffer.getvalue().strip() or None
+
+
+def bad(
+    parallel: bool = False,
+    *,
+    signatures: Optional[Sequence[Any]] = None,
+    auto_prange: bool = True,
+) -> Callable[[Callable[P, T]], Callable[P, T]]:
     """Aplica optimizaciones agresivas de Numba a ``func``.
 
+    ``signatures`` se compilan al decorar, como en :func:`smooth`, y la
+    función devuelta expone también ``warmup(*ejemplo)``.
+
+    Con ``parallel=True`` y ``auto_prange`` (por defecto), los bucles
+    ``for ... in range(...)`` exteriores sin dependencias entre iteraciones
+    se reescriben con ``numba.prange`` antes de compilar (ver
+    :func:`smooth_criminal.analizer.plan_prange`).  El informe de bucles
+    convertidos y rechazados queda en ``prange_report`` y, junto con los
+    diagnósticos paralelos de Numba, en el historial la primera vez que se
+    ejecuta cada firma.  Si Numba no acepta la versión reescrita (con
+    cualquier excepción, al llamarla o al precompilar ``signatures`` y en
+    ``warmup``) y la original sí funciona, se pasa a la original.
+
     Ejemplo
     -------
     >>> import logging
@@ -588,17 +2188,105 @@ def bad(parallel: bool = False) -> Callable[[Callable[P, T]], Callable[P, T]]:
 
     def decorator(func: Callable[P, T]) -> Callable[P, T]:
         try:
-            jit_func = jit(
-                nopython=True, fastmath=True, cache=True, parallel=parallel
-            )(func)
+            options = dict(nopython=True, fastmath=True, cache=True, parallel=parallel)
+            report: Optional[Dict[str, Any]] = None
+            target = func
+            if parallel and auto_prange:
+                from smooth_criminal.analizer import parallelize_loops
+
+                target, report = parallelize_loops(func)
+            jit_func = _numba().jit(**options)(target)
+            log = _hot_path_log(
+                "🕶 Who's bad? This function is. Activating aggressive optimizations."
+            )
+            if log is None and target is func:
+                _attach_warmup(jit_func, func, jit_func, signatures)
+                if report is not None:
+                    jit_func.prange_report = report
+                return jit_func
+            if log is None:
+                # La versión reescrita necesita el envoltorio con *fallback*.
+                def log() -> None:
+                    return None
+
+            if not parallel:
+
+                @wraps(func)
+                def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+                    log()
+                    return jit_func(*args, **kwargs)
+
+                _attach_warmup(wrapper, func, jit_func, signatures)
+                return wrapper
+
+            current = [jit_func]
+            original: List[Any] = []
+            recorded: Set[str] = set()
+
+            def retry_original(error: Exception, attempt: Callable[[Any], Any]) -> Any:
+                # Numba rechaza algunos ``prange`` con excepciones que no son
+                # ``NumbaError`` (``ValueError``, ``AssertionError``...).  Si
+                # la función original resuelve lo mismo, el problema era la
+                # reescritura; si también falla, su error es del código.
+                if not original:
+                    original.append(_numba().jit(**options)(func))
+                result = attempt(original[0])
+                if current[0] is jit_func:
+                    logger.warning(
+                        f"Beat it! Numba rejected the prange rewrite of {func.__qualname__}: {error}"
+                    )
+                    reason = f"{type(error).__name__}: {error}".splitlines()[0]
+                    report["error"] = reason
+                    report["rejected"] += [
+                        {**entry, "reason": "rejected by Numba"} for entry in report["converted"]
+                    ]
+                    report["converted"] = []
+                    current[0] = original[0]
+                return result
+
+            def compile_signature(sig: Any) -> Any:
+                dispatcher = current[0]
+                try:
+                    return dispatcher.compile(sig)
+                except Exception as e:
+                    if target is func or dispatcher is not jit_func:
+                        raise
+                    return retry_original(e, lambda fallback: fallback.compile(sig))
+
+            def record(dispatcher: Any, duration: float) -> None:
+                for sig in list(dispatcher.signatures):
+                    if str(sig) in recorded:
+                        continue
+                    recorded.add(str(sig))
+                    memory.log_execution_stats(
+                        func_name=func.__name__,
+                        input_type=str(sig),
+                        decorator_used="@bad",
+                        duration=duration,
+                        metadata={
+                            "prange": report,
+                            "parallel_diagnostics": _parallel_diagnostics(dispatcher, sig),
+                        },
+                    )
 
             @wraps(func)
             def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
-                logger.info(
-                    "🕶 Who's bad? This function is. Activating aggressive optimizations."
-                )
-                return jit_func(*args, **kwargs)
-
+                log()
+                dispatcher = current[0]
+                start = time.perf_counter()
+                try:
+                    result = dispatcher(*args, **kwargs)
+                except Exception as e:
+                    if target is func or dispatcher is not jit_func:
+                        raise
+                    result = retry_original(e, lambda fallback: fallback(*args, **kwargs))
+                    dispatcher = current[0]
+                if len(dispatcher.signatures) != len(recorded):
+                    record(dispatcher, time.perf_counter() - start)
+                return result
+
+            _attach_warmup(wrapper, func, jit_func, signatures, compile=compile_signature)
+            wrapper.prange_report = report
             return wrapper
         except Exception as e:
             logger.warning(
@@ -607,6 +2295,8 @@ def bad(parallel: bool = False) -> Callable[[Callable[P, T]], Callable[P, T]]:
             return func
 
     return decorator
+
+
 def dangerous(
     func: Callable[P, T], *, parallel: bool = True
 ) -> Callable[P, T]:
@@ -0,0 +1,165 @@
+"""Elección entre los *targets* ``cpu`` y ``parallel`` de ``vectorized``.
+
+Un *ufunc* con ``target="parallel"`` reparte el trabajo entre hilos, lo que
+solo compensa a partir de cierto tamaño de entrada.  :func:`calibrate` mide
+ambas variantes con entradas de tamaño creciente y devuelve el primer tamaño
+en que la paralela es claramente más rápida (el punto de cruce).
+
+El resultado depende de la máquina y del *kernel*, así que se guarda por
+máquina y función en ``~/.smooth_criminal_crossover.json`` (o en
+``SMOOTH_CRIMINAL_CROSSOVER_PATH``) y solo se calibra una vez.  La
+calibración tarda segundos: ``vectorized(auto_target=True)`` la lanza en un
+hilo aparte con una copia reducida de la primera llamada (ver
+:func:`snapshot`) o la ejecuta al arrancar con ``calibrate(*ejemplo)``.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import os
+import platform
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger("SmoothCriminal")
+
+#: Tamaños (número de elementos) con los que se calibra.
+CALIBRATION_SIZES: Sequence[int] = tuple(4**k for k in range(5, 11))
+
+#: La variante paralela debe ser al menos este factor más rápida.
+MARGIN = 0.9
+
+_LOCK = threading.Lock()
+
+
+def crossover_path() -> Path:
+    """Fichero donde se guardan los puntos de cruce calibrados."""
+
+    path = os.getenv("SMOOTH_CRIMINAL_CROSSOVER_PATH")
+    return Path(path) if path else Path.home() / ".smooth_criminal_crossover.json"
+
+
+def machine_key() -> str:
+    """Identifica la máquina: nombre de host y número de CPUs."""
+
+    return f"{platform.node()}:{os.cpu_count()}"
+
+
+def _load() -> Dict[str, Any]:
+    try:
+        with open(crossover_path(), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def load_crossover(name: str) -> Optional[float]:
+    """Punto de cruce guardado para ``name`` en esta máquina.
+
+    ``None`` si no se ha calibrado; ``math.inf`` si la variante paralela
+    nunca compensó.
+    """
+
+    entry = _load().get(machine_key(), {}).get(name)
+    if entry is None:
+        return None
+    value = entry.get("crossover")
+    return math.inf if value is None else value
+
+
+def save_crossover(name: str, crossover: float) -> None:
+    """Guarda el punto de cruce de ``name`` para esta máquina."""
+
+    with _LOCK:
+        data = _load()
+        data.setdefault(machine_key(), {})[name] = {
+            "crossover": None if math.isinf(crossover) else int(crossover),
+            "calibrated": datetime.now(timezone.utc).isoformat(),
+        }
+        path = crossover_path()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+
+
+def largest_size(args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> int:
+    """Número de elementos del mayor arreglo de la llamada (0 si no hay)."""
+
+    size = 0
+    for value in (*args, *kwargs.values()):
+        if isinstance(value, np.ndarray) and value.size > size:
+            size = value.size
+    return size
+
+
+def snapshot(
+    args: Tuple[Any, ...], kwargs: Dict[str, Any], limit: Optional[int] = None
+) -> Tuple[Tuple[Any, ...], Dict[str, Any]]:
+    """Copia los primeros ``limit`` elementos de cada arreglo de la llamada.
+
+    :func:`calibrate` solo usa los valores para construir entradas de otros
+    tamaños, así que basta una muestra (por defecto, del menor tamaño de
+    :data:`CALIBRATION_SIZES`) que no retiene la entrada original.
+    """
+
+    limit = limit or min(CALIBRATION_SIZES)
+
+    def sample(value: Any) -> Any:
+        if isinstance(value, np.ndarray):
+            return value.ravel()[:limit].copy()
+        return value
+
+    return tuple(sample(arg) for arg in args), {key: sample(value) for key, value in kwargs.items()}
+
+
+def _best_time(func: Callable[..., Any], args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> float:
+    best = math.inf
+    for _ in range(3):
+        start = time.perf_counter()
+        func(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def calibrate(
+    serial: Callable[..., Any],
+    parallel: Callable[..., Any],
+    args: Tuple[Any, ...],
+    kwargs: Optional[Dict[str, Any]] = None,
+    sizes: Optional[Sequence[int]] = None,
+) -> float:
+    """Mide ``serial`` y ``parallel`` y devuelve el punto de cruce.
+
+    Las entradas se construyen a partir de los arreglos de ``args`` y
+    ``kwargs`` (redimensionados con :func:`numpy.resize`, de modo que
+    conservan sus valores y ``dtype``); los escalares se mantienen.  Devuelve
+    ``math.inf`` si la variante paralela no gana con ningún tamaño.
+    """
+
+    kwargs = kwargs or {}
+
+    def resize(value: Any, size: int) -> Any:
+        if isinstance(value, np.ndarray):
+            return np.resize(value.ravel(), size)
+        return value
+
+    for size in sizes or CALIBRATION_SIZES:
+        sample_args = tuple(resize(arg, size) for arg in args)
+        sample_kwargs = {key: resize(value, size) for key, value in kwargs.items()}
+        serial(*sample_args, **sample_kwargs)  # compila antes de medir
+        parallel(*sample_args, **sample_kwargs)
+        t_serial = _best_time(serial, sample_args, sample_kwargs)
+        t_parallel = _best_time(parallel, sample_args, sample_kwargs)
+        logger.debug(
+            f"Crossover size {size}: cpu {t_serial:.6f}s, parallel {t_parallel:.6f}s"
+        )
+        if t_parallel < t_serial * MARGIN:
+            return size
+    return math.inf
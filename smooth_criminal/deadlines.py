@@ -0,0 +1,331 @@
+"""Plazos, tiempos límite y cancelación para :func:`smooth_criminal.core.jam`.
+
+Un único elemento colgado no debe bloquear toda una llamada a ``jam``.  Este
+módulo ofrece:
+
+* :class:`JamResult`, una lista de resultados que además recuerda qué
+  elementos superaron su plazo (``timed_out``) y cuáles no llegaron a empezar
+  por una cancelación o por agotar el plazo global (``cancelled``).
+* :class:`CancelScope`, la señal cooperativa que consultan los *workers* antes
+  de tomar cada elemento y que cancela los *futures* aún no iniciados.
+* :func:`run_threads` y :func:`run_chunks`, los bucles de ``thread`` y
+  ``process`` que aplican un tiempo límite por elemento y un plazo por
+  llamada.
+
+Un hilo no se puede interrumpir desde fuera: cuando un elemento supera su
+tiempo límite, su hilo se abandona (es un hilo *daemon* que termina por su
+cuenta y cuyo resultado se descarta) y otro hilo nuevo sigue con la cola.  En
+los procesos el tiempo límite por elemento se aplica dentro del *worker* con
+``signal.setitimer`` en sistemas Unix; si al vencer el plazo global quedan
+porciones en curso, los procesos del pool se terminan.
+"""
+
+from __future__ import annotations
+
+import itertools
+import logging
+import signal
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, CancelledError, Executor, Future, wait
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+logger = logging.getLogger("SmoothCriminal")
+
+
+class JamResult(list):
+    """Resultados de ``jam`` junto con los elementos que no se completaron.
+
+    Se comporta como una lista normal.  ``timed_out`` contiene las entradas
+    que superaron el tiempo límite (o que seguían en curso al vencer el plazo
+    global) y ``cancelled`` las que no llegaron a empezar.
+    """
+
+    def __init__(
+        self,
+        results: Iterable[Any] = (),
+        timed_out: Iterable[Any] = (),
+        cancelled: Iterable[Any] = (),
+    ) -> None:
+        super().__init__(results)
+        self.timed_out = list(timed_out)
+        self.cancelled = list(cancelled)
+
+    @property
+    def complete(self) -> bool:
+        """``True`` si ningún elemento se quedó sin procesar."""
+        return not self.timed_out and not self.cancelled
+
+
+class ItemTimeout(BaseException):
+    """Se lanza dentro del *worker* cuando un elemento agota su tiempo.
+
+    Hereda de :class:`BaseException` para que un ``except Exception`` de la
+    función del usuario no la absorba.
+    """
+
+
+class CancelScope:
+    """Señal de cancelación de una llamada en curso a ``jam``."""
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+        self._futures: List[Future] = []
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def track(self, futures: Iterable[Future]) -> None:
+        """Registra *futures* que deben cancelarse junto con la llamada."""
+        futures = list(futures)
+        with self._lock:
+            self._futures.extend(futures)
+        if self.cancelled:
+            for future in futures:
+                future.cancel()
+
+    def cancel(self) -> None:
+        """Deja de repartir trabajo y cancela lo que aún no ha empezado."""
+        self._event.set()
+        with self._lock:
+            futures = list(self._futures)
+        for future in futures:
+            future.cancel()
+
+
+def _raise_timeout(signum, frame) -> None:
+    raise ItemTimeout()
+
+
+def call_with_timeout(func: Callable[[Any], Any], arg: Any, timeout: Optional[float]) -> Any:
+    """Ejecuta ``func(arg)`` con un temporizador ``SIGALRM`` si es posible.
+
+    Solo funciona en el hilo principal de un proceso Unix; en otro caso la
+    llamada se ejecuta sin tiempo límite.
+    """
+
+    if timeout is None or not hasattr(signal, "setitimer"):
+        return func(arg)
+    try:
+        previous = signal.signal(signal.SIGALRM, _raise_timeout)
+    except ValueError:  # fuera del hilo principal o de un subintérprete
+        return func(arg)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return func(arg)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def process_chunk_deadline(
+    ref: Any, chunk: Sequence[Any], timeout: Optional[float]
+) -> Tuple[List[Any], List[int]]:
+    """Procesa una porción en un *worker* aplicando el tiempo por elemento.
+
+    Devuelve los resultados válidos y las posiciones, relativas a la porción,
+    de los elementos que agotaron su tiempo.
+    """
+
+    func = ref.resolve()
+    results: List[Any] = []
+    timed_out: List[int] = []
+    for offset, arg in enumerate(chunk):
+        try:
+            results.append(call_with_timeout(func, arg, timeout))
+        except ItemTimeout:
+            logger.warning(f"Worker timed out on input {arg}")
+            timed_out.append(offset)
+        except Exception as e:
+            logger.warning(f"Worker failed on input {arg}: {e}")
+    return results, timed_out
+
+
+def run_threads(
+    call: Callable[[Any], Any],
+    args_list: Sequence[Any],
+    workers: int,
+    scope: CancelScope,
+    *,
+    timeout: Optional[float] = None,
+    deadline: Optional[float] = None,
+    ordered: bool = False,
+) -> JamResult:
+    """Reparte ``args_list`` entre hilos *daemon* vigilando los plazos.
+
+    Un hilo coordinador duerme hasta el siguiente vencimiento; si un
+    elemento supera ``timeout`` se marca como ``timed_out``, su hilo se
+    abandona y se arranca otro en su lugar.  Al vencer ``deadline`` los
+    elementos en curso pasan a ``timed_out`` y los no iniciados a
+    ``cancelled``.
+    """
+
+    total = len(args_list)
+    stop_at = None if deadline is None else time.monotonic() + deadline
+    cond = threading.Condition()
+    cursor = [0]
+    stopped = [False]
+    finished: List[Tuple[int, Any]] = []
+    running: Dict[int, Tuple[int, float]] = {}
+    alive: Set[int] = set()
+    abandoned: Set[int] = set()
+    timed_out: List[int] = []
+    slots = itertools.count()
+
+    def worker(slot: int) -> None:
+        try:
+            while True:
+                with cond:
+                    if (
+                        slot in abandoned
+                        or stopped[0]
+                        or scope.cancelled
+                        or cursor[0] >= total
+                    ):
+                        return
+                    index = cursor[0]
+                    cursor[0] += 1
+                    running[slot] = (index, time.monotonic())
+                    # El coordinador puede estar esperando sin vencimientos.
+                    cond.notify_all()
+                arg = args_list[index]
+                try:
+                    res, ok = call(arg), True
+                except Exception as e:
+                    logger.warning(f"Worker failed on input {arg}: {e}")
+                    res, ok = None, False
+                with cond:
+                    if slot in abandoned:
+                        return
+                    running.pop(slot, None)
+                    if ok:
+                        finished.append((index, res))
+        finally:
+            with cond:
+                alive.discard(slot)
+                cond.notify_all()
+
+    def spawn() -> None:
+        slot = next(slots)
+        alive.add(slot)
+        threading.Thread(target=worker, args=(slot,), daemon=True).start()
+
+    def abandon(slot: int) -> None:
+        index, _ = running.pop(slot)
+        timed_out.append(index)
+        abandoned.add(slot)
+        alive.discard(slot)
+
+    with cond:
+        for _ in range(max(min(workers, total), 0)):
+            spawn()
+        while alive:
+            now = time.monotonic()
+            if stop_at is not None and now >= stop_at:
+                stopped[0] = True
+                for slot in list(running):
+                    abandon(slot)
+                break
+            if timeout is not None:
+                for slot, (index, started) in list(running.items()):
+                    if now - started >= timeout:
+                        logger.warning(f"Worker timed out on input {args_list[index]}")
+                        abandon(slot)
+                        if cursor[0] < total and not scope.cancelled:
+                            spawn()
+                if not alive:
+                    break
+            wakeups = [started + timeout for _, started in running.values()] if timeout else []
+            if stop_at is not None:
+                wakeups.append(stop_at)
+            if wakeups:
+                cond.wait(max(min(wakeups) - now, 0.0))
+            else:
+                # Sin elementos en curso (p. ej. entre dos de un mismo hilo)
+                # no se duerme indefinidamente si hay que vigilar ``timeout``.
+                cond.wait(timeout)
+        not_started = range(cursor[0], total)
+        if ordered:
+            finished.sort(key=lambda pair: pair[0])
+        return JamResult(
+            (res for _, res in finished),
+            timed_out=[args_list[i] for i in sorted(timed_out)],
+            cancelled=[args_list[i] for i in not_started],
+        )
+
+
+def run_chunks(
+    executor: Executor,
+    submit: Callable[[Executor, Sequence[Any]], Future],
+    args_list: Sequence[Any],
+    chunksize: int,
+    workers: int,
+    scope: CancelScope,
+    *,
+    deadline: Optional[float] = None,
+    ordered: bool = False,
+) -> Tuple[JamResult, bool]:
+    """Envía porciones de forma perezosa y respeta el plazo global.
+
+    Como mucho hay ``workers`` porciones en vuelo, por lo que una cancelación
+    o el vencimiento del plazo dejan de repartir trabajo en cuanto ocurren.
+    ``submit(executor, chunk)`` debe devolver un *future* cuyo resultado sea
+    ``(resultados, posiciones_agotadas)``.  Devuelve el :class:`JamResult` y
+    si quedaron porciones en curso que hay que abandonar.
+    """
+
+    total = len(args_list)
+    stop_at = None if deadline is None else time.monotonic() + deadline
+    pending: Dict[Future, Tuple[int, int]] = {}
+    outputs: List[Tuple[int, List[Any]]] = []
+    timed_out: List[int] = []
+    cancelled: List[int] = []
+    position = 0
+
+    def expired() -> bool:
+        return stop_at is not None and time.monotonic() >= stop_at
+
+    while True:
+        while (
+            position < total
+            and len(pending) < workers
+            and not scope.cancelled
+            and not expired()
+        ):
+            chunk = args_list[position : position + chunksize]
+            future = submit(executor, chunk)
+            scope.track([future])
+            pending[future] = (position, len(chunk))
+            position += len(chunk)
+        if not pending or expired():
+            break
+        remaining = None if stop_at is None else max(stop_at - time.monotonic(), 0.0)
+        done, _ = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+        for future in done:
+            start, count = pending.pop(future)
+            try:
+                chunk_results, offsets = future.result()
+            except CancelledError:
+                cancelled.extend(range(start, start + count))
+                continue
+            outputs.append((start, chunk_results))
+            timed_out.extend(start + offset for offset in offsets)
+
+    stuck = False
+    for future, (start, count) in pending.items():
+        if future.cancel():
+            cancelled.extend(range(start, start + count))
+        else:
+            stuck = True
+            timed_out.extend(range(start, start + count))
+    cancelled.extend(range(position, total))
+    if ordered:
+        outputs.sort(key=lambda pair: pair[0])
+    result = JamResult(
+        (res for _, chunk_results in outputs for res in chunk_results),
+        timed_out=[args_list[i] for i in sorted(timed_out)],
+        cancelled=[args_list[i] for i in sorted(cancelled)],
+    )
+    return result, stuck
@@ -0,0 +1,312 @@
+"""Gestión de la caché en disco de Numba.
+
+Todos los decoradores JIT compilan con ``cache=True``.  Numba guarda cada
+función en un índice (``.nbi``) con las firmas compiladas y un fichero de
+datos (``.nbc``) por firma, junto al código fuente (``__pycache__``) o en
+``NUMBA_CACHE_DIR``.  Este módulo permite:
+
+* fijar el directorio con ``SMOOTH_CRIMINAL_CACHE_DIR`` (o
+  :func:`configure_cache_dir`), por ejemplo para incluir una caché caliente en
+  una imagen de contenedor;
+* precompilar las funciones registradas de un módulo (:func:`prewarm`);
+* consultar tamaño, entradas y aciertos (:func:`cache_stats`);
+* borrar las entradas obsoletas (:func:`clear_cache`).
+
+Una entrada es obsoleta si la escribió otra versión de Numba o de Python, si
+su código fuente cambió o desapareció, o si es un ``.nbc`` que ya no aparece
+en ningún índice.
+"""
+
+from __future__ import annotations
+
+import importlib
+import json
+import os
+import pickle
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+CACHE_DIR_ENV = "SMOOTH_CRIMINAL_CACHE_DIR"
+
+#: Fichero con el origen de cada índice y el resultado del último *prewarm*.
+MANIFEST = "smooth_criminal_cache.json"
+
+PathLike = Union[str, os.PathLike]
+
+
+def configure_cache_dir(path: Optional[PathLike] = None) -> Optional[Path]:
+    """Fija el directorio de la caché de Numba.
+
+    Sin ``path`` se usa ``SMOOTH_CRIMINAL_CACHE_DIR``; si tampoco está
+    definida no se cambia nada.  Afecta a las funciones decoradas a partir de
+    este momento y a los procesos hijos.
+    """
+
+    path = path or os.environ.get(CACHE_DIR_ENV)
+    if not path:
+        return None
+    directory = Path(path).expanduser().resolve()
+    directory.mkdir(parents=True, exist_ok=True)
+    os.environ["NUMBA_CACHE_DIR"] = str(directory)
+    config = sys.modules.get("numba.core.config")
+    if config is not None:
+        config.CACHE_DIR = str(directory)
+    return directory
+
+
+def cache_dir() -> Optional[Path]:
+    """Directorio de caché configurado o ``None`` si Numba usa ``__pycache__``."""
+
+    path = os.environ.get(CACHE_DIR_ENV) or os.environ.get("NUMBA_CACHE_DIR")
+    return Path(path).expanduser().resolve() if path else None
+
+
+def _root(path: Optional[PathLike]) -> Tuple[Path, bool]:
+    """Directorio que se examina y si hay que limitarse a sus ``__pycache__``.
+
+    Sin directorio explícito ni configurado se usa el actual, pero solo los
+    ``__pycache__`` donde Numba guarda la caché junto al código: cualquier
+    otro ``.nbi`` o ``.nbc`` del proyecto no es asunto nuestro.
+    """
+
+    if path:
+        return Path(path).expanduser().resolve(), False
+    configured = cache_dir()
+    if configured is not None:
+        return configured, False
+    return Path.cwd(), True
+
+
+def _files(root: Path, pattern: str, in_tree: bool) -> List[Path]:
+    return sorted(
+        f for f in root.rglob(pattern) if not in_tree or f.parent.name == "__pycache__"
+    )
+
+
+def _load_manifest(root: Path) -> Dict[str, Any]:
+    try:
+        with open(root / MANIFEST, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def _save_manifest(root: Path, manifest: Dict[str, Any]) -> None:
+    with open(root / MANIFEST, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+
+def _read_index(index: Path):
+    """Devuelve ``(versión, sello, firmas)`` de un índice o ``None`` si está dañado."""
+
+    try:
+        with open(index, "rb") as f:
+            version = pickle.load(f)
+            data = f.read()
+        if version != _numba_version():
+            return version, None, {}
+        stamp, overloads = pickle.loads(data)
+    except Exception:
+        return None
+    return version, stamp, overloads
+
+
+def _numba_version() -> str:
+    import numba
+
+    return numba.__version__
+
+
+def _source_for(index: Path, sources: Dict[str, str]) -> Optional[Path]:
+    """Localiza el código fuente del que procede un índice.
+
+    Se consulta el manifiesto y, en ``__pycache__``, el nombre del módulo con
+    el que Numba empieza el nombre del fichero.  ``None`` si no se sabe.
+    """
+
+    if str(index) in sources:
+        return Path(sources[str(index)])
+    if index.parent.name != "__pycache__":
+        return None
+    fullname = index.name.split("-", 1)[0]
+    candidates = [index.parent.parent / f"{part}.py" for part in fullname.split(".")]
+    candidates.append(index.parent.parent / "__init__.py")
+    for candidate in candidates:
+        if candidate.exists():
+            return candidate
+    # Ninguno de los módulos posibles sigue ahí: el fuente se ha borrado.
+    return candidates[0]
+
+
+def _stale_reason(index: Path, sources: Dict[str, str]) -> Optional[str]:
+    tag = f".py{sys.version_info[0]}{sys.version_info[1]}"
+    if tag not in index.name:
+        return "python version"
+    content = _read_index(index)
+    if content is None:
+        return "unreadable index"
+    version, stamp, _ = content
+    if version != _numba_version():
+        return f"numba {version}"
+    source = _source_for(index, sources)
+    if source is None:
+        return None
+    if not source.exists():
+        return "source removed"
+    current = _source_stamp(source)
+    if current is not None and current != stamp:
+        return "source changed"
+    return None
+
+
+def _source_stamp(source: Path) -> Any:
+    """Sello de frescura que Numba calcula para ``source``.
+
+    Se pide al localizador de caché de Numba
+    (``InTreeCacheLocator.from_function``) en lugar de reproducir su formato,
+    que cambia entre versiones (fecha y tamaño, o un *hash* del contenido).
+    El localizador necesita poder escribir en el ``__pycache__`` junto al
+    fuente; si no puede, devuelve ``None`` y la entrada no se da por obsoleta.
+    """
+
+    from numba.core import caching
+
+    # ``from_function`` solo usa la función para su número de línea, que no
+    # forma parte del sello.
+    locator = caching.InTreeCacheLocator.from_function(_source_stamp, str(source))
+    if locator is None:
+        return None
+    return locator.get_source_stamp()
+
+
+def _scan(root: Path, in_tree: bool = False) -> Dict[str, Any]:
+    sources = _load_manifest(root).get("sources", {})
+    indexes = _files(root, "*.nbi", in_tree)
+    stale: Dict[Path, str] = {}
+    referenced = set()
+    for index in indexes:
+        reason = _stale_reason(index, sources)
+        if reason is not None:
+            stale[index] = reason
+        content = _read_index(index)
+        for name in (content[2] if content else {}).values():
+            referenced.add(index.parent / name)
+    orphans = [data for data in _files(root, "*.nbc", in_tree) if data not in referenced]
+    return {"indexes": indexes, "stale": stale, "orphans": orphans}
+
+
+def cache_stats(path: Optional[PathLike] = None) -> Dict[str, Any]:
+    """Resume la caché en ``path``.
+
+    Por defecto se usa el directorio configurado o, si no hay, los
+    ``__pycache__`` del directorio actual.
+
+    Devuelve el tamaño en bytes, el número de funciones (índices) y de
+    entradas compiladas (``.nbc``), cuántos índices están obsoletos y los
+    aciertos y fallos de caché del último :func:`prewarm`.
+    """
+
+    root, in_tree = _root(path)
+    scan = _scan(root, in_tree)
+    files = _files(root, "*.nbi", in_tree) + _files(root, "*.nbc", in_tree)
+    last = _load_manifest(root).get("prewarm", {})
+    return {
+        "path": str(root),
+        "size": sum(f.stat().st_size for f in files),
+        "functions": len(scan["indexes"]),
+        "entries": sum(1 for f in files if f.suffix == ".nbc"),
+        "stale": {str(index): reason for index, reason in scan["stale"].items()},
+        "orphans": len(scan["orphans"]),
+        "hits": last.get("hits", 0),
+        "misses": last.get("misses", 0),
+    }
+
+
+def clear_cache(path: Optional[PathLike] = None, everything: bool = False) -> Dict[str, int]:
+    """Borra las entradas obsoletas (o todas con ``everything=True``).
+
+    Sin ``path`` ni directorio configurado solo se tocan los ``__pycache__``
+    del directorio actual.
+
+    Devuelve el número de ficheros eliminados y los bytes liberados.
+    """
+
+    root, in_tree = _root(path)
+    if everything:
+        doomed = _files(root, "*.nbi", in_tree) + _files(root, "*.nbc", in_tree)
+    else:
+        scan = _scan(root, in_tree)
+        doomed = list(scan["stale"]) + scan["orphans"]
+        for index in scan["stale"]:
+            prefix = index.name[: -len(".nbi")] + "."
+            doomed += [d for d in index.parent.glob("*.nbc") if d.name.startswith(prefix)]
+    removed = freed = 0
+    for target in dict.fromkeys(doomed):
+        try:
+            size = target.stat().st_size
+            target.unlink()
+        except FileNotFoundError:
+            continue
+        removed += 1
+        freed += size
+    manifest = _load_manifest(root)
+    if manifest.get("sources"):
+        manifest["sources"] = {
+            index: source
+            for index, source in manifest["sources"].items()
+            if Path(index).exists()
+        }
+        _save_manifest(root, manifest)
+    return {"removed": removed, "freed": freed}
+
+
+def prewarm(module_name: str) -> Dict[str, Any]:
+    """Importa ``module_name`` y compila sus funciones registradas.
+
+    Cada función de :func:`~smooth_criminal.core.smooth` o
+    :func:`~smooth_criminal.core.bad` del módulo se prepara con ``warmup()``
+    (firmas declaradas y las que ya estaban en la caché).  Las de
+    :func:`~smooth_criminal.core.vectorized` y
+    :func:`~smooth_criminal.core.guvectorized` con firmas explícitas se
+    compilan (o se leen de la caché, con ``cache=True``) al importar el
+    módulo y aparecen con sus tipos; las dinámicas, sin firmas, solo pueden
+    compilarse con argumentos de ejemplo (``warmup(*ejemplo)``) y aparecen
+    con los tipos que tengan hasta ese momento.  Si hay un directorio de
+    caché configurado, se anota en su manifiesto el origen de cada índice y
+    los aciertos y fallos de esta ejecución.
+    """
+
+    from smooth_criminal import shipping
+    from smooth_criminal.core import _WARMUP_REGISTRY
+
+    importlib.import_module(module_name)
+    prefix = f"{module_name}."
+    functions: Dict[str, List[str]] = {}
+    sources: Dict[str, str] = {}
+    hits = misses = 0
+    for name, wrapper in list(_WARMUP_REGISTRY.items()):
+        if not name.startswith(prefix):
+            continue
+        functions[name] = wrapper.warmup()
+        for dispatcher in shipping.numba_dispatchers(wrapper):
+            stats = dispatcher.stats
+            hits += sum(stats.cache_hits.values())
+            misses += sum(stats.cache_misses.values())
+            cache_file = getattr(dispatcher._cache, "_cache_file", None)
+            if cache_file is not None:
+                sources[cache_file._index_path] = dispatcher.py_func.__code__.co_filename
+    report = {"module": module_name, "functions": functions, "hits": hits, "misses": misses}
+    root = cache_dir()
+    if root is not None and root.exists():
+        manifest = _load_manifest(root)
+        manifest.setdefault("sources", {}).update(sources)
+        manifest["prewarm"] = {
+            "module": module_name,
+            "hits": hits,
+            "misses": misses,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+        }
+        _save_manifest(root, manifest)
+    return report
@@ -50,9 +50,19 @@ class StorageBackend(ABC):
 
     @abstractmethod
     def log_execution_stats(
-        self, func_name: str, input_type, decorator_used: str, duration: float
+        self,
+        func_name: str,
+        input_type,
+        decorator_used: str,
+        duration: float,
+        metadata: Optional[Dict] = None,
     ) -> None:
-        """Guarda un registro de ejecución."""
+        """Guarda un registro de ejecución.
+
+        ``metadata`` es un diccionario opcional serializable a JSON con
+        información adicional del decorador (por ejemplo el ``chunksize``
+        elegido por :func:`~smooth_criminal.core.jam`).
+        """
 
     @abstractmethod
     def get_execution_history(self, func_name: Optional[str] = None) -> List[Dict]:
@@ -83,7 +93,7 @@ class StorageBackend(ABC):
                 json.dump(data, f, indent=2)
         elif format == "csv":
             with open(filepath, "w", newline="", encoding="utf-8") as f:
-                writer = csv.DictWriter(f, fieldnames=keys)
+                writer = csv.DictWriter(f, fieldnames=keys, extrasaction="ignore")
                 writer.writeheader()
                 writer.writerows(data)
         elif format == "xlsx":
@@ -148,7 +158,9 @@ class JsonBackend(StorageBackend):
 
     path = Path.home() / ".smooth_criminal_log.json"
 
-    def log_execution_stats(self, func_name, input_type, decorator_used, duration):
+    def log_execution_stats(
+        self, func_name, input_type, decorator_used, duration, metadata=None
+    ):
         log_entry = {
             "function": func_name,
             "input_type": str(input_type),
@@ -156,6 +168,8 @@ class JsonBackend(StorageBackend):
             "duration": duration,
             "timestamp": datetime.utcnow().isoformat(),
         }
+        if metadata:
+            log_entry["metadata"] = metadata
 
         logs: List[Dict] = []
         if self.path.exists():
@@ -197,25 +211,33 @@ class SQLiteBackend(StorageBackend):
                 input_type TEXT,
                 decorator TEXT,
                 duration REAL,
-                timestamp TEXT
+                timestamp TEXT,
+                metadata TEXT
             )
             """
         )
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(logs)")}
+        if "metadata" not in columns:
+            # Historiales creados antes de que existiera la columna
+            conn.execute("ALTER TABLE logs ADD COLUMN metadata TEXT")
         conn.commit()
 
-    def log_execution_stats(self, func_name, input_type, decorator_used, duration):
+    def log_execution_stats(
+        self, func_name, input_type, decorator_used, duration, metadata=None
+    ):
         import sqlite3
 
         with sqlite3.connect(self.path) as conn:
             self._ensure_table(conn)
             conn.execute(
-                "INSERT INTO logs VALUES (?, ?, ?, ?, ?)",
+                "INSERT INTO logs VALUES (?, ?, ?, ?, ?, ?)",
                 (
                     func_name,
                     str(input_type),
                     decorator_used,
                     float(duration),
                     datetime.utcnow().isoformat(),
+                    json.dumps(metadata) if metadata else None,
                 ),
             )
             conn.commit()
@@ -231,25 +253,28 @@ class SQLiteBackend(StorageBackend):
             cursor = conn.cursor()
             if func_name:
                 cursor.execute(
-                    "SELECT function,input_type,decorator,duration,timestamp FROM logs WHERE function=?",
+                    "SELECT function,input_type,decorator,duration,timestamp,metadata FROM logs WHERE function=?",
                     (func_name,),
                 )
             else:
                 cursor.execute(
-                    "SELECT function,input_type,decorator,duration,timestamp FROM logs"
+                    "SELECT function,input_type,decorator,duration,timestamp,metadata FROM logs"
                 )
             rows = cursor.fetchall()
 
-        return [
-            {
+        logs = []
+        for r in rows:
+            entry = {
                 "function": r[0],
                 "input_type": r[1],
                 "decorator": r[2],
                 "duration": r[3],
                 "timestamp": r[4],
             }
-            for r in rows
-        ]
+            if r[5]:
+                entry["metadata"] = json.loads(r[5])
+            logs.append(entry)
+        return logs
 
 
 class TinyDBBackend(StorageBackend):
@@ -271,17 +296,20 @@ class TinyDBBackend(StorageBackend):
     def _open(self):
         return self.TinyDB(self.path)
 
-    def log_execution_stats(self, func_name, input_type, decorator_used, duration):
+    def log_execution_stats(
+        self, func_name, input_type, decorator_used, duration, metadata=None
+    ):
+        entry = {
+            "function": func_name,
+            "input_type": str(input_type),
+            "decorator": decorator_used,
+            "duration": duration,
+            "timestamp": datetime.utcnow().isoformat(),
+        }
+        if metadata:
+            entry["metadata"] = metadata
         with self._open() as db:
-            db.insert(
-                {
-                    "function": func_name,
-                    "input_type": str(input_type),
-                    "decorator": decorator_used,
-                    "duration": duration,
-                    "timestamp": datetime.utcnow().isoformat(),
-                }
-            )
+            db.insert(entry)
 
     def get_execution_history(self, func_name: Optional[str] = None) -> List[Dict]:
         if not self.path.exists():
@@ -315,9 +343,11 @@ _BACKEND: StorageBackend = _select_backend()
 LOG_PATH = _BACKEND.path
 
 
-def log_execution_stats(func_name, input_type, decorator_used, duration):
+def log_execution_stats(func_name, input_type, decorator_used, duration, metadata=None):
     """Delegación pública al backend activo."""
-    _BACKEND.log_execution_stats(func_name, input_type, decorator_used, duration)
+    _BACKEND.log_execution_stats(
+        func_name, input_type, decorator_used, duration, metadata=metadata
+    )
 
 
 _ORIGINAL_GET_HISTORY = None
@@ -0,0 +1,337 @@
+"""Pools de *workers* persistentes para :func:`smooth_criminal.core.jam`.
+
+Crear un ``ThreadPoolExecutor`` o un ``ProcessPoolExecutor`` en cada llamada
+es barato para lotes grandes, pero domina la latencia cuando la misma función
+se invoca miles de veces.  Este módulo mantiene un registro de pools por
+``(backend, workers, token)`` que sobreviven entre llamadas y se cierran de forma
+explícita con :meth:`WorkerPool.shutdown`, al salir de un bloque ``with`` o,
+en último caso, al terminar el intérprete.  El registro guarda como mucho
+:data:`MAX_POOLS` pools: al superarlo se cierra el que lleva más tiempo sin
+usarse, que vuelve a registrarse si se usa de nuevo.  Un pool expulsado
+mientras una llamada lo tiene prestado (ver :func:`borrow_executor`) no se
+cierra hasta que esa llamada lo devuelve.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import multiprocessing
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, List, Optional, Tuple, Union
+
+#: Argumentos del inicializador, o una función que los calcula al crear el
+#: executor (así reflejan el estado del proceso padre en ese momento).
+InitArgs = Union[Tuple[Any, ...], Callable[[], Tuple[Any, ...]]]
+
+#: Clave de un pool en el registro: ``(backend, workers, token)``.
+PoolKey = Tuple[str, int, Optional[str]]
+
+#: Pools que el registro mantiene a la vez; el menos usado se cierra al
+#: registrar uno más.
+MAX_POOLS = 16
+
+logger = logging.getLogger("SmoothCriminal")
+
+_EXECUTORS = {"thread": ThreadPoolExecutor, "process": ProcessPoolExecutor}
+
+try:  # Python 3.14+: subintérpretes con GIL propio.
+    from concurrent.futures import InterpreterPoolExecutor
+except ImportError:  # pragma: no cover - depende de la versión de Python
+    pass
+else:  # pragma: no cover - depende de la versión de Python
+    _EXECUTORS["interpreter"] = InterpreterPoolExecutor
+
+
+def supports(backend: str) -> bool:
+    """Indica si este intérprete dispone de un executor para ``backend``."""
+    return backend in _EXECUTORS
+
+
+def _noop() -> None:
+    return None
+
+
+def _fork_safe() -> bool:
+    """Indica si se puede hacer ``fork`` del proceso actual sin riesgo.
+
+    Tras una región ``parallel=True`` de Numba con la capa TBB u OpenMP, los
+    procesos creados con ``fork`` heredan un *runtime* de hilos a medias y el
+    proceso padre puede bloquearse al terminar.  ``workqueue`` no tiene ese
+    problema, igual que un proceso que aún no ha ejecutado ninguna región.
+    """
+    numba = sys.modules.get("numba")
+    if numba is None:
+        return True
+    try:
+        layer = numba.threading_layer()
+    except ValueError:  # Todavía no se ha iniciado ninguna capa.
+        return True
+    return layer == "workqueue"
+
+
+def process_start_method() -> str:
+    """Método con el que arrancarán los procesos de un pool nuevo.
+
+    Es el método por defecto de :mod:`multiprocessing` salvo que sea ``fork``
+    y no sea seguro (ver :func:`_fork_safe`); entonces se usa ``forkserver``
+    o, si no está disponible, ``spawn``.
+    """
+    method = multiprocessing.get_start_method()
+    if method != "fork" or _fork_safe():
+        return method
+    return "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+
+def _process_context() -> Optional[Any]:
+    """Contexto para un ``ProcessPoolExecutor`` nuevo (``None``: el de siempre)."""
+    method = process_start_method()
+    if method == multiprocessing.get_start_method():
+        return None
+    logger.debug("Numba threading layer is not fork-safe, starting workers with %s", method)
+    return multiprocessing.get_context(method)
+
+
+def create_executor(
+    backend: str,
+    workers: int,
+    initializer: Optional[Callable[..., Any]] = None,
+    initargs: InitArgs = (),
+) -> Executor:
+    """Crea un executor nuevo para ``backend`` con ``workers`` *workers*.
+
+    ``initializer(*initargs)`` se ejecuta una vez al arrancar cada *worker*.
+    Los procesos se crean con ``fork`` mientras sea seguro; tras una región
+    paralela de Numba con TBB u OpenMP se usa ``forkserver`` (ver
+    :func:`_process_context`).
+    """
+
+    if backend not in _EXECUTORS:
+        raise ValueError(f"Unknown backend: {backend}")
+    options = {}
+    if backend == "process":
+        context = _process_context()
+        if context is not None:
+            options["mp_context"] = context
+    if initializer is None:
+        return _EXECUTORS[backend](max_workers=workers, **options)
+    if callable(initargs):
+        initargs = initargs()
+    return _EXECUTORS[backend](
+        max_workers=workers, initializer=initializer, initargs=initargs, **options
+    )
+
+
+def abandon_executor(executor: Executor) -> None:
+    """Cierra ``executor`` sin esperar a las tareas que sigan en curso.
+
+    Las tareas pendientes se cancelan y, en un ``ProcessPoolExecutor``, los
+    procesos que sigan ocupados se terminan.
+    """
+
+    processes = list((getattr(executor, "_processes", None) or {}).values())
+    executor.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        if process.is_alive():
+            process.terminate()
+
+
+class WorkerPool:
+    """Executor reutilizable asociado a un ``backend`` y un número de *workers*.
+
+    El executor se crea de forma perezosa la primera vez que se necesita y se
+    vuelve a crear si se usa después de :meth:`shutdown`, por lo que un mismo
+    objeto puede utilizarse como gestor de contexto en varios bloques.
+    """
+
+    def __init__(
+        self,
+        backend: str,
+        workers: int,
+        initializer: Optional[Callable[..., Any]] = None,
+        initargs: InitArgs = (),
+    ) -> None:
+        if backend not in _EXECUTORS:
+            raise ValueError(f"Unknown backend: {backend}")
+        self.backend = backend
+        self.workers = workers
+        self.initializer = initializer
+        self.initargs = initargs
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._key: Optional[PoolKey] = None
+        self._users = 0
+        self._retired = False
+
+    @property
+    def alive(self) -> bool:
+        """Indica si el executor subyacente está en marcha."""
+        return self._executor is not None
+
+    @property
+    def executor(self) -> Executor:
+        """Devuelve el executor activo, creándolo si es necesario."""
+        with self._lock:
+            if self._executor is None:
+                logger.debug(
+                    "Starting persistent %s pool with %d workers",
+                    self.backend,
+                    self.workers,
+                )
+                self._executor = create_executor(
+                    self.backend, self.workers, self.initializer, self.initargs
+                )
+            executor = self._executor
+        if self._key is not None:
+            _touch(self._key, self)
+        return executor
+
+    @contextmanager
+    def borrow(self) -> Iterator[Executor]:
+        """Cede el executor y lo mantiene abierto hasta devolverlo.
+
+        Si el registro expulsa el pool mientras está prestado, el cierre se
+        aplaza hasta que lo devuelve el último usuario.
+        """
+        with self._lock:
+            self._users += 1
+        try:
+            yield self.executor
+        finally:
+            executor = None
+            with self._lock:
+                self._users -= 1
+                if self._retired and not self._users:
+                    self._retired = False
+                    executor, self._executor = self._executor, None
+            if executor is not None:
+                logger.debug("Closing released %r", self)
+                executor.shutdown(wait=False)
+
+    def _retire(self) -> None:
+        # Expulsado del registro: se cierra ya o, si está prestado, al
+        # devolverlo (ver :meth:`borrow`).
+        with self._lock:
+            if self._users:
+                self._retired = True
+                return
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def _reinstate(self) -> None:
+        with self._lock:
+            self._retired = False
+
+    def warmup(self) -> None:
+        """Arranca todos los *workers* antes de la primera llamada real."""
+        executor = self.executor
+        wait([executor.submit(_noop) for _ in range(self.workers)])
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Detiene el executor; se volverá a crear si el pool se reutiliza."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+    def abandon(self) -> None:
+        """Descarta el executor sin esperar; se volverá a crear al reutilizarlo."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            abandon_executor(executor)
+
+    def __enter__(self) -> "WorkerPool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.shutdown()
+
+    def __repr__(self) -> str:
+        state = "alive" if self.alive else "idle"
+        return f"WorkerPool(backend={self.backend!r}, workers={self.workers}, {state})"
+
+
+_POOLS: "OrderedDict[PoolKey, WorkerPool]" = OrderedDict()
+_POOLS_LOCK = threading.Lock()
+
+
+def _touch(key: PoolKey, pool: WorkerPool) -> None:
+    """Marca ``pool`` como el más reciente y cierra los que sobran.
+
+    Un pool ya expulsado vuelve al registro al usarse, salvo que otro haya
+    ocupado su clave entretanto.
+    """
+    evicted: List[WorkerPool] = []
+    with _POOLS_LOCK:
+        if _POOLS.setdefault(key, pool) is not pool:
+            return
+        _POOLS.move_to_end(key)
+        while len(_POOLS) > MAX_POOLS:
+            evicted.append(_POOLS.popitem(last=False)[1])
+    pool._reinstate()
+    for old in evicted:
+        logger.debug("Closing least recently used %r", old)
+        old._retire()
+
+
+def get_pool(
+    backend: str,
+    workers: int,
+    *,
+    token: Optional[str] = None,
+    initializer: Optional[Callable[..., Any]] = None,
+    initargs: InitArgs = (),
+) -> WorkerPool:
+    """Obtiene (o registra) el pool compartido para ``(backend, workers, token)``.
+
+    Los pools cuyos *workers* se inicializan con una función concreta llevan
+    su ``token`` en la clave, por lo que no se comparten entre funciones.
+    """
+
+    key = (backend, workers, token)
+    with _POOLS_LOCK:
+        pool = _POOLS.get(key)
+        if pool is None:
+            pool = _POOLS[key] = WorkerPool(backend, workers, initializer, initargs)
+            pool._key = key
+    _touch(key, pool)
+    return pool
+
+
+def shutdown_pools(wait: bool = True) -> None:
+    """Cierra todos los pools persistentes registrados."""
+    with _POOLS_LOCK:
+        pools = list(_POOLS.values())
+    for pool in pools:
+        pool.shutdown(wait=wait)
+
+
+@contextmanager
+def borrow_executor(
+    backend: str,
+    workers: int,
+    pool: Optional[WorkerPool] = None,
+    *,
+    initializer: Optional[Callable[..., Any]] = None,
+    initargs: InitArgs = (),
+) -> Iterator[Executor]:
+    """Cede el executor de ``pool`` o uno temporal que se cierra al salir.
+
+    Mientras dure el préstamo, ``pool`` no se cierra aunque el registro lo
+    expulse por haber superado :data:`MAX_POOLS`.
+    """
+    if pool is not None:
+        with pool.borrow() as executor:
+            yield executor
+        return
+    with create_executor(backend, workers, initializer, initargs) as executor:
+        yield executor
+
+
+atexit.register(shutdown_pools)
@@ -0,0 +1,205 @@
+"""Planificador con robo de trabajo (*work stealing*) para :func:`jam`.
+
+Cuando el coste de cada elemento es muy desigual, repartir la entrada de
+antemano deja a la mayoría de *workers* ociosos mientras uno solo procesa la
+cola larga.  Aquí cada *worker* recibe un rango contiguo de índices en su
+propia deque; consume por delante y, al vaciarse, roba la mitad trasera del
+rango restante del *worker* más cargado.  Cada deque tiene su propio lock, así
+que solo compiten el dueño y el ladrón de un mismo rango.
+
+Además del resultado se devuelven estadísticas por *worker* (tiempo ocupado,
+tiempo ocioso, elementos procesados y robos) para comprobar que la cola se ha
+acortado.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Executor, wait
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger("SmoothCriminal")
+
+
+class RangeDeque:
+    """Rango ``[lo, hi)`` de índices pendientes de un *worker*."""
+
+    def __init__(self, lo: int = 0, hi: int = 0) -> None:
+        self.lo = lo
+        self.hi = hi
+        self._lock = threading.Lock()
+
+    @property
+    def remaining(self) -> int:
+        return self.hi - self.lo
+
+    def pop_front(self, count: int = 1) -> Optional[Tuple[int, int]]:
+        """El dueño toma hasta ``count`` índices del principio."""
+        with self._lock:
+            if self.lo >= self.hi:
+                return None
+            start = self.lo
+            self.lo = min(self.lo + count, self.hi)
+            return start, self.lo
+
+    def steal_half(self) -> Optional[Tuple[int, int]]:
+        """Un ladrón se lleva la mitad trasera de lo que queda."""
+        with self._lock:
+            remaining = self.hi - self.lo
+            if remaining < 1:
+                return None
+            # Con un solo elemento pendiente el ladrón se lo lleva entero: el
+            # dueño puede seguir ocupado con un elemento lento.
+            mid = self.lo + remaining // 2
+            stolen = (mid, self.hi)
+            self.hi = mid
+            return stolen
+
+    def reset(self, span: Tuple[int, int]) -> None:
+        with self._lock:
+            self.lo, self.hi = span
+
+
+def split_ranges(total: int, workers: int) -> List[RangeDeque]:
+    """Reparte ``range(total)`` en ``workers`` rangos contiguos."""
+    base, extra = divmod(total, workers)
+    deques = []
+    lo = 0
+    for i in range(workers):
+        hi = lo + base + (1 if i < extra else 0)
+        deques.append(RangeDeque(lo, hi))
+        lo = hi
+    return deques
+
+
+def _steal(deques: List[RangeDeque], me: int) -> Optional[Tuple[int, int]]:
+    """Roba la mitad del rango más largo de otro *worker*."""
+    while True:
+        victims = sorted(
+            (d for i, d in enumerate(deques) if i != me and d.remaining > 0),
+            key=lambda d: d.remaining,
+            reverse=True,
+        )
+        if not victims:
+            return None
+        for victim in victims:
+            stolen = victim.steal_half()
+            if stolen is not None:
+                return stolen
+
+
+def _summarize(
+    busy: List[float], items: List[int], steals: List[int], wall: float
+) -> Dict[str, Any]:
+    return {
+        "schedule": "steal",
+        "wall": wall,
+        "workers": [
+            {
+                "busy": busy[i],
+                "idle": max(wall - busy[i], 0.0),
+                "items": items[i],
+                "steals": steals[i],
+            }
+            for i in range(len(busy))
+        ],
+    }
+
+
+def steal_threads(
+    executor: Executor,
+    func: Callable[[Any], Any],
+    args_list: Sequence[Any],
+    workers: int,
+) -> Tuple[List[List[Tuple[int, Any]]], Dict[str, Any]]:
+    """Ejecuta ``func`` con robo de trabajo entre hilos.
+
+    Devuelve un búfer ``(índice, resultado)`` por *worker* y las
+    estadísticas de la ejecución.
+    """
+
+    workers = max(min(workers, len(args_list)), 1)
+    deques = split_ranges(len(args_list), workers)
+    busy = [0.0] * workers
+    items = [0] * workers
+    steals = [0] * workers
+
+    def worker(me: int) -> List[Tuple[int, Any]]:
+        own = deques[me]
+        buffer: List[Tuple[int, Any]] = []
+        while True:
+            span = own.pop_front()
+            if span is None:
+                stolen = _steal(deques, me)
+                if stolen is None:
+                    break
+                steals[me] += 1
+                own.reset(stolen)
+                continue
+            index = span[0]
+            arg = args_list[index]
+            start = time.perf_counter()
+            try:
+                buffer.append((index, func(arg)))
+            except Exception as e:
+                logger.warning(f"Worker failed on input {arg}: {e}")
+            busy[me] += time.perf_counter() - start
+            items[me] += 1
+        return buffer
+
+    start = time.perf_counter()
+    futures = [executor.submit(worker, me) for me in range(workers)]
+    buffers = [future.result() for future in futures]
+    return buffers, _summarize(busy, items, steals, time.perf_counter() - start)
+
+
+def steal_processes(
+    executor: Executor,
+    submit: Callable[[Executor, Sequence[Any]], Any],
+    args_list: Sequence[Any],
+    workers: int,
+    grain: int,
+) -> Tuple[List[Tuple[int, List[Any]]], Dict[str, Any]]:
+    """Robo de trabajo coordinado desde el proceso padre.
+
+    Cada *worker* lógico tiene como mucho una porción de ``grain`` elementos
+    en vuelo; ``submit(executor, chunk)`` debe devolver un *future* cuyo
+    resultado sea ``(resultados, segundos_de_cómputo)``.  Devuelve pares
+    ``(inicio, resultados)`` y las estadísticas de la ejecución.
+    """
+
+    workers = max(min(workers, len(args_list)), 1)
+    deques = split_ranges(len(args_list), workers)
+    busy = [0.0] * workers
+    items = [0] * workers
+    steals = [0] * workers
+    pending: Dict[Any, Tuple[int, int, int]] = {}
+    outputs: List[Tuple[int, List[Any]]] = []
+
+    def dispatch(me: int) -> None:
+        span = deques[me].pop_front(grain)
+        if span is None:
+            stolen = _steal(deques, me)
+            if stolen is None:
+                return
+            steals[me] += 1
+            deques[me].reset(stolen)
+            span = deques[me].pop_front(grain)
+        lo, hi = span
+        pending[submit(executor, args_list[lo:hi])] = (me, lo, hi)
+
+    start = time.perf_counter()
+    for me in range(workers):
+        dispatch(me)
+    while pending:
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            me, lo, hi = pending.pop(future)
+            chunk_results, compute = future.result()
+            busy[me] += compute
+            items[me] += hi - lo
+            outputs.append((lo, chunk_results))
+            dispatch(me)
+    return outputs, _summarize(busy, items, steals, time.perf_counter() - start)
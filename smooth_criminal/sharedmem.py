@@ -0,0 +1,151 @@
+"""Reparto de arreglos NumPy entre procesos mediante memoria compartida.
+
+El backend ``process`` de :func:`smooth_criminal.core.jam` serializa cada
+porción de la entrada y cada resultado.  Para arreglos numéricos grandes ese
+coste domina, así que este módulo copia la entrada una sola vez a un bloque de
+:mod:`multiprocessing.shared_memory`, reserva otro bloque para la salida y
+envía a los *workers* únicamente el nombre de los bloques y un rango de
+índices.  Cada *worker* lee vistas de la entrada y escribe directamente en la
+salida compartida.
+"""
+
+from __future__ import annotations
+
+import logging
+from concurrent.futures import Executor, as_completed
+from multiprocessing import shared_memory
+from typing import Any, Callable, List, Tuple
+
+import numpy as np
+
+logger = logging.getLogger("SmoothCriminal")
+
+#: Descripción serializable de un arreglo compartido: ``(nombre, forma, dtype)``.
+ArraySpec = Tuple[str, Tuple[int, ...], str]
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    try:
+        # Python 3.13+: el proceso padre es el único dueño del bloque.
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+
+def allocate(
+    shape: Tuple[int, ...], dtype: Any
+) -> Tuple[shared_memory.SharedMemory, np.ndarray]:
+    """Reserva un bloque compartido y devuelve el bloque y su vista NumPy."""
+    dtype = np.dtype(dtype)
+    size = max(int(np.prod(shape)) * dtype.itemsize, 1)
+    shm = shared_memory.SharedMemory(create=True, size=size)
+    return shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+
+def spec_of(shm: shared_memory.SharedMemory, array: np.ndarray) -> ArraySpec:
+    """Construye el :data:`ArraySpec` que identifica ``array`` en ``shm``."""
+    return shm.name, tuple(array.shape), array.dtype.str
+
+
+def _shared_chunk(
+    ref: Any,
+    src_spec: ArraySpec,
+    dst_spec: ArraySpec,
+    start: int,
+    stop: int,
+) -> List[int]:
+    """Procesa ``src[start:stop]`` en un *worker* y escribe en ``dst``.
+
+    ``ref`` es la referencia serializable de la función (con método
+    ``resolve()``).  Devuelve los índices cuyo cálculo falló para que el
+    proceso padre pueda descartarlos.
+    """
+
+    func: Callable[[Any], Any] = ref.resolve()
+
+    src_shm = _attach(src_spec[0])
+    dst_shm = _attach(dst_spec[0])
+    failed: List[int] = []
+    try:
+        src = np.ndarray(src_spec[1], dtype=src_spec[2], buffer=src_shm.buf)
+        dst = np.ndarray(dst_spec[1], dtype=dst_spec[2], buffer=dst_shm.buf)
+        for index in range(start, stop):
+            try:
+                dst[index] = func(src[index])
+            except Exception as e:
+                logger.warning(f"Worker failed on input {index}: {e}")
+                failed.append(index)
+        # Las vistas deben liberarse antes de cerrar los bloques.
+        del src, dst
+    finally:
+        src_shm.close()
+        dst_shm.close()
+    return failed
+
+
+def map_shared(
+    executor: Executor,
+    ref: Any,
+    func: Callable[[Any], Any],
+    array: np.ndarray,
+    chunksize: int,
+) -> np.ndarray:
+    """Aplica ``func`` a cada elemento de ``array`` usando memoria compartida.
+
+    El primer elemento válido se calcula en el proceso padre para deducir la
+    forma y el ``dtype`` de la salida; el resto se reparte en rangos de
+    ``chunksize`` índices.  El resultado es un arreglo en el orden de la
+    entrada del que se eliminan los elementos que fallaron.
+    """
+
+    total = len(array)
+    failed: List[int] = []
+    first = None
+    for offset in range(total):
+        try:
+            first = np.asarray(func(array[offset]))
+            break
+        except Exception as e:
+            logger.warning(f"Worker failed on input {offset}: {e}")
+            failed.append(offset)
+    if first is None:
+        return np.empty((0,), dtype=array.dtype)
+
+    src_shm, src = allocate(array.shape, array.dtype)
+    try:
+        dst_shm, dst = allocate((total,) + first.shape, first.dtype)
+    except BaseException:
+        del src
+        src_shm.close()
+        src_shm.unlink()
+        raise
+
+    try:
+        src[...] = array
+        dst[offset] = first
+        src_spec = spec_of(src_shm, src)
+        dst_spec = spec_of(dst_shm, dst)
+        futures = [
+            executor.submit(
+                _shared_chunk,
+                ref,
+                src_spec,
+                dst_spec,
+                start,
+                min(start + chunksize, total),
+            )
+            for start in range(offset + 1, total, chunksize)
+        ]
+        for future in as_completed(futures):
+            failed.extend(future.result())
+        result = np.array(dst)
+    finally:
+        # Las vistas deben liberarse antes de cerrar los bloques.
+        del src, dst
+        for shm in (src_shm, dst_shm):
+            shm.close()
+            shm.unlink()
+
+    if failed:
+        result = np.delete(result, sorted(failed), axis=0)
+    return result
@@ -0,0 +1,266 @@
+"""Envío de la función de :func:`smooth_criminal.core.jam` a sus procesos.
+
+Cada *worker* recibe la función una sola vez, en el inicializador del pool,
+en lugar de importarla por nombre con cada porción.  Se elige la forma más
+barata que funcione:
+
+1. **Por referencia** (módulo y nombre cualificado) si la función, o el
+   envoltorio de ``jam`` que la sustituye, puede importarse.
+2. **Por valor** con :mod:`cloudpickle` (dependencia opcional) para
+   *closures*, *lambdas* y funciones definidas en ``__main__``.
+3. **Por herencia** cuando los procesos se crean con ``fork``: la función ya
+   está registrada en el proceso padre antes de arrancar el pool.
+
+Los argumentos constantes de una llamada (``func_jam(datos, escala=2)``) se
+serializan una vez por llamada (ver :func:`pack_constants`) y viajan ya
+serializados con cada porción.  Cada *worker* los deserializa y prepara la
+función una sola vez por clave, sin atarlos al pool: llamadas con constantes
+distintas comparten los mismos *workers*.
+
+El inicializador precarga además las firmas de Numba que la función ya tiene
+compiladas en el proceso padre o guardadas en la caché en disco, de modo que
+el primer elemento de un *worker* nuevo no paga la compilación.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import importlib
+import logging
+import pickle
+import sys
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from smooth_criminal import pools
+
+logger = logging.getLogger("SmoothCriminal")
+
+#: Funciones instaladas en este proceso por :func:`install`, indexadas por su
+#: token.  Cada *worker* pertenece a un único pool, así que solo guarda la suya.
+_TARGETS: Dict[str, Callable[..., Any]] = {}
+
+#: Funciones registradas en el proceso padre para los hijos ``fork``.  Las
+#: referencias son débiles: la entrada desaparece con la función.
+_REGISTERED: "weakref.WeakValueDictionary[str, Callable[..., Any]]" = (
+    weakref.WeakValueDictionary()
+)
+
+#: Funciones que cada *worker* guarda ya preparadas con sus constantes.
+BOUND_CACHE_SIZE = 8
+
+#: Funciones preparadas por :meth:`ShippedRef.resolve` en este proceso,
+#: indexadas por ``(token, clave de las constantes, star)``.
+_BOUND: "OrderedDict[Tuple[str, Optional[str], bool], Callable[[Any], Any]]" = OrderedDict()
+
+#: ``(forma, datos)`` con los que se reconstruye la función en un *worker*.
+Payload = Tuple[str, Any]
+
+
+def function_token(func: Callable[..., Any]) -> str:
+    """Identificador único de ``func`` dentro de esta sesión."""
+    return f"{func.__module__}.{func.__qualname__}#{id(func):x}"
+
+
+def register(token: str, func: Callable[..., Any]) -> None:
+    """Registra ``func`` en el proceso actual (los hijos ``fork`` la heredan)."""
+    try:
+        _REGISTERED[token] = func
+    except TypeError:  # objetos sin referencias débiles, como las funciones integradas
+        _TARGETS[token] = func
+
+
+def pack_constants(constants: Dict[str, Any]) -> Tuple[Optional[str], Optional[bytes]]:
+    """Serializa los argumentos constantes y calcula su clave.
+
+    Devuelve ``(clave, datos)`` o ``(None, None)`` si no hay constantes.  La
+    clave se calcula sobre la serialización, así que dos llamadas con los
+    mismos valores comparten clave aunque los objetos sean distintos.
+    """
+
+    if not constants:
+        return None, None
+    data = pickle.dumps(sorted(constants.items(), key=lambda item: item[0]))
+    return hashlib.sha1(data).hexdigest()[:16], data
+
+
+def _lookup(module_name: str, qualname: str) -> Any:
+    obj: Any = importlib.import_module(module_name)
+    for part in qualname.split("."):
+        obj = getattr(obj, part)
+    return obj
+
+
+def _importable(func: Callable[..., Any]) -> bool:
+    qualname = getattr(func, "__qualname__", "")
+    if "<" in qualname or func.__module__ == "__main__":
+        return False
+    try:
+        obj = _lookup(func.__module__, qualname)
+    except Exception:
+        return False
+    return obj is func or getattr(obj, "_jam_target", None) is func
+
+
+def serialize(func: Callable[..., Any], inherit: bool = True) -> Payload:
+    """Elige cómo enviar ``func`` a los *workers*.
+
+    ``inherit`` indica si los *workers* son procesos que pueden heredar la
+    función por ``fork`` (no es así en los subintérpretes).  Lanza
+    :class:`pickle.PicklingError` si no hay ninguna forma posible.
+    """
+
+    if _importable(func):
+        return "ref", (func.__module__, func.__qualname__)
+    try:
+        import cloudpickle
+    except ImportError:
+        cloudpickle = None
+    if cloudpickle is not None:
+        try:
+            return "value", cloudpickle.dumps(func)
+        except Exception as e:
+            logger.debug(f"cloudpickle could not serialize {func.__qualname__}: {e}")
+    if inherit and pools.process_start_method() == "fork":
+        return "inherit", None
+    raise pickle.PicklingError(
+        f"Cannot ship {func.__qualname__} to worker processes: define it at module "
+        "level or install cloudpickle"
+    )
+
+
+def _restore(token: str, payload: Payload) -> Callable[..., Any]:
+    kind, data = payload
+    if kind == "ref":
+        target = _lookup(*data)
+        return getattr(target, "_jam_target", target)
+    if kind == "value":
+        return pickle.loads(data)
+    func = _REGISTERED.get(token)
+    if func is None:
+        func = _TARGETS.get(token)
+    if func is None:
+        raise RuntimeError(f"Worker did not inherit {token}")
+    return func
+
+
+def install(token: str, payload: Payload, signatures: List[List[Any]]) -> None:
+    """Inicializador del pool: instala la función y precalienta Numba."""
+    func = _restore(token, payload)
+    _TARGETS[token] = func
+    _BOUND.clear()
+    warm(func, signatures)
+
+
+def numba_dispatchers(func: Callable[..., Any]) -> List[Any]:
+    """Busca los *dispatchers* de Numba detrás de ``func``.
+
+    Recorre ``__wrapped__`` y las celdas de las *closures*, que es donde los
+    decoradores como :func:`~smooth_criminal.core.smooth` guardan la versión
+    compilada.  Si Numba no se ha importado no puede haber ninguno.
+    """
+
+    module = sys.modules.get("numba.core.dispatcher")
+    if module is None:
+        return []
+    found: List[Any] = []
+    seen = set()
+    stack = [func]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        if isinstance(obj, module.Dispatcher):
+            found.append(obj)
+            continue
+        wrapped = getattr(obj, "__wrapped__", None)
+        if wrapped is not None:
+            stack.append(wrapped)
+        for cell in getattr(obj, "__closure__", None) or ():
+            try:
+                contents = cell.cell_contents
+            except ValueError:  # celda vacía
+                continue
+            if callable(contents):
+                stack.append(contents)
+    return found
+
+
+def compiled_signatures(func: Callable[..., Any]) -> List[List[Any]]:
+    """Firmas ya compiladas de cada *dispatcher* de ``func`` en este proceso."""
+    return [list(dispatcher.signatures) for dispatcher in numba_dispatchers(func)]
+
+
+def cached_signatures(dispatcher: Any) -> List[Any]:
+    """Firmas que la caché en disco de Numba tiene para ``dispatcher``."""
+    cache = getattr(dispatcher, "_cache", None)
+    try:
+        index = cache._cache_file._load_index()
+    except Exception:
+        return []
+    return [key[0] for key in index]
+
+
+def warm(func: Callable[..., Any], signatures: Optional[List[List[Any]]] = None) -> int:
+    """Compila (o carga de la caché) las firmas conocidas de ``func``.
+
+    Devuelve el número de firmas preparadas.
+    """
+
+    warmed = 0
+    for position, dispatcher in enumerate(numba_dispatchers(func)):
+        known = list(signatures[position]) if signatures and position < len(signatures) else []
+        for sig in known + cached_signatures(dispatcher):
+            if sig in dispatcher.signatures:
+                continue
+            try:
+                dispatcher.compile(sig)
+                warmed += 1
+            except Exception as e:
+                logger.debug(f"Could not warm signature {sig}: {e}")
+    return warmed
+
+
+class ShippedRef:
+    """Referencia a una función instalada en el *worker* por :func:`install`.
+
+    Lleva el token de la función y, si hay constantes, su clave y su
+    serialización (ver :func:`pack_constants`).  El *worker* prepara la
+    función una vez por clave y la reutiliza en las porciones siguientes.
+    """
+
+    __slots__ = ("token", "star", "key", "data")
+
+    def __init__(
+        self,
+        token: str,
+        star: bool = False,
+        key: Optional[str] = None,
+        data: Optional[bytes] = None,
+    ) -> None:
+        self.token = token
+        self.star = star
+        self.key = key
+        self.data = data
+
+    def __getstate__(self):
+        return (self.token, self.star, self.key, self.data)
+
+    def __setstate__(self, state) -> None:
+        self.token, self.star, self.key, self.data = state
+
+    def resolve(self) -> Callable[[Any], Any]:
+        cache_key = (self.token, self.key, self.star)
+        bound = _BOUND.get(cache_key)
+        if bound is not None:
+            _BOUND.move_to_end(cache_key)
+            return bound
+        from smooth_criminal.workers import bind
+
+        constants = dict(pickle.loads(self.data)) if self.data is not None else {}
+        bound = _BOUND[cache_key] = bind(_TARGETS[self.token], self.star, constants)
+        while len(_BOUND) > BOUND_CACHE_SIZE:
+            _BOUND.popitem(last=False)
+        return bound
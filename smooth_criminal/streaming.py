@@ -0,0 +1,244 @@
+"""Ejecución por bloques de *kernels* de ``vectorized`` y ``guvectorized``.
+
+:func:`stream` recorre las entradas por bloques del primer eje, escribe cada
+bloque directamente en la salida (normalmente un :class:`numpy.memmap`) y,
+al terminar un bloque, devuelve al sistema las páginas de los ficheros
+mapeados que ya no se necesitan (``madvise(MADV_DONTNEED)``).  Así la memoria
+residente no depende del tamaño del fichero, solo del tamaño de bloque y del
+número de hilos.
+
+Los bloques pueden repartirse entre varios hilos; solo compensa si el
+*kernel* libera el GIL.
+"""
+
+from __future__ import annotations
+
+import logging
+import mmap
+import os
+import re
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger("SmoothCriminal")
+
+#: Bytes aproximados (entradas más salida) que procesa cada bloque.
+BLOCK_BYTES = 1 << 20
+
+PathLike = Union[str, os.PathLike]
+
+
+def _core_names(layout: str) -> Tuple[List[List[str]], List[List[str]]]:
+    def names(part: str) -> List[List[str]]:
+        return [[d for d in group.split(",") if d] for group in re.findall(r"\(([^)]*)\)", part)]
+
+    inputs, outputs = layout.replace(" ", "").split("->")
+    return names(inputs), names(outputs)
+
+
+def core_dims(layout: Optional[str]) -> Tuple[List[int], List[int]]:
+    """Número de dimensiones núcleo de cada entrada y salida de un *layout*.
+
+    >>> core_dims("(n),()->(n)")
+    ([1, 0], [1])
+    """
+
+    if not layout:
+        return [], []
+    inputs, outputs = _core_names(layout)
+    return [len(g) for g in inputs], [len(g) for g in outputs]
+
+
+def _output_core_shape(layout: str, args: Sequence[Any]) -> Tuple[int, ...]:
+    """Forma núcleo de la salida deducida de las dimensiones de las entradas.
+
+    >>> _output_core_shape("(n),()->(n)", [np.zeros((4, 3)), 1.0])
+    (3,)
+    """
+
+    inputs, (output,) = _core_names(layout)
+    sizes = {}
+    for names, arg in zip(inputs, args):
+        if names:
+            sizes.update(zip(names, np.shape(arg)[-len(names):]))
+    missing = [name for name in output if name not in sizes]
+    if missing:
+        raise ValueError(f"cannot infer output dimension {missing[0]!r} from the inputs")
+    return tuple(sizes[name] for name in output)
+
+
+def _release(array: Any, start: int, stop: int) -> None:
+    """Descarta de la memoria del proceso las filas ``start:stop`` de un memmap compartido."""
+
+    mm = getattr(array, "_mmap", None)
+    if (
+        mm is None
+        or array.base is not mm
+        or getattr(array, "mode", "c") == "c"
+        or not array.flags.c_contiguous
+        or not hasattr(mm, "madvise")
+    ):
+        return
+    head = array.offset % mmap.ALLOCATIONGRANULARITY
+    row = array.strides[0]
+    begin = head + start * row
+    end = min(head + stop * row, len(mm))
+    begin -= begin % mmap.PAGESIZE
+    if end > begin:
+        try:
+            mm.madvise(mmap.MADV_DONTNEED, begin, end - begin)
+        except (OSError, ValueError):  # pragma: no cover - depende del sistema
+            pass
+
+
+def _rows_per_block(arrays: Sequence[np.ndarray], rows: int, block_size: Optional[int]) -> int:
+    if block_size is not None:
+        if block_size < 1:
+            raise ValueError("block_size must be a positive number of rows")
+        return block_size
+    row_bytes = sum(a.itemsize * (a.size // max(a.shape[0], 1)) for a in arrays) or 1
+    return max(1, min(rows, BLOCK_BYTES // row_bytes))
+
+
+def stream(
+    kernel: Callable[..., Any],
+    fallback: Callable[..., Any],
+    args: Sequence[Any],
+    out: Union[np.ndarray, PathLike],
+    *,
+    layout: Optional[str] = None,
+    block_size: Optional[int] = None,
+    threads: int = 1,
+) -> np.ndarray:
+    """Aplica ``kernel`` a ``args`` por bloques del primer eje y escribe en ``out``.
+
+    Parámetros
+    ----------
+    kernel:
+        *Ufunc* de ``vectorize`` o *gufunc* de ``guvectorize``.
+    fallback:
+        Versión en Python que se usa si Numba falla con el primer bloque.
+    args:
+        Entradas.  Se trocean las que recorren todas las dimensiones de bucle
+        (las que tienen tantas como la mayor); el resto, y los escalares, se
+        pasan enteras a cada bloque.
+    out:
+        Arreglo o memmap de salida, o ruta de un ``.npy`` que se crea con el
+        ``dtype`` y la forma que produce el primer bloque.
+    layout:
+        *Layout* de la *gufunc* (``"(n),()->(n)"``); ``None`` para *ufuncs*.
+    block_size:
+        Filas por bloque.  Por defecto, las que ocupan unos
+        :data:`BLOCK_BYTES` entre entradas y salida.
+    threads:
+        Hilos que procesan bloques a la vez.
+
+    Devuelve ``out`` (el memmap creado si era una ruta).
+    """
+
+    if threads < 1:
+        raise ValueError("threads must be a positive integer")
+    in_core, out_core = core_dims(layout)
+    if layout is not None and len(out_core) != 1:
+        raise ValueError("stream() supports kernels with exactly one output")
+    in_core = in_core or [0] * len(args)
+    loops = [
+        np.ndim(arg) - core if isinstance(arg, np.ndarray) else 0
+        for arg, core in zip(args, in_core)
+    ]
+    depth = max(loops, default=0)
+    split = [isinstance(arg, np.ndarray) and depth > 0 and loop == depth for arg, loop in zip(args, loops)]
+    if not any(split):
+        raise ValueError("stream() needs at least one array input with loop dimensions")
+    rows = {arg.shape[0] for arg, s in zip(args, split) if s}
+    if len(rows) != 1:
+        raise ValueError("array inputs must share the length of their first axis")
+    (rows,) = rows
+    gufunc = layout is not None
+
+    def blocks(start: int, stop: int) -> List[Any]:
+        return [arg[start:stop] if s else arg for arg, s in zip(args, split)]
+
+    def python_block(start: int, stop: int, target: np.ndarray) -> None:
+        chunk = blocks(start, stop)
+        if not gufunc:
+            target[...] = fallback(*chunk)
+            return
+        # Una llamada por posición de bucle; una salida escalar se pasa como
+        # vista de un elemento, igual que hace Numba.
+        scalar_out = out_core[0] == 0
+        for index in np.ndindex(*target.shape[:depth]):
+            row = target[index + (None,)] if scalar_out else target[index]
+            fallback(*[c[index] if s else c for c, s in zip(chunk, split)], row)
+
+    def numba_block(start: int, stop: int, target: np.ndarray) -> None:
+        if gufunc:
+            kernel(*blocks(start, stop), target)
+        else:
+            kernel(*blocks(start, stop), out=target)
+
+    split_arrays = [arg for arg, s in zip(args, split) if s]
+    size = _rows_per_block(split_arrays + ([out] if isinstance(out, np.ndarray) else []), rows, block_size)
+    run = numba_block
+
+    first_stop = min(size, rows)
+    if not isinstance(out, np.ndarray):
+        try:
+            first = np.asarray(kernel(*blocks(0, first_stop)))
+        except Exception:
+            logger.warning("Beat it! Numba failed while streaming. Falling back.")
+            run = python_block
+            if gufunc:
+                # La versión en Python escribe en la salida: se reserva el bloque.
+                loop_shape = split_arrays[0].shape[:depth]
+                first = np.empty(
+                    (first_stop,) + loop_shape[1:] + _output_core_shape(layout, args),
+                    dtype=np.result_type(*split_arrays),
+                )
+                python_block(0, first_stop, first)
+            else:
+                first = np.asarray(fallback(*blocks(0, first_stop)))
+        out = np.lib.format.open_memmap(
+            os.fspath(out), mode="w+", dtype=first.dtype, shape=(rows,) + first.shape[1:]
+        )
+        out[:first_stop] = first
+    else:
+        if out.shape[0] != rows:
+            raise ValueError("out must have the same length as the inputs")
+        try:
+            run(0, first_stop, out[:first_stop])
+        except Exception:
+            logger.warning("Beat it! Numba failed while streaming. Falling back.")
+            run = python_block
+            run(0, first_stop, out[:first_stop])
+    arrays = split_arrays + [out]
+
+    def process(start: int) -> None:
+        stop = min(start + size, rows)
+        run(start, stop, out[start:stop])
+        for array in arrays:
+            _release(array, start, stop)
+
+    for array in arrays:
+        _release(array, 0, first_stop)
+    starts = range(first_stop, rows, size)
+    if threads == 1:
+        for start in starts:
+            process(start)
+    else:
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            pending = set()
+            for start in starts:
+                # Como mucho dos bloques por hilo en vuelo.
+                if len(pending) >= 2 * threads:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        future.result()
+                pending.add(executor.submit(process, start))
+            for future in pending:
+                future.result()
+    if isinstance(out, np.memmap):
+        out.flush()
+    return out
@@ -0,0 +1,175 @@
+"""Código que ejecutan los *workers* remotos de :func:`smooth_criminal.core.jam`.
+
+Los procesos, los subintérpretes y los nodos del backend ``cluster`` solo
+necesitan este módulo y :mod:`smooth_criminal.shipping` para aplicar la
+función a sus porciones.  Ninguno de los dos importa NumPy ni Numba: los
+subintérpretes de :class:`concurrent.futures.InterpreterPoolExecutor` (con
+GIL propio) no pueden cargar extensiones que no admiten varios intérpretes,
+así que con ``backend="interpreter"`` solo funcionan las funciones cuyo
+módulo tampoco las importa.
+"""
+
+from __future__ import annotations
+
+import functools
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger("SmoothCriminal")
+
+
+class _Missing:
+    """Marca las posiciones sin resultado; conserva su identidad al serializarse."""
+
+    __slots__ = ()
+
+    def __reduce__(self) -> str:
+        return "MISSING"
+
+    def __repr__(self) -> str:
+        return "MISSING"
+
+
+MISSING = _Missing()
+
+
+def apply_chunk(func: Callable[[Any], Any], chunk: Sequence[Any]) -> List[Any]:
+    local_results: List[Any] = []
+    for arg in chunk:
+        try:
+            local_results.append(func(arg))
+        except Exception as e:
+            logger.warning(f"Worker failed on input {arg}: {e}")
+    return local_results
+
+
+class Args:
+    """Argumentos posicionales y nombrados de un elemento de ``starmap``.
+
+    ``Args(3, exp=2)`` hace que ``jam(star=True)`` llame a ``func(3, exp=2)``.
+    Es la única forma de pasar argumentos nombrados por elemento: una tupla
+    ``(lista, dict)`` se desempaqueta como dos argumentos posicionales.
+    """
+
+    __slots__ = ("args", "kwargs")
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        self.args = args
+        self.kwargs = kwargs
+
+    def __getstate__(self):
+        return (self.args, self.kwargs)
+
+    def __setstate__(self, state) -> None:
+        self.args, self.kwargs = state
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Args):
+            return NotImplemented
+        return self.args == other.args and self.kwargs == other.kwargs
+
+    def __repr__(self) -> str:
+        parts = [repr(arg) for arg in self.args]
+        parts += [f"{name}={value!r}" for name, value in self.kwargs.items()]
+        return f"Args({', '.join(parts)})"
+
+
+def split_star_item(item: Any) -> Tuple[Sequence[Any], Dict[str, Any]]:
+    """Separa un elemento de ``starmap`` en argumentos posicionales y nombrados.
+
+    Un :class:`Args` aporta ambos; cualquier tupla o lista son solo
+    posicionales y un valor suelto es un único argumento.
+    """
+
+    if isinstance(item, Args):
+        return item.args, item.kwargs
+    if isinstance(item, (tuple, list)):
+        return item, {}
+    return (item,), {}
+
+
+class StarCall:
+    """Invoca ``func`` desempaquetando cada elemento (semántica *starmap*)."""
+
+    __slots__ = ("func",)
+
+    def __init__(self, func: Callable[..., Any]) -> None:
+        self.func = func
+
+    def __call__(self, item: Any) -> Any:
+        args, kwargs = split_star_item(item)
+        return self.func(*args, **kwargs)
+
+
+def bind(func: Callable[..., Any], star: bool, constants: Dict[str, Any]) -> Callable[[Any], Any]:
+    """Prepara la función que aplica cada *worker* de ``jam``.
+
+    Los argumentos constantes se fijan una sola vez con :func:`functools.partial`
+    en lugar de combinarse con cada elemento.
+    """
+
+    if constants:
+        func = functools.partial(func, **constants)
+    return StarCall(func) if star else func
+
+
+class FuncRef:
+    """Referencia por nombre a la función de ``jam`` para nodos remotos.
+
+    Viaja con cada porción del backend ``cluster`` en lugar de la función para
+    que el nodo la importe y la prepare con :func:`bind`.  Los pools locales
+    usan :class:`~smooth_criminal.shipping.ShippedRef`.
+    """
+
+    __slots__ = ("module_name", "func_name", "star", "constants")
+
+    def __init__(
+        self,
+        module_name: str,
+        func_name: str,
+        star: bool = False,
+        constants: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.module_name = module_name
+        self.func_name = func_name
+        self.star = star
+        self.constants = constants or {}
+
+    def __getstate__(self):
+        return (self.module_name, self.func_name, self.star, self.constants)
+
+    def __setstate__(self, state) -> None:
+        self.module_name, self.func_name, self.star, self.constants = state
+
+    def resolve(self) -> Callable[[Any], Any]:
+        import importlib
+
+        module = importlib.import_module(self.module_name)
+        target = getattr(module, self.func_name)
+        # Al importar de nuevo el módulo el nombre público apunta al
+        # envoltorio de ``jam``: se usa la función original.
+        target = getattr(target, "_jam_target", target)
+        return bind(target, self.star, self.constants)
+
+
+def process_chunk(ref: Any, chunk: Sequence[Any]) -> List[Any]:
+    return apply_chunk(ref.resolve(), chunk)
+
+
+def process_chunk_timed(ref: Any, chunk: Sequence[Any]) -> Tuple[List[Any], float]:
+    start = time.perf_counter()
+    results = process_chunk(ref, chunk)
+    return results, time.perf_counter() - start
+
+
+def apply_batch(func: Callable[[Any], Any], piece: Any) -> Any:
+    try:
+        return func(piece)
+    except Exception as e:
+        logger.warning(f"Worker failed on batch of {len(piece)} inputs: {e}")
+        return MISSING
+
+
+def process_batch(ref: Any, piece: Any) -> Any:
+    return apply_batch(ref.resolve(), piece)
@@ -1,4 +1,13 @@
+import ast
+import os
+import subprocess
+import sys
+import textwrap
+
+import numpy as np
 import pytest
+from smooth_criminal import analizer, memory
+from smooth_criminal.analizer import plan_prange
 from smooth_criminal.core import bad
 
 @bad(parallel=False)
@@ -19,3 +28,212 @@ def test_bad_exception():
     wrapped = bad(parallel=False)(fail)
     with pytest.raises(ValueError):
         wrapped(1, 2)
+
+@bad(signatures=["int64(int64)"])
+def twice(x):
+    return x * 2
+
+def test_bad_compiles_declared_signatures():
+    assert "(int64,)" in twice.warmup()
+    assert twice.warmup(1.5) == ["(float64,)"]
+    assert twice(3) == 6
+
+
+def row_sums(a, out):
+    for i in range(a.shape[0]):
+        s = 0.0
+        for j in range(a.shape[1]):
+            s += a[i, j]
+        out[i] = s
+    for i in range(1, out.shape[0]):
+        out[i] += out[i - 1]
+    return out
+
+
+def test_bad_parallel_rewrites_independent_loops(monkeypatch):
+    logged = []
+    monkeypatch.setattr(memory, "log_execution_stats", lambda **kw: logged.append(kw))
+    wrapped = bad(parallel=True)(row_sums)
+    report = wrapped.prange_report
+    assert [e["loop"] for e in report["converted"]] == ["for i in range(a.shape[0])"]
+    assert report["rejected"][0]["reason"] == (
+        "'out' is read at a different index than it is written"
+    )
+
+    a = np.arange(12.0).reshape(4, 3)
+    np.testing.assert_allclose(wrapped(a, np.empty(4)), row_sums(a, np.empty(4)))
+    (entry,) = logged
+    assert entry["decorator_used"] == "@bad"
+    assert entry["metadata"]["prange"] is report
+    diagnostics = entry["metadata"]["parallel_diagnostics"]
+    assert "Parallel" in diagnostics or "disk cache" in diagnostics
+
+
+@pytest.mark.parametrize(
+    "source, reason",
+    [
+        ("for i in range(n):\n    if x[i]:\n        break", "loop contains 'break'"),
+        ("for i in range(n):\n    acc = acc * 2 + x[i]", "'acc' carries a value from the previous iteration"),
+        ("for i in range(n):\n    hist[x[i]] += 1", "write to 'hist' is not indexed by 'i'"),
+        ("for i in range(n):\n    last = x[i]\nreturn last", "'last' is used after the loop"),
+        ("for i in range(0, n, 2):\n    x[i] = 0", "range() with a step"),
+        (
+            "for i in range(n):\n    acc += x[i]\n    acc *= 0.5",
+            "reduction variable 'acc' mixes operators",
+        ),
+        (
+            "for i in range(n):\n    if x[i] > 5:\n        acc += x[i]\n    else:\n        acc = 0.0",
+            "reduction variable 'acc' is also assigned inside the loop",
+        ),
+        (
+            "for i in range(n):\n    if x[i] > 5:\n        acc = 0.0\n    else:\n        acc += x[i]",
+            "reduction variable 'acc' is also assigned inside the loop",
+        ),
+    ],
+)
+def test_plan_prange_rejections(source, reason):
+    body = "\n".join("    " + line for line in source.splitlines())
+    tree = ast.parse(f"def f(x, n, acc, hist):\n{body}")
+    loops, report = plan_prange(tree)
+    assert loops == []
+    assert report["rejected"][0]["reason"] == reason
+
+
+def test_plan_prange_accepts_reductions():
+    tree = ast.parse("def f(x, n):\n    t = 0.0\n    for i in range(n):\n        t += x[i]\n    return t")
+    loops, report = plan_prange(tree)
+    assert report["converted"] == [{"line": 3, "loop": "for i in range(n)"}]
+
+
+@pytest.mark.parametrize(
+    "source, reason",
+    [
+        (
+            "c = a\nfor i in range(1, len(a)):\n    c[i] = c[i] + a[i - 1]",
+            "'c' may alias 'a'",
+        ),
+        (
+            "for i in range(1, len(a)):\n    b[i] = a[i - 1]",
+            "'a' is read at another index while 'b' is written and they may be the same array",
+        ),
+    ],
+)
+def test_plan_prange_rejects_possible_aliasing(source, reason):
+    body = "\n".join("    " + line for line in source.splitlines())
+    loops, report = plan_prange(ast.parse(f"def f(a, b):\n{body}\n    return a"))
+    assert loops == []
+    assert report["rejected"][0]["reason"] == reason
+
+
+def test_plan_prange_accepts_shifted_reads_into_fresh_arrays():
+    source = (
+        "def f(a):\n    out = np.empty_like(a)\n    for i in range(1, len(a)):\n"
+        "        out[i] = a[i - 1]\n    return out"
+    )
+    loops, report = plan_prange(ast.parse(source))
+    assert len(loops) == 1 and report["rejected"] == []
+
+
+def prefix_alias(a):
+    c = a
+    for i in range(1, len(a)):
+        c[i] = c[i] + a[i - 1]
+    return c
+
+
+def test_bad_parallel_keeps_aliased_prefix_sum_serial():
+    wrapped = bad(parallel=True)(prefix_alias)
+    assert wrapped.prange_report["converted"] == []
+    assert wrapped(np.ones(1_000_000))[-1] == 1_000_000
+
+
+def test_bad_parallel_keeps_mixed_reductions_serial_with_threads(tmp_path):
+    # Numba fija el número de hilos al importarse: se prueba en otro proceso.
+    script = tmp_path / "mixed_reductions.py"
+    script.write_text(
+        textwrap.dedent(
+            """
+            import numpy as np
+            from smooth_criminal.core import bad
+
+            def halve(a):
+                s = 0.0
+                for i in range(a.shape[0]):
+                    s += a[i]
+                    s *= 0.5
+                return s
+
+            def reset(a):
+                s = 0.0
+                for i in range(a.shape[0]):
+                    if a[i] > 5:
+                        s += a[i]
+                    else:
+                        s = 0.0
+                return s
+
+            a = np.arange(1000.0) % 10
+            for func in (halve, reset):
+                wrapped = bad(parallel=True)(func)
+                assert wrapped.prange_report["converted"] == [], func.__name__
+                assert wrapped(a) == func(a), func.__name__
+            print("ok")
+            """
+        )
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    path = os.pathsep.join(filter(None, [root, os.environ.get("PYTHONPATH")]))
+    env = {**os.environ, "NUMBA_NUM_THREADS": "4", "PYTHONPATH": path}
+    result = subprocess.run(
+        [sys.executable, str(script)], capture_output=True, text=True, env=env, timeout=240
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.split()[-1] == "ok"
+
+
+def _fake_rewrite(monkeypatch, rewritten):
+    report = {"converted": [{"line": 2, "loop": "for i in range(n)"}], "rejected": []}
+    monkeypatch.setattr(analizer, "parallelize_loops", lambda func: (rewritten, report))
+    return report
+
+
+def test_bad_falls_back_when_the_rewrite_raises_a_plain_exception(monkeypatch):
+    def rewritten(x):
+        raise ValueError("parfor pass failed")
+
+    def doubled(x):
+        return x * 2
+
+    report = _fake_rewrite(monkeypatch, rewritten)
+    wrapped = bad(parallel=True)(doubled)
+    assert wrapped(3) == 6
+    assert wrapped(4) == 8
+    assert report["converted"] == [] and report["error"].startswith("ValueError")
+
+
+def test_bad_keeps_user_errors_and_the_rewrite(monkeypatch):
+    def rewritten(x):
+        raise ValueError("boom")
+
+    def fails(x):
+        raise ValueError("boom")
+
+    report = _fake_rewrite(monkeypatch, rewritten)
+    wrapped = bad(parallel=True)(fails)
+    with pytest.raises(ValueError):
+        wrapped(1)
+    assert "error" not in report and report["converted"]
+
+
+def test_bad_signatures_fall_back_when_the_rewrite_does_not_compile(monkeypatch):
+    def rewritten(x):
+        return object()
+
+    def tripled(x):
+        return x * 3
+
+    report = _fake_rewrite(monkeypatch, rewritten)
+    wrapped = bad(parallel=True, signatures=["int64(int64)"])(tripled)
+    assert report["converted"] == [] and "error" in report
+    assert wrapped.warmup(1.5) == ["(float64,)"]
+    assert wrapped(2) == 6
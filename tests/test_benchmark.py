@@ -16,3 +16,15 @@ def test_benchmark_generates_metrics_for_all_backends():
 def test_detect_fastest_backend_returns_valid_backend():
     best = detect_fastest_backend(cube, [1, 2, 3], ["thread", "process", "async"])
     assert best in {"thread", "process", "async"}
+
+
+def cubes(chunk):
+    return [x ** 3 for x in chunk]
+
+
+def test_benchmark_marks_only_the_backend_that_rejects_an_option():
+    result = benchmark_jam(cubes, [1, 2, 3], ["thread", "async"], batch=True)
+    metrics = {m["backend"]: m for m in result["metrics"]}
+    assert metrics["thread"]["success"]
+    assert not metrics["async"]["success"] and "batch" in metrics["async"]["error"]
+    assert result["fastest"] == "thread"
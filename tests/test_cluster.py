@@ -0,0 +1,149 @@
+import multiprocessing
+import os
+import socket
+import subprocess
+import sys
+import time
+from multiprocessing.connection import Client
+from pathlib import Path
+
+import pytest
+from smooth_criminal.benchmark import benchmark_jam
+from smooth_criminal.cluster import parse_address, resolve_authkey, serve_worker
+from smooth_criminal.core import jam
+
+KEY = "smooth-test-key"
+
+
+def square(x):
+    return x * x
+
+
+def fragile(x):
+    # El nodo "víctima" muere al recibir su primera porción.
+    if os.environ.get("SC_CLUSTER_VICTIM"):
+        os._exit(1)
+    return x + 1
+
+
+def _serve(ready, index, victim=False):
+    if victim:
+        os.environ["SC_CLUSTER_VICTIM"] = "1"
+    serve_worker(("127.0.0.1", 0), KEY, ready=lambda address: ready.put((index, address)))
+
+
+def _start_nodes(victims):
+    # ``spawn``: otras pruebas pueden haber iniciado la capa TBB de Numba, y
+    # un ``fork`` después de eso bloquea el proceso al terminar.
+    ctx = multiprocessing.get_context("spawn")
+    ready = ctx.Queue()
+    procs = []
+    for index, victim in enumerate(victims):
+        proc = ctx.Process(target=_serve, args=(ready, index, victim), daemon=True)
+        proc.start()
+        procs.append(proc)
+    # Los nodos pueden estar listos en cualquier orden; se devuelven en el
+    # de ``victims``.
+    addresses = sorted(ready.get(timeout=10) for _ in victims)
+    return procs, [f"{host}:{port}" for _, (host, port) in addresses]
+
+
+@pytest.fixture
+def nodes():
+    procs, addresses = _start_nodes([False, False, False])
+    yield addresses
+    for proc in procs:
+        proc.terminate()
+
+
+def test_parse_address_and_authkey(monkeypatch):
+    assert parse_address("10.0.0.1:9000") == ("10.0.0.1", 9000)
+    assert parse_address(("h", "80")) == ("h", 80)
+    with pytest.raises(ValueError):
+        parse_address("sin-puerto")
+    monkeypatch.delenv("SMOOTH_CRIMINAL_AUTHKEY", raising=False)
+    with pytest.raises(ValueError):
+        resolve_authkey()
+    monkeypatch.setenv("SMOOTH_CRIMINAL_AUTHKEY", "abc")
+    assert resolve_authkey() == b"abc"
+
+
+def test_cluster_balances_across_nodes(nodes):
+    wrapped = jam(backend="cluster", nodes=nodes, authkey=KEY, ordered=True, chunksize=5)(
+        square
+    )
+    assert wrapped(list(range(60))) == [x * x for x in range(60)]
+    stats = wrapped.stats["nodes"]
+    assert sum(node["items"] for node in stats) == 60
+    assert all(node["alive"] for node in stats)
+
+
+def test_cluster_resubmits_when_node_dies():
+    procs, addresses = _start_nodes([True, False])
+    try:
+        wrapped = jam(
+            backend="cluster", nodes=addresses, authkey=KEY, ordered=True, chunksize=2
+        )(fragile)
+        assert wrapped(list(range(10))) == list(range(1, 11))
+        victim, healthy = wrapped.stats["nodes"]
+        assert not victim["alive"] and victim["resubmitted"] == 1
+        assert healthy["items"] == 10
+    finally:
+        for proc in procs:
+            proc.terminate()
+
+
+def test_cluster_rejects_wrong_authkey(nodes):
+    wrapped = jam(backend="cluster", nodes=nodes[:1], authkey="otra")(square)
+    with pytest.raises(RuntimeError):
+        wrapped([1, 2, 3])
+
+
+def test_cluster_requires_nodes():
+    with pytest.raises(ValueError):
+        jam(backend="cluster")
+
+
+def test_benchmark_reports_node_throughput(nodes):
+    result = benchmark_jam(square, list(range(20)), ["cluster"], nodes=nodes, authkey=KEY)
+    (metric,) = result["metrics"]
+    assert metric["success"]
+    assert set(metric["nodes"]) == set(nodes)
+
+
+def test_cli_worker_serves_chunks():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    address = f"127.0.0.1:{port}"
+    repo_root = Path(__file__).resolve().parent.parent
+    # El nodo importa este módulo con el mismo nombre que el cliente.
+    env = {
+        **os.environ,
+        "SMOOTH_CRIMINAL_AUTHKEY": KEY,
+        "PYTHONPATH": os.pathsep.join(
+            [str(Path(__file__).resolve().parent), str(repo_root)]
+        ),
+    }
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "smooth_criminal.cli", "worker", "--listen", address],
+        cwd=repo_root,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = time.time() + 30
+        while True:
+            try:
+                Client(("127.0.0.1", port), authkey=KEY.encode()).close()
+                break
+            except (ConnectionRefusedError, OSError):
+                if time.time() > deadline:
+                    raise
+                time.sleep(0.1)
+        wrapped = jam(backend="cluster", nodes=[address], authkey=KEY, ordered=True)(square)
+        assert wrapped([1, 2, 3]) == [1, 4, 9]
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
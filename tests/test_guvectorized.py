@@ -1,4 +1,5 @@
 import numpy as np
+from smooth_criminal import memory
 from smooth_criminal.core import guvectorized
 
 
@@ -26,3 +27,12 @@ def test_guvectorized_fallback():
     result = add_bad(a, b, out)
     assert result is None
     np.testing.assert_array_equal(out, np.array([4.0, 6.0]))
+
+
+def test_guvectorized_remembers_failed_signatures(monkeypatch):
+    monkeypatch.setattr(memory, "log_execution_stats", lambda **kw: None)
+    a = np.array([1 + 1j, 2.0])
+    out = np.empty_like(a)
+    add_vec(a, a, out)
+    np.testing.assert_array_equal(out, a * 2)
+    assert list(add_vec.failed_signatures) == [("ndarray[complex128, 1d]",) * 3]
@@ -0,0 +1,64 @@
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Margen amplio: sin Numba la importación ronda unos pocos milisegundos,
+# con Numba supera con creces este límite.
+IMPORT_BUDGET_US = 150_000
+
+
+def _importtime(*args):
+    """Ejecuta Python con ``-X importtime`` y devuelve ``{módulo: acumulado_us}``."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        capture_output=True,
+        text=True,
+        cwd=REPO_ROOT,
+    )
+    assert result.returncode == 0, result.stderr
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = int(cumulative)
+    return modules
+
+
+def test_package_import_is_lazy():
+    modules = _importtime("-c", "import smooth_criminal")
+    assert "numba" not in modules and "numpy" not in modules
+    assert modules["smooth_criminal"] < IMPORT_BUDGET_US
+
+
+def test_core_import_skips_numpy_and_logging_setup():
+    modules = _importtime("-c", "from smooth_criminal import core")
+    assert "numpy" not in modules and "numba" not in modules
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import logging, smooth_criminal.core; print(logging.getLogger().handlers)",
+        ],
+        capture_output=True,
+        text=True,
+        cwd=REPO_ROOT,
+    )
+    assert result.stdout.strip() == "[]"
+
+
+def test_numba_loads_on_first_jit_decorator():
+    modules = _importtime("-c", "from smooth_criminal import smooth, jam")
+    assert "numba" not in modules
+    modules = _importtime(
+        "-c", "from smooth_criminal import smooth\nsmooth(lambda x: x)"
+    )
+    assert "numba" in modules
+
+
+def test_cli_help_skips_heavy_dependencies():
+    modules = _importtime("-m", "smooth_criminal.cli", "--help")
+    for heavy in ("numba", "numpy", "smooth_criminal.dashboard", "smooth_criminal.core"):
+        assert heavy not in modules
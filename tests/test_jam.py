@@ -23,3 +23,52 @@ def test_jam_worker_exception(numbers):
     result = maybe_fail(numbers[:3])
     assert sorted(result) == [1, 4]  # 3 falla y se omite
 
+
+
+def test_jam_ordered_thread(numbers):
+    @jam(workers=3, backend="thread", ordered=True)
+    def slow_square(x):
+        import time
+
+        time.sleep(0.01 * (len(numbers) - x))
+        return x * x
+
+    assert slow_square(numbers) == [n * n for n in numbers]
+
+
+def test_jam_ordered_skips_failures(numbers):
+    @jam(workers=2, backend="thread", ordered=True)
+    def maybe_fail(x):
+        if x == 3:
+            raise ValueError("boom")
+        return x * x
+
+    assert maybe_fail(numbers) == [1, 4, 16, 25]
+
+
+def test_jam_imap_streams_lazily():
+    consumed = []
+
+    def source():
+        for n in range(1000):
+            consumed.append(n)
+            yield n
+
+    stream = square.imap(source(), ordered=True)
+    first = [next(stream) for _ in range(3)]
+    assert first == [0, 1, 4]
+    # Solo se han leído las porciones en vuelo, no toda la entrada
+    assert len(consumed) < 50
+    stream.close()
+
+
+def test_jam_imap_unordered(numbers):
+    assert sorted(square.imap(iter(numbers))) == [n * n for n in numbers]
+
+
+def test_jam_async_has_no_imap():
+    @jam(workers=2, backend="async")
+    async def noop(x):
+        return x
+
+    assert not hasattr(noop, "imap")
@@ -24,3 +24,41 @@ def test_jam_async_with_sync_func(numbers):
     expected = [n * n for n in numbers]
     result = asyncio.run(square_sync(numbers))
     assert sorted(result) == expected
+
+
+def test_jam_async_respects_workers_limit():
+    running = 0
+    peak = 0
+
+    @jam(workers=3, backend="async")
+    async def tracked(x):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.001)
+        running -= 1
+        return x
+
+    result = asyncio.run(tracked(list(range(50))))
+    assert result == list(range(50))
+    assert peak == 3
+
+
+def test_jam_async_sync_func_uses_sized_executor():
+    import threading
+
+    threads = set()
+
+    @jam(workers=2, backend="async")
+    def record(x):
+        threads.add(threading.get_ident())
+        return x
+
+    assert asyncio.run(record(list(range(20)))) == list(range(20))
+    assert len(threads) <= 2
+
+
+def test_jam_async_propagates_errors(failing_async_func):
+    wrapped = jam(workers=2, backend="async")(failing_async_func)
+    with pytest.raises(ValueError):
+        asyncio.run(wrapped([1, 2, 3]))
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+from smooth_criminal.core import jam, vectorized
+
+
+@vectorized(["float64(float64)"])
+def doble(x):
+    return x * 2
+
+
+@jam(workers=3, backend="thread", batch=True)
+def doble_batch(arr):
+    return doble(arr)
+
+
+@jam(workers=2, backend="process", batch=True, chunksize=2)
+def sum_batch(chunk):
+    return [sum(chunk)]
+
+
+@jam(workers=2, backend="process", batch=True, chunksize=2)
+def picky_batch(chunk):
+    if 0 in chunk:
+        raise ValueError("no zeros")
+    return [x * 2 for x in chunk]
+
+
+def test_batch_thread_ndarray_concatenates_in_order():
+    data = np.arange(10, dtype=np.float64)
+    np.testing.assert_array_equal(doble_batch(data), data * 2)
+
+
+def test_batch_calls_func_once_per_worker():
+    calls = []
+
+    @jam(workers=2, backend="thread", batch=True)
+    def record(chunk):
+        calls.append(len(chunk))
+        return [x + 1 for x in chunk]
+
+    assert record([1, 2, 3, 4, 5]) == [2, 3, 4, 5, 6]
+    assert sorted(calls) == [2, 3]
+
+
+def test_batch_process_list_with_chunksize(numbers):
+    assert sum_batch(numbers) == [3, 7, 5]
+
+
+def test_batch_splits_along_axis():
+    @jam(workers=2, backend="thread", batch=True, axis=1)
+    def col_means(block):
+        return block.mean(axis=0, keepdims=True)
+
+    data = np.arange(12, dtype=np.float64).reshape(3, 4)
+    np.testing.assert_array_equal(col_means(data), data.mean(axis=0, keepdims=True))
+
+
+def test_batch_rejected_for_async():
+    with pytest.raises(ValueError):
+        jam(workers=2, backend="async", batch=True)
+
+
+def test_batch_process_drops_failed_batches():
+    # El marcador de porción fallida vuelve del proceso hijo intacto.
+    assert picky_batch([0, 1, 2, 3]) == [4, 6]
+
+
+def test_batch_scalar_results_are_appended():
+    @jam(workers=2, backend="thread", batch=True, chunksize=2)
+    def total(chunk):
+        return sum(chunk)
+
+    @jam(workers=2, backend="thread", batch=True, chunksize=2)
+    def media(block):
+        return np.asarray(block.mean())  # arreglo de dimensión 0 por porción
+
+    assert total([1, 2, 3, 4, 5]) == [3, 7, 5]
+    result = media(np.arange(4.0))
+    assert isinstance(result, np.ndarray)
+    np.testing.assert_array_equal(result, [0.5, 2.5])
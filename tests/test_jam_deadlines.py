@@ -0,0 +1,108 @@
+import threading
+import time
+
+import pytest
+from smooth_criminal.core import jam
+from smooth_criminal.deadlines import CancelScope, JamResult, run_threads
+
+
+def lento(x):
+    # El 3 se cuelga más que cualquier plazo de las pruebas.
+    time.sleep(5 if x == 3 else 0.01)
+    return x * 10
+
+
+def test_jam_result_behaves_like_list():
+    result = JamResult([1, 2], timed_out=[3], cancelled=[4])
+    assert result == [1, 2]
+    assert not result.complete
+    assert JamResult([1]).complete
+
+
+def test_thread_item_timeout_returns_partial_results():
+    wrapped = jam(workers=2, backend="thread", timeout=0.3, ordered=True)(lento)
+    start = time.perf_counter()
+    result = wrapped([1, 2, 3, 4, 5])
+    assert time.perf_counter() - start < 2
+    assert result == [10, 20, 40, 50]
+    assert result.timed_out == [3]
+    assert result.cancelled == []
+
+
+def test_thread_item_timeout_when_first_item_hangs():
+    # Ningún elemento rápido termina antes que el colgado para despertar al
+    # coordinador.
+    wrapped = jam(workers=1, backend="thread", timeout=0.2, ordered=True)(lento)
+    start = time.perf_counter()
+    result = wrapped([3, 1, 2])
+    assert time.perf_counter() - start < 2
+    assert result == [10, 20]
+    assert result.timed_out == [3]
+
+    start = time.perf_counter()
+    result = jam(workers=2, backend="thread", timeout=0.2)(lento)([3, 3])
+    assert time.perf_counter() - start < 2
+    assert result == [] and result.timed_out == [3, 3]
+
+
+def test_thread_deadline_cancels_pending_items():
+    @jam(workers=1, backend="thread", deadline=0.3, ordered=True)
+    def paso(x):
+        time.sleep(0.2)
+        return x
+
+    result = paso([1, 2, 3, 4, 5])
+    assert result == [1]
+    assert result.timed_out == [2]
+    assert result.cancelled == [3, 4, 5]
+
+
+def test_process_item_timeout():
+    wrapped = jam(workers=2, backend="process", timeout=0.3, ordered=True, chunksize=2)(
+        lento
+    )
+    result = wrapped([1, 2, 3, 4])
+    assert result == [10, 20, 40]
+    assert result.timed_out == [3]
+
+
+def test_process_deadline_abandons_hung_chunks():
+    wrapped = jam(workers=1, backend="process", deadline=1.0, chunksize=1)(lento)
+    start = time.perf_counter()
+    result = wrapped([1, 3, 4])
+    assert time.perf_counter() - start < 4
+    assert result == [10]
+    assert result.timed_out == [3]
+    assert result.cancelled == [4]
+
+
+def test_cancel_stops_handing_out_work():
+    started = []
+
+    @jam(workers=1, backend="thread", ordered=True)
+    def paso(x):
+        started.append(x)
+        time.sleep(0.05)
+        return x
+
+    threading.Timer(0.12, paso.cancel).start()
+    result = paso(list(range(50)))
+    assert len(started) < 10
+    assert result == started
+    assert result.cancelled == list(range(len(started), 50))
+
+
+def test_run_threads_honours_cancelled_scope():
+    scope = CancelScope()
+    scope.cancel()
+    result = run_threads(lambda x: x, [1, 2, 3], 2, scope, timeout=1.0)
+    assert result == [] and result.cancelled == [1, 2, 3]
+
+
+def test_deadlines_require_supported_backend():
+    with pytest.raises(ValueError):
+        jam(backend="async", timeout=1.0)
+    with pytest.raises(ValueError):
+        jam(timeout=0)
+    with pytest.raises(ValueError):
+        jam(deadline=1.0, schedule="steal")
@@ -0,0 +1,85 @@
+import math
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from smooth_criminal import pools
+from smooth_criminal.benchmark import benchmark_jam, runs_in_parallel
+from smooth_criminal.core import (
+    _index_counter,
+    available_backends,
+    gil_enabled,
+    jam,
+)
+
+
+def triple(x):
+    return x * 3
+
+
+def test_available_backends_lists_core_backends():
+    backends = available_backends()
+    assert {"thread", "process", "async"} <= set(backends)
+    assert ("interpreter" in backends) == pools.supports("interpreter")
+
+
+@pytest.mark.skipif(pools.supports("interpreter"), reason="subinterpreters available")
+def test_interpreter_backend_requires_support():
+    with pytest.raises(RuntimeError):
+        jam(backend="interpreter")
+
+
+def test_interpreter_backend_dispatches_chunks(monkeypatch):
+    # Un executor de hilos sustituye a InterpreterPoolExecutor: el camino de
+    # porciones y la resolución por nombre son los mismos.
+    monkeypatch.setitem(pools._EXECUTORS, "interpreter", ThreadPoolExecutor)
+    wrapped = jam(workers=2, backend="interpreter", ordered=True, chunksize=2)(triple)
+    # Como al reimportar el módulo en un subintérprete, el nombre público
+    # apunta al envoltorio de ``jam``.
+    monkeypatch.setattr(sys.modules[__name__], "triple", wrapped)
+    assert wrapped([1, 2, 3, 4, 5]) == [3, 6, 9, 12, 15]
+    assert list(wrapped.imap([1, 2], ordered=True)) == [3, 6]
+
+
+@pytest.mark.skipif(
+    sys.version_info < (3, 14) or not pools.supports("interpreter"),
+    reason="InterpreterPoolExecutor requires Python 3.14+",
+)
+def test_interpreter_backend_runs_in_subinterpreters():
+    # Sin sustituir el executor: los subintérpretes solo importan
+    # ``smooth_criminal.workers`` y ``shipping``, que no cargan NumPy.
+    wrapped = jam(workers=2, backend="interpreter", ordered=True, chunksize=2)(math.sqrt)
+    assert wrapped([1.0, 4.0, 9.0, 16.0]) == [1.0, 2.0, 3.0, 4.0]
+
+
+def test_remote_worker_modules_do_not_import_numpy():
+    code = (
+        "import sys, smooth_criminal.workers, smooth_criminal.shipping; "
+        "print('numpy' in sys.modules or 'numba' in sys.modules)"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    assert result.stdout.strip() == "False", result.stderr
+
+
+def test_free_threaded_build_is_detected(monkeypatch):
+    monkeypatch.setattr(sys, "_is_gil_enabled", lambda: False, raising=False)
+    assert not gil_enabled()
+    assert runs_in_parallel("thread")
+
+    next_index = _index_counter()
+    assert [next_index() for _ in range(3)] == [0, 1, 2]
+
+    @jam(workers=3, backend="thread", ordered=True)
+    def inc(x):
+        return x + 1
+
+    assert inc(list(range(10))) == list(range(1, 11))
+
+
+def test_benchmark_defaults_to_available_backends():
+    result = benchmark_jam(triple, [1, 2])
+    metrics = {m["backend"]: m for m in result["metrics"]}
+    assert list(metrics) == available_backends()
+    assert metrics["process"]["parallel"]
+    assert not metrics["async"]["parallel"]
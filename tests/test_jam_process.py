@@ -22,3 +22,83 @@ def test_jam_process_worker_exception(numbers):
 
     result = maybe_fail(numbers[:3])
     assert sorted(result) == [1, 4]
+
+
+@jam(workers=2, backend="process", chunksize=2)
+def cube(x):
+    return x ** 3
+
+
+def test_jam_process_chunked_dispatch(numbers):
+    expected = [n ** 3 for n in numbers]
+    assert sorted(cube(numbers)) == expected
+
+
+def test_jam_default_chunksize():
+    from smooth_criminal.core import _default_chunksize
+
+    assert _default_chunksize(1000, 4) == 63
+    assert _default_chunksize(3, 4) == 1
+    assert _default_chunksize(0, 2) == 1
+
+
+def test_jam_invalid_chunksize():
+    with pytest.raises(ValueError):
+        jam(workers=2, backend="process", chunksize=0)
+
+
+@jam(workers=2, backend="process", chunksize=1, ordered=True)
+def ordered_cube(x):
+    return x ** 3
+
+
+def test_jam_process_ordered(numbers):
+    assert ordered_cube(numbers) == [n ** 3 for n in numbers]
+
+
+def test_jam_process_imap_ordered():
+    assert list(cube.imap(range(20), ordered=True)) == [n ** 3 for n in range(20)]
+
+
+@jam(workers=2, backend="process", chunksize="auto", ordered=True)
+def auto_square(x):
+    return x * x
+
+
+def test_jam_process_autotuned_chunksize(monkeypatch):
+    from smooth_criminal import core
+
+    logged = []
+    monkeypatch.setattr(core.memory, "get_execution_history", lambda name: [])
+    monkeypatch.setattr(
+        core.memory, "log_execution_stats", lambda **kwargs: logged.append(kwargs)
+    )
+
+    data = list(range(500))
+    assert auto_square(data) == [n * n for n in data]
+    assert logged[-1]["decorator_used"] == "@jam"
+    assert logged[-1]["metadata"]["chunksize"] >= 1
+
+
+def test_chunk_tuner_grows_when_dispatch_dominates():
+    from smooth_criminal.core import _ChunkTuner
+
+    tuner = _ChunkTuner(workers=2, initial=1)
+    for _ in range(5):
+        size = tuner.next_size(10_000)
+        tuner.record(size, compute=size * 1e-6, roundtrip=size * 1e-6 + 1e-3)
+    assert tuner.size > 100
+    # Al final de la entrada las porciones se limitan para evitar rezagados
+    assert tuner.next_size(10) == 5
+
+
+def test_learned_chunksize_from_history(monkeypatch):
+    from smooth_criminal import core
+
+    history = [
+        {"decorator": "@jam", "metadata": {"chunksize": 8}},
+        {"decorator": "@jam", "metadata": {"chunksize": 32}},
+        {"decorator": "@thriller"},
+    ]
+    monkeypatch.setattr(core.memory, "get_execution_history", lambda name: history)
+    assert core._learned_chunksize("anything") == 32
@@ -0,0 +1,130 @@
+import asyncio
+
+import pytest
+from smooth_criminal.core import jam
+from smooth_criminal.workers import Args, split_star_item
+
+
+@jam(workers=2, backend="thread", star=True, ordered=True)
+def potencia(base, exp, factor=1):
+    return factor * base**exp
+
+
+@jam(workers=2, backend="process", star=True, ordered=True, chunksize=2)
+def potencia_proc(base, exp, factor=1):
+    return factor * base**exp
+
+
+@jam(workers=2, backend="process", ordered=True)
+def escalar(x, factor=1):
+    return x * factor
+
+
+_LOADS = [0]
+
+
+def _load_marca():
+    _LOADS[0] += 1
+    return Marca()
+
+
+class Marca:
+    """Constante que cuenta cuántas veces se deserializa en cada proceso."""
+
+    def __reduce__(self):
+        return (_load_marca, ())
+
+
+@jam(workers=2, backend="process", ordered=True, chunksize=1)
+def cargas(x, marca=None):
+    return _LOADS[0]
+
+
+@jam(workers=2, backend="process", ordered=True, chunksize=1, persistent=True)
+def cargas_persistente(x, marca=None):
+    return _LOADS[0]
+
+
+@jam(workers=2, backend="process", ordered=True, persistent=True)
+def escalar_persistente(x, factor=1):
+    return x * factor
+
+
+def test_split_star_item_forms():
+    assert split_star_item((1, 2)) == ((1, 2), {})
+    assert split_star_item([1, 2]) == ([1, 2], {})
+    assert split_star_item(Args(1, b=2)) == ((1,), {"b": 2})
+    # Sin ``Args`` un par ``(lista, dict)`` son dos argumentos posicionales.
+    assert split_star_item(([1], {"b": 2})) == (([1], {"b": 2}), {})
+    assert split_star_item(5) == ((5,), {})
+
+
+def test_star_thread_positional_and_kwargs():
+    items = [(2, 3), Args(3, exp=2), [4, 1]]
+    assert potencia(items) == [8, 9, 4]
+    assert potencia(items, factor=10) == [80, 90, 40]
+
+
+def test_star_process_with_constants():
+    items = [(2, 3), (3, 2), Args(1, exp=5), (5, 1), (2, 2)]
+    assert potencia_proc(items, factor=2) == [16, 18, 2, 10, 8]
+
+
+def test_constants_without_star_process():
+    assert escalar([1, 2, 3], factor=3) == [3, 6, 9]
+
+
+def test_star_pair_of_list_and_dict_is_positional():
+    @jam(workers=2, backend="thread", star=True)
+    def describe(values, options):
+        return len(values) + len(options)
+
+    assert describe([([1, 2], {"a": 1})]) == [3]
+
+
+def test_constants_travel_once_per_worker():
+    # Cada porción lleva las constantes ya serializadas, pero un worker solo
+    # las deserializa la primera vez que ve su clave.
+    assert max(cargas(list(range(8)), marca=Marca())) <= 1
+    for _ in range(2):
+        assert max(cargas_persistente(list(range(8)), marca=Marca())) <= 1
+    cargas_persistente.shutdown()
+
+
+def test_persistent_pool_is_shared_across_constants():
+    # Las constantes no se atan al pool: llamadas con valores distintos
+    # reutilizan el mismo ejecutor.
+    assert escalar_persistente(list(range(4)), factor=2) == [0, 2, 4, 6]
+    executor = escalar_persistente.pool.executor
+    assert escalar_persistente(list(range(4)), factor=3) == [0, 3, 6, 9]
+    assert escalar_persistente(list(range(4))) == [0, 1, 2, 3]
+    assert escalar_persistente.pool.executor is executor
+    escalar_persistente.shutdown()
+
+
+def test_star_imap_and_steal():
+    assert list(potencia.imap([(2, 2), (3, 3)], ordered=True, factor=2)) == [8, 54]
+
+    @jam(workers=2, backend="thread", star=True, ordered=True, schedule="steal")
+    def suma(a, b, c=0):
+        return a + b + c
+
+    assert suma([(1, 2), (3, 4)], c=1) == [4, 8]
+
+
+def test_star_async_sync_and_coroutine():
+    @jam(workers=2, backend="async", star=True)
+    def resta(a, b):
+        return a - b
+
+    @jam(workers=2, backend="async", star=True)
+    async def multiplica(a, b, k=1):
+        return a * b * k
+
+    assert asyncio.run(resta([(5, 1), (9, 3)])) == [4, 6]
+    assert asyncio.run(multiplica([(2, 3), Args(4, b=5)], k=2)) == [12, 40]
+
+
+def test_star_and_batch_are_incompatible():
+    with pytest.raises(ValueError):
+        jam(star=True, batch=True)
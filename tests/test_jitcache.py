@@ -0,0 +1,146 @@
+import json
+import os
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+from smooth_criminal import jitcache
+
+KERNELS = textwrap.dedent(
+    """
+    from smooth_criminal import smooth, bad
+
+    @smooth(signatures=["float64(float64)"])
+    def mitad(x):
+        return x / 2
+
+    @bad(signatures=["int64(int64)"])
+    def doble(x):
+        return x * 2
+    """
+)
+
+
+def _cli(tmp_path, *args):
+    env = {k: v for k, v in os.environ.items() if k not in ("NUMBA_CACHE_DIR", jitcache.CACHE_DIR_ENV)}
+    env["PYTHONPATH"] = str(Path(__file__).resolve().parent.parent)
+    return subprocess.run(
+        [sys.executable, "-m", "smooth_criminal.cli", "cache", *args],
+        capture_output=True,
+        text=True,
+        cwd=tmp_path,
+        env=env,
+    )
+
+
+def test_prewarm_stats_and_clear_with_cache_dir(tmp_path):
+    (tmp_path / "kernels_cache.py").write_text(KERNELS)
+    cache = tmp_path / "cache"
+    for _ in range(2):
+        result = _cli(tmp_path, "--cache-dir", str(cache), "prewarm", "kernels_cache")
+        assert result.returncode == 0, result.stderr
+
+    stats = jitcache.cache_stats(cache)
+    assert stats["functions"] == 2 and stats["entries"] == 2
+    assert (stats["hits"], stats["misses"]) == (2, 0)
+    assert stats["stale"] == {}
+
+    (tmp_path / "kernels_cache.py").write_text(KERNELS + "\n# deploy\n")
+    stats = jitcache.cache_stats(cache)
+    assert set(stats["stale"].values()) == {"source changed"}
+    assert jitcache.clear_cache(cache)["removed"] == 4
+    assert jitcache.cache_stats(cache)["functions"] == 0
+
+
+def test_in_tree_cache_detects_removed_sources(tmp_path):
+    (tmp_path / "kernels_tree.py").write_text(KERNELS)
+    assert _cli(tmp_path, "prewarm", "kernels_tree").returncode == 0
+    assert jitcache.cache_stats(tmp_path)["stale"] == {}
+
+    (tmp_path / "kernels_tree.py").unlink()
+    assert set(jitcache.cache_stats(tmp_path)["stale"].values()) == {"source removed"}
+    jitcache.clear_cache(tmp_path)
+    assert jitcache.cache_stats(tmp_path)["entries"] == 0
+
+
+def test_configure_cache_dir(monkeypatch, tmp_path):
+    import numba
+
+    monkeypatch.setenv("NUMBA_CACHE_DIR", "")
+    monkeypatch.setattr(numba.config, "CACHE_DIR", numba.config.CACHE_DIR)
+    monkeypatch.delenv(jitcache.CACHE_DIR_ENV, raising=False)
+    assert jitcache.configure_cache_dir() is None
+    monkeypatch.setenv(jitcache.CACHE_DIR_ENV, str(tmp_path / "hot"))
+    assert jitcache.configure_cache_dir() == tmp_path / "hot"
+    assert numba.config.CACHE_DIR == os.environ["NUMBA_CACHE_DIR"] == str(tmp_path / "hot")
+
+
+def test_fresh_numba_cache_entry_is_not_stale(tmp_path):
+    (tmp_path / "plain_cache.py").write_text(
+        "from numba import njit\n\n@njit(cache=True)\ndef uno(x):\n    return x + 1\n\nuno(1)\n"
+    )
+    env = {k: v for k, v in os.environ.items() if k not in ("NUMBA_CACHE_DIR", jitcache.CACHE_DIR_ENV)}
+    result = subprocess.run(
+        [sys.executable, "-c", "import plain_cache"], cwd=tmp_path, env=env, capture_output=True, text=True
+    )
+    assert result.returncode == 0, result.stderr
+    stats = jitcache.cache_stats(tmp_path)
+    assert stats["functions"] == 1 and stats["entries"] == 1
+    assert stats["stale"] == {}
+
+
+def test_default_root_only_touches_pycache(monkeypatch, tmp_path):
+    monkeypatch.delenv("NUMBA_CACHE_DIR", raising=False)
+    monkeypatch.delenv(jitcache.CACHE_DIR_ENV, raising=False)
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "__pycache__").mkdir()
+    (tmp_path / "data").mkdir()
+    (tmp_path / "__pycache__" / "m.f-1.py311.nbi").write_bytes(b"")
+    (tmp_path / "data" / "ajeno.nbi").write_bytes(b"")
+    assert jitcache.cache_stats()["functions"] == 1
+    assert jitcache.clear_cache(everything=True)["removed"] == 1
+    assert (tmp_path / "data" / "ajeno.nbi").exists()
+
+
+def test_prewarm_lists_vectorized_and_guvectorized(tmp_path):
+    (tmp_path / "kernels_ufunc.py").write_text(
+        textwrap.dedent(
+            """
+            from smooth_criminal import guvectorized, vectorized
+
+            @vectorized(["float64(float64)"], cache=True)
+            def suma_uno(x):
+                return x + 1
+
+            @guvectorized(["void(float64[:], float64[:])"], "(n)->(n)", cache=True)
+            def copia(a, out):
+                out[:] = a
+
+            @vectorized
+            def dinamico(x):
+                return x * 2
+            """
+        )
+    )
+    script = (
+        "import json, numpy as np\n"
+        "from smooth_criminal import jitcache\n"
+        "from kernels_ufunc import dinamico\n"
+        "report = jitcache.prewarm('kernels_ufunc')\n"
+        "report['sample'] = dinamico.warmup(np.ones(2))\n"
+        "print(json.dumps(report))\n"
+    )
+    env = {k: v for k, v in os.environ.items() if k not in ("NUMBA_CACHE_DIR", jitcache.CACHE_DIR_ENV)}
+    env["PYTHONPATH"] = str(Path(__file__).resolve().parent.parent)
+    result = subprocess.run(
+        [sys.executable, "-c", script], cwd=tmp_path, env=env, capture_output=True, text=True
+    )
+    assert result.returncode == 0, result.stderr
+    report = json.loads(result.stdout.splitlines()[-1])
+    assert report["functions"] == {
+        "kernels_ufunc.suma_uno": ["d->d"],
+        "kernels_ufunc.copia": ["d->d"],
+        "kernels_ufunc.dinamico": [],
+    }
+    assert report["sample"] == ["d->d"]
@@ -0,0 +1,101 @@
+import asyncio
+import logging
+import os
+import subprocess
+import sys
+from types import FunctionType
+
+import pytest
+from numba.core.dispatcher import Dispatcher
+from smooth_criminal import core
+from smooth_criminal.core import bad, moonwalk, set_log_mode, smooth, vectorized
+
+
+def suma(a, b):
+    return a + b
+
+
+@pytest.fixture(autouse=True)
+def restore_mode(monkeypatch):
+    monkeypatch.setattr(core, "LOG_MODE", core.LOG_MODE)
+    monkeypatch.setattr(core, "LOG_SAMPLE_RATE", core.LOG_SAMPLE_RATE)
+
+
+def _hits(caplog):
+    return sum("Smooth Criminal" in m for m in caplog.messages)
+
+
+def test_off_mode_returns_numba_dispatchers():
+    set_log_mode("off")
+    fast = smooth(suma)
+    assert isinstance(fast, Dispatcher)
+    assert fast(1, 2) == 3
+    assert fast.warmup(1.0, 2.0) == ["(float64, float64)"]
+    assert isinstance(bad()(suma), Dispatcher)
+    assert not isinstance(vectorized(["float64(float64, float64)"])(suma), FunctionType)
+
+
+def test_off_mode_moonwalk_keeps_coroutines():
+    set_log_mode("off")
+
+    async def eco(x):
+        return x
+
+    assert moonwalk(eco) is eco
+    assert asyncio.run(moonwalk(suma)(1, 2)) == 3
+
+
+def test_once_mode_logs_first_call_only(caplog):
+    caplog.set_level(logging.INFO, logger="SmoothCriminal")
+    set_log_mode("once")
+    fast = smooth(suma)
+    for _ in range(3):
+        fast(1, 2)
+    assert _hits(caplog) == 1
+
+
+def test_sample_mode_logs_every_nth_call(caplog):
+    caplog.set_level(logging.INFO, logger="SmoothCriminal")
+    set_log_mode("sample", sample_rate=2)
+    fast = smooth(suma)
+    for _ in range(4):
+        fast(1, 2)
+    assert _hits(caplog) == 2
+
+
+def test_set_log_mode_validates():
+    with pytest.raises(ValueError):
+        set_log_mode("loud")
+    with pytest.raises(ValueError):
+        set_log_mode("sample", sample_rate=0)
+
+
+@pytest.mark.parametrize("raw", ["abc", "0", "-3", ""])
+def test_invalid_log_sample_env_falls_back_to_default(monkeypatch, caplog, raw):
+    monkeypatch.setenv("SMOOTH_CRIMINAL_LOG_SAMPLE", raw)
+    assert core._env_log_sample() == 100
+    assert "SMOOTH_CRIMINAL_LOG_SAMPLE" in caplog.text
+
+
+def test_log_env_parsing(monkeypatch, caplog):
+    monkeypatch.setenv("SMOOTH_CRIMINAL_LOG_SAMPLE", "25")
+    assert core._env_log_sample() == 25
+    monkeypatch.setenv("SMOOTH_CRIMINAL_LOG_MODE", "Sample")
+    assert core._env_log_mode() == "sample"
+    monkeypatch.setenv("SMOOTH_CRIMINAL_LOG_MODE", "loud")
+    assert core._env_log_mode() == "always"
+    assert "SMOOTH_CRIMINAL_LOG_MODE" in caplog.text
+
+
+def test_invalid_log_env_does_not_break_import():
+    env = {**os.environ, "SMOOTH_CRIMINAL_LOG_SAMPLE": "many", "SMOOTH_CRIMINAL_LOG_MODE": "loud"}
+    code = "from smooth_criminal import core; print(core.LOG_MODE, core.LOG_SAMPLE_RATE)"
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        env=env,
+        timeout=120,
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.split() == ["always", "100"]
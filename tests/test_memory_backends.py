@@ -37,3 +37,23 @@ def test_storage_backends(monkeypatch, tmp_path, backend):
     monkeypatch.delenv("SMOOTH_CRIMINAL_STORAGE", raising=False)
     importlib.reload(memory)
 
+
+
+@pytest.mark.parametrize("backend", ["json", "sqlite", "tinydb"])
+def test_storage_backends_metadata(monkeypatch, backend):
+    monkeypatch.setenv("SMOOTH_CRIMINAL_STORAGE", backend)
+    import smooth_criminal.memory as memory
+    importlib.reload(memory)
+
+    if memory.LOG_PATH.exists():
+        memory._BACKEND.clear_execution_history()
+
+    memory.log_execution_stats("demo", list, "@jam", 0.5, metadata={"chunksize": 16})
+    memory.log_execution_stats("demo", list, "@jam", 0.4)
+    history = memory.get_execution_history("demo")
+    assert history[0]["metadata"] == {"chunksize": 16}
+    assert "metadata" not in history[1]
+
+    assert memory._BACKEND.clear_execution_history()
+    monkeypatch.delenv("SMOOTH_CRIMINAL_STORAGE", raising=False)
+    importlib.reload(memory)
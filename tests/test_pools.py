@@ -0,0 +1,151 @@
+import gc
+import os
+import subprocess
+import sys
+import textwrap
+
+import pytest
+from smooth_criminal import pools, shipping
+from smooth_criminal.core import jam
+from smooth_criminal.pools import WorkerPool, get_pool, shutdown_pools
+
+
+@jam(workers=2, backend="process", persistent=True)
+def square(x):
+    return x * x
+
+
+def test_persistent_pool_is_reused(numbers):
+    expected = [n * n for n in numbers]
+    assert sorted(square(numbers)) == expected
+    executor = square.pool.executor
+    assert sorted(square(numbers)) == expected
+    assert square.pool.executor is executor
+    square.shutdown()
+    assert not square.pool.alive
+
+
+def test_pool_registry_shared_by_backend_and_workers():
+    assert get_pool("thread", 3) is get_pool("thread", 3)
+    assert get_pool("thread", 3) is not get_pool("process", 3)
+
+
+def test_pool_context_manager_and_prewarm(numbers):
+    @jam(workers=2, backend="thread", prewarm=True)
+    def double(x):
+        return x * 2
+
+    assert double.pool.alive
+    with double.pool:
+        assert sorted(double(numbers)) == [n * 2 for n in numbers]
+    assert not double.pool.alive
+    # El pool se recrea de forma perezosa si se vuelve a usar
+    assert sorted(double(numbers)) == [n * 2 for n in numbers]
+    shutdown_pools()
+    assert not double.pool.alive
+
+
+def test_non_persistent_jam_has_no_pool():
+    @jam(workers=2)
+    def identity(x):
+        return x
+
+    assert identity.pool is None
+    identity.shutdown()
+
+
+def test_worker_pool_unknown_backend():
+    with pytest.raises(ValueError):
+        WorkerPool("async", 2)
+
+
+def _closure(offset):
+    @jam(workers=1, backend="process", persistent=True)
+    def suma(x):
+        return x + offset
+
+    return suma
+
+
+def test_persistent_pools_are_bounded(monkeypatch):
+    monkeypatch.setattr(pools, "MAX_POOLS", 3)
+    closures = [_closure(offset) for offset in range(6)]
+    for offset, suma in enumerate(closures):
+        assert suma([1]) == [1 + offset]
+    assert len(pools._POOLS) == 3
+    assert sum(pool.alive for pool in pools._POOLS.values()) <= 3
+    assert [suma.pool.alive for suma in closures[:3]] == [False] * 3
+
+    # Un pool expulsado vuelve al registro (y expulsa a otro) si se reutiliza.
+    assert closures[0]([1]) == [1]
+    assert closures[0].pool in pools._POOLS.values()
+    assert len(pools._POOLS) == 3
+
+    # Solo los pools que siguen registrados mantienen viva su función.
+    tokens = [shipping.function_token(suma._jam_target) for suma in closures]
+    shutdown_pools()
+    del closures, suma
+    gc.collect()
+    assert len(set(tokens) & set(shipping._REGISTERED)) <= 3
+
+
+def test_evicted_pool_stays_open_while_borrowed(monkeypatch):
+    monkeypatch.setattr(pools, "MAX_POOLS", 1)
+    closures = [_closure(offset) for offset in range(2)]
+    # ``imap`` envía porciones poco a poco: expulsar su pool a mitad de la
+    # iteración no debe cerrarlo hasta que termine.
+    stream = closures[0].imap(range(6), ordered=True, prefetch=1)
+    assert next(stream) == 0
+    assert closures[1]([1]) == [2]
+    assert closures[0].pool not in pools._POOLS.values()
+    assert closures[0].pool.alive
+    assert list(stream) == [1, 2, 3, 4, 5]
+    assert not closures[0].pool.alive
+    shutdown_pools()
+
+
+def test_process_pools_avoid_fork_after_a_tbb_region(tmp_path):
+    # Un ``fork`` tras una región paralela con TBB deja al proceso padre
+    # bloqueado al terminar; los pools deben arrancar con ``forkserver``.
+    script = tmp_path / "tbb_fork.py"
+    script.write_text(
+        textwrap.dedent(
+            """
+            import numba
+            import numpy as np
+            from smooth_criminal import pools
+            from smooth_criminal.core import jam
+
+            @numba.njit(parallel=True)
+            def total(a):
+                s = 0.0
+                for i in numba.prange(a.size):
+                    s += a[i]
+                return s
+
+            @jam(workers=2, backend="process", ordered=True)
+            def square(x):
+                return x * x
+
+            if __name__ == "__main__":
+                try:
+                    total(np.ones(10))
+                except ValueError:  # Numba sin TBB en este entorno.
+                    print("no-tbb")
+                    raise SystemExit
+                assert pools.process_start_method() != "fork"
+                assert square([1, 2, 3]) == [1, 4, 9]
+                print("ok")
+            """
+        )
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    path = os.pathsep.join(filter(None, [root, os.environ.get("PYTHONPATH")]))
+    env = {**os.environ, "NUMBA_THREADING_LAYER": "tbb", "PYTHONPATH": path}
+    result = subprocess.run(
+        [sys.executable, str(script)], capture_output=True, text=True, env=env, timeout=120
+    )
+    assert result.returncode == 0, result.stderr
+    if result.stdout.split()[-1] == "no-tbb":
+        pytest.skip("Numba no dispone de la capa TBB")
+    assert result.stdout.split()[-1] == "ok"
@@ -0,0 +1,51 @@
+import time
+
+import pytest
+from smooth_criminal.core import jam
+from smooth_criminal.scheduling import RangeDeque, split_ranges
+
+
+def test_split_ranges_covers_input():
+    deques = split_ranges(10, 3)
+    assert [(d.lo, d.hi) for d in deques] == [(0, 4), (4, 7), (7, 10)]
+
+
+def test_range_deque_steal_half():
+    deque = RangeDeque(0, 10)
+    assert deque.pop_front() == (0, 1)
+    assert deque.steal_half() == (5, 10)
+    assert deque.remaining == 4
+    single = RangeDeque(3, 4)
+    assert single.steal_half() == (3, 4)
+    assert single.steal_half() is None
+
+
+def test_steal_schedule_balances_skewed_threads():
+    @jam(workers=4, backend="thread", schedule="steal", ordered=True)
+    def skewed(x):
+        # Los primeros elementos son mucho más caros que el resto
+        time.sleep(0.02 if x < 4 else 0.001)
+        return x * 2
+
+    data = list(range(40))
+    assert skewed(data) == [x * 2 for x in data]
+    stats = skewed.stats["workers"]
+    assert len(stats) == 4
+    assert sum(w["items"] for w in stats) == 40
+    assert sum(w["steals"] for w in stats) > 0
+    assert all(w["busy"] >= 0 and w["idle"] >= 0 for w in stats)
+
+
+@jam(workers=2, backend="process", schedule="steal", chunksize=2)
+def cube(x):
+    return x ** 3
+
+
+def test_steal_schedule_process(numbers):
+    assert sorted(cube(numbers)) == [n ** 3 for n in numbers]
+    assert sum(w["items"] for w in cube.stats["workers"]) == len(numbers)
+
+
+def test_unknown_schedule():
+    with pytest.raises(ValueError):
+        jam(workers=2, schedule="guided")
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+from smooth_criminal.core import jam
+
+
+@jam(workers=2, backend="process", shared_memory=True, chunksize=3)
+def row_norm(row):
+    return np.sqrt((row ** 2).sum())
+
+
+@jam(workers=2, backend="process", shared_memory=True)
+def halve(x):
+    if x == 3:
+        raise ValueError("boom")
+    return x / 2
+
+
+def test_shared_memory_rows_keep_order():
+    data = np.arange(40, dtype=np.float64).reshape(10, 4)
+    result = row_norm(data)
+    assert isinstance(result, np.ndarray)
+    np.testing.assert_allclose(result, np.linalg.norm(data, axis=1))
+
+
+def test_shared_memory_drops_failures():
+    data = np.arange(6)
+    result = halve(data)
+    np.testing.assert_array_equal(result, np.array([0.0, 0.5, 1.0, 2.0, 2.5]))
+
+
+def test_shared_memory_ignored_for_lists(numbers):
+    assert sorted(row_norm([np.array([3.0, 4.0])])) == [5.0]
+
+
+@pytest.mark.parametrize("backend", ["thread", "async", "interpreter", "cluster"])
+def test_shared_memory_requires_process_backend(backend):
+    with pytest.raises(ValueError, match="shared_memory"):
+        jam(backend=backend, shared_memory=True, nodes=["127.0.0.1:1"])
@@ -0,0 +1,87 @@
+import pickle
+import sys
+
+import pytest
+from numba import njit
+from smooth_criminal import shipping
+from smooth_criminal.core import jam, smooth
+
+
+def doble(x):
+    return x * 2
+
+
+@jam(workers=2, backend="process")
+def triple(x):
+    return x * 3
+
+
+def make_probe(kernel):
+    def probe(x):
+        # Firmas que el worker ya tenía antes de procesar su primer elemento.
+        seen = [str(sig) for sig in kernel.signatures]
+        kernel(x)
+        return seen
+
+    return probe
+
+
+def test_serialize_prefers_reference():
+    assert shipping.serialize(doble) == ("ref", (__name__, "doble"))
+    assert shipping.serialize(triple._jam_target)[0] == "ref"
+
+
+def test_serialize_ships_closures_by_value():
+    factor = 5
+    kind, data = shipping.serialize(lambda x: x * factor)
+    assert kind == "value"
+    assert pickle.loads(data)(2) == 10
+
+
+def test_serialize_without_cloudpickle(monkeypatch):
+    monkeypatch.setitem(sys.modules, "cloudpickle", None)
+    monkeypatch.setattr(shipping.pools, "process_start_method", lambda: "fork")
+    assert shipping.serialize(lambda x: x) == ("inherit", None)
+    # Con ``forkserver`` los workers no heredan nada del proceso padre.
+    monkeypatch.setattr(shipping.pools, "process_start_method", lambda: "forkserver")
+    with pytest.raises(pickle.PicklingError):
+        shipping.serialize(lambda x: x)
+    with pytest.raises(pickle.PicklingError):
+        shipping.serialize(lambda x: x, inherit=False)
+
+
+def test_process_backend_runs_closures_and_lambdas():
+    offset = 10
+
+    @jam(workers=2, backend="process", ordered=True)
+    def suma(x):
+        return x + offset
+
+    assert suma([1, 2, 3]) == [11, 12, 13]
+    assert jam(workers=2, backend="process", ordered=True)(lambda x: -x)([1, 2]) == [-1, -2]
+    assert sorted(triple([1, 2])) == [3, 6]
+
+
+def test_numba_dispatchers_found_through_wrappers():
+    def cuadrado(x):
+        return x * x
+
+    wrapped = smooth(cuadrado)
+    assert len(shipping.numba_dispatchers(wrapped)) == 1
+    assert shipping.numba_dispatchers(doble) == []
+
+
+def test_warm_compiles_known_signatures():
+    kernel = njit(lambda x: x + 1)
+    kernel(1.5)
+    fresh = njit(lambda x: x + 1)
+    probe = make_probe(fresh)
+    assert shipping.warm(probe, shipping.compiled_signatures(make_probe(kernel))) == 1
+    assert [str(sig) for sig in fresh.signatures] == ["(float64,)"]
+
+
+def test_workers_start_with_parent_signatures():
+    kernel = njit(lambda x: x * 2.0)
+    kernel(1.0)
+    wrapped = jam(workers=1, backend="process")(make_probe(kernel))
+    assert wrapped([3.0]) == [["(float64,)"]]
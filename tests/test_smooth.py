@@ -1,5 +1,9 @@
+import threading
+import time
+
 import pytest
-from smooth_criminal.core import smooth
+from smooth_criminal import memory, shipping
+from smooth_criminal.core import smooth, warmup_all
 
 
 @smooth
@@ -17,3 +21,181 @@ def test_smooth_exception(failing_func):
     with pytest.raises(ValueError):
         wrapped()
 
+
+
+@smooth(signatures=["float64(float64)"])
+def half(x):
+    return x / 2
+
+
+def _compiled(wrapper):
+    (dispatcher,) = shipping.numba_dispatchers(wrapper)
+    return [str(sig) for sig in dispatcher.signatures]
+
+
+def test_smooth_compiles_declared_signatures_eagerly():
+    assert "(float64,)" in _compiled(half)
+    assert half.signatures == ["float64(float64)"]
+
+
+def test_smooth_warmup_with_sample_args():
+    assert half.warmup(3) == ["(int64,)"]
+    assert "(int64,)" in _compiled(half)
+    assert half(4) == 2.0
+
+
+def test_warmup_all_includes_registered_functions():
+    report = warmup_all()
+    assert "(float64,)" in report[f"{__name__}.half"]
+
+
+def _wait_for(wrapper, timeout=30.0):
+    deadline = time.perf_counter() + timeout
+    while wrapper.jit_status() == "compiling" and time.perf_counter() < deadline:
+        time.sleep(0.01)
+    return wrapper.jit_status()
+
+
+def test_smooth_background_serves_python_until_compiled():
+    def triple(x):
+        return x * 3
+
+    wrapped = smooth(background=True)(triple)
+    assert wrapped.jit_status() == "idle"
+    assert wrapped(2) == 6
+    assert _wait_for(wrapped) == "compiled"
+    assert "(int64,)" in _compiled(wrapped)
+    assert wrapped(5) == 15
+
+
+def test_smooth_background_compiles_new_signatures_off_the_request_path(monkeypatch):
+    def doble(x):
+        return x * 2
+
+    wrapped = smooth(background=True)(doble)
+    assert wrapped(2) == 4
+    assert _wait_for(wrapped) == "compiled"
+
+    (dispatcher,) = shipping.numba_dispatchers(wrapped)
+    release = threading.Event()
+    real_compile = dispatcher.compile
+
+    def slow_compile(sig):
+        release.wait(30)
+        return real_compile(sig)
+
+    monkeypatch.setattr(dispatcher, "compile", slow_compile)
+    assert wrapped(2.5) == 5.0  # no espera a la compilación de float64
+    assert wrapped.jit_status() == "compiling"
+    assert "(float64,)" not in _compiled(wrapped)
+    assert wrapped(3) == 6
+    release.set()
+    assert _wait_for(wrapped) == "compiled"
+    assert "(float64,)" in _compiled(wrapped)
+    assert wrapped(1.5) == 3.0
+
+
+def test_smooth_background_stays_in_python_when_compilation_fails(monkeypatch):
+    logged = []
+    monkeypatch.setattr(memory, "log_execution_stats", lambda **kw: logged.append(kw))
+
+    def raro(x):
+        return object() if x else None
+
+    wrapped = smooth(background=True)(raro)
+    assert wrapped(0) is None
+    assert _wait_for(wrapped) == "python"
+    assert wrapped(0) is None
+    assert list(wrapped.failed_signatures) == [("int",)]
+    assert [kw["decorator_used"] for kw in logged] == ["@smooth:fallback"]
+
+
+def test_smooth_background_compile_budget():
+    def cuadrado(x):
+        return x * x
+
+    wrapped = smooth(background=True, compile_budget=1e-9)(cuadrado)
+    assert wrapped(3.0) == 9.0
+    assert _wait_for(wrapped) == "python"
+    assert wrapped(4.0) == 16.0
+    with pytest.raises(ValueError):
+        smooth(compile_budget=1.0)
+
+
+def test_smooth_remembers_failed_signatures(monkeypatch, caplog):
+    logged = []
+    monkeypatch.setattr(memory, "log_execution_stats", lambda **kw: logged.append(kw))
+
+    def tam(x):
+        return len(x)
+
+    wrapped = smooth(tam)
+    assert wrapped({"a": 1}) == 1
+    assert wrapped({"b": 2, "c": 3}) == 2
+    assert wrapped((1, 2, 3)) == 3
+    assert list(wrapped.failed_signatures) == [("dict",)]
+    assert sum("Beat it!" in m for m in caplog.messages) == 1
+    assert [entry["decorator_used"] for entry in logged] == ["@smooth:fallback"]
+    assert logged[0]["metadata"]["signature"] == ["dict"]
+
+
+def test_smooth_does_not_remember_user_errors(failing_func):
+    wrapped = smooth(failing_func)
+    with pytest.raises(ValueError):
+        wrapped()
+    assert wrapped.failed_signatures == {}
+
+
+def _pondera(xs, pesos):
+    total = 0.0
+    for i in range(len(xs)):
+        total += xs[i] * pesos[i % len(pesos)]
+    return total
+
+
+def test_smooth_convert_caches_containers_by_identity(monkeypatch):
+    logged = []
+    monkeypatch.setattr(memory, "log_execution_stats", lambda **kw: logged.append(kw))
+    wrapped = smooth(convert="array")(_pondera)
+    xs = [1.0, 2.0, 3.0]
+    pesos = {0: 1.0, 1: 10.0}
+    assert wrapped(xs, pesos) == 24.0
+    assert wrapped(xs, pesos) == 24.0
+    stats = wrapped.conversion_stats()
+    assert stats["conversions"] == 2 and stats["cache_hits"] == 2
+    assert [entry["decorator_used"] for entry in logged] == ["@smooth:convert"]
+    metadata = logged[0]["metadata"]
+    assert metadata["converted"] == ["list[float] -> ndarray[float64, 1d]", "dict -> Dict"]
+    assert metadata["kernel"] == logged[0]["duration"] and metadata["conversion"] > 0
+
+    xs.append(4.0)  # cambia la longitud: se vuelve a convertir
+    assert wrapped(xs, pesos) == 64.0
+    assert wrapped.conversion_stats()["conversions"] == 3
+
+
+def test_smooth_convert_typed_lists():
+    def longitudes(palabras):
+        n = 0
+        for p in palabras:
+            n += len(p)
+        return n
+
+    wrapped = smooth(convert="typed")(longitudes)
+    assert wrapped(["ab", "c"]) == 3
+    assert wrapped.failed_signatures == {}
+
+
+def test_smooth_convert_fallback_receives_original_arguments():
+    def crece(xs):
+        xs.append(0.0)
+        return len(xs)
+
+    wrapped = smooth(convert="array")(crece)
+    assert wrapped([1.0, 2.0]) == 3
+
+
+def test_smooth_convert_validates():
+    with pytest.raises(ValueError):
+        smooth(convert="tuple")
+    with pytest.raises(ValueError):
+        smooth(convert="array", background=True)
@@ -0,0 +1,113 @@
+from types import SimpleNamespace
+
+import numba
+import numpy as np
+import pytest
+from numba import float64
+from numba.core.errors import TypingError
+from smooth_criminal import memory
+from smooth_criminal.core import smooth
+
+
+@smooth
+class Particula:
+    x: float
+    v: float
+    trayecto: float64[:]
+
+    def __init__(self, x, v):
+        self.x = x
+        self.v = v
+        self.trayecto = np.zeros(4)
+
+    def avanza(self, dt, pasos):
+        for i in range(pasos):
+            self.x += self.v * dt
+            self.trayecto[i % 4] = self.x
+        return self.x
+
+    def etiqueta(self):
+        return [self.x, "m"]
+
+    @staticmethod
+    def doble(a):
+        return a * 2
+
+
+def test_smooth_class_compiles_annotated_attributes():
+    p = Particula(0.0, 2.0)
+    assert Particula.jitclass_error is None
+    assert isinstance(p, Particula)
+    assert p.avanza(0.5, 4) == 4.0
+    assert p.x == 4.0
+    np.testing.assert_allclose(p.trayecto, [1.0, 2.0, 3.0, 4.0])
+    assert Particula.doble(3) == 6 and p.doble(2) == 4
+
+
+def test_smooth_class_method_falls_back_to_python(monkeypatch, caplog):
+    logged = []
+    monkeypatch.setattr(memory, "log_execution_stats", lambda **kw: logged.append(kw))
+    p = Particula(1.0, 0.0)
+    assert p.etiqueta() == [1.0, "m"]
+    assert p.etiqueta() == [1.0, "m"]
+    assert "Falling back" in caplog.text
+    assert list(Particula.failed_signatures["etiqueta"]) == [("Particula",)]
+    assert [kw["decorator_used"] for kw in logged] == ["@smooth:fallback"]
+
+
+def test_smooth_class_constructor_does_not_change_type():
+    @smooth
+    class Nombre:
+        n: int
+
+        def __init__(self, n):
+            self.n = n
+
+    # Sin *fallback* en el constructor: todas las instancias son de la
+    # jitclass, y si Numba no puede crearla se ve su error.
+    assert isinstance(Nombre(3), Nombre)
+    with pytest.raises(TypingError):
+        Nombre(SimpleNamespace(n=3))
+    assert "__init__" not in Nombre.failed_signatures
+
+
+def test_smooth_class_stays_python_on_untested_numba(monkeypatch):
+    monkeypatch.setattr(numba, "__version__", "9.0.0")
+
+    @smooth
+    class Punto:
+        x: float
+
+        def __init__(self, x):
+            self.x = x
+
+        @staticmethod
+        def doble(a):
+            return a * 2
+
+    assert Punto.jitclass_error == "RuntimeError: numba 9.0.0 is not supported for @smooth classes"
+    assert type(Punto(1.5)) is Punto and Punto(1.5).x == 1.5
+    assert Punto.doble(2) == 4
+
+
+def test_smooth_class_without_annotations_stays_python():
+    @smooth
+    class Libre:
+        def __init__(self, a):
+            self.a = a
+
+        @staticmethod
+        def siguiente(x):
+            return x + 1
+
+    assert Libre.jitclass_error == "TypeError: no annotated attributes"
+    assert Libre(2).a == 2
+    assert Libre.siguiente(1) == 2
+
+
+def test_smooth_class_rejects_signatures():
+    class Punto:
+        x: float
+
+    with pytest.raises(ValueError):
+        smooth(Punto, signatures=["float64()"])
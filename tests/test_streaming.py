@@ -0,0 +1,112 @@
+import subprocess
+import sys
+import textwrap
+
+import numpy as np
+import pytest
+from smooth_criminal.core import guvectorized, vectorized
+from smooth_criminal.streaming import stream
+
+
+@vectorized(["float64(float64, float64)"])
+def escala(x, k):
+    return x * k + 1.0
+
+
+@guvectorized(["void(float64[:], float64, float64[:])"], "(n),()->(n)")
+def desplaza(x, k, res):
+    for i in range(x.shape[0]):
+        res[i] = x[i] + k
+
+
+def test_vectorized_stream_over_memmaps(tmp_path):
+    data = np.lib.format.open_memmap(tmp_path / "in.npy", mode="w+", dtype=np.float64, shape=(1000,))
+    data[:] = np.arange(1000)
+    out = np.lib.format.open_memmap(tmp_path / "out.npy", mode="w+", dtype=np.float64, shape=(1000,))
+    result = escala.stream(data, 2.0, out, block_size=64, threads=2)
+    assert result is out
+    np.testing.assert_allclose(np.load(tmp_path / "out.npy"), np.arange(1000) * 2.0 + 1.0)
+
+
+def test_guvectorized_stream_creates_output_file(tmp_path):
+    data = np.arange(30.0).reshape(10, 3)
+    result = desplaza.stream(data, 1.0, out=tmp_path / "out.npy", block_size=3)
+    assert isinstance(result, np.memmap)
+    np.testing.assert_allclose(np.load(tmp_path / "out.npy"), data + 1.0)
+
+
+@guvectorized(["void(float64[:], float64[:])"], "(n)->(n)")
+def dbl(x, out):
+    for i in range(x.shape[0]):
+        out[i] = x[i] * 2
+
+
+@guvectorized(["void(float64[:], float64[:])"], "(n)->()")
+def suma_fila(x, res):
+    acc = 0.0
+    for i in range(x.shape[0]):
+        acc += x[i]
+    res[0] = acc
+
+
+def test_gufunc_stream_to_path_falls_back_to_python(tmp_path, caplog):
+    data = (np.arange(12.0) + 1j).reshape(4, 3)  # Numba solo tiene la firma float64
+    result = dbl.stream(data, out=tmp_path / "out.npy", block_size=3)
+    np.testing.assert_allclose(np.load(tmp_path / "out.npy"), data * 2)
+    assert result.dtype == np.complex128
+    assert "Falling back" in caplog.text
+
+    sums = suma_fila.stream(data, out=tmp_path / "sums.npy", block_size=3)
+    np.testing.assert_allclose(sums, data.sum(axis=1))
+
+
+def test_stream_falls_back_to_python(caplog):
+    def kernel(*args, **kwargs):
+        raise TypeError("sin firma")
+
+    out = np.empty(5)
+    stream(kernel, lambda x: x - 1, (np.arange(5.0),), out, block_size=2)
+    np.testing.assert_allclose(out, np.arange(5.0) - 1)
+    assert "Falling back" in caplog.text
+
+
+def test_stream_validates_arguments():
+    with pytest.raises(TypeError):
+        escala.stream(np.arange(3.0), 2.0)
+    with pytest.raises(ValueError):
+        escala.stream(np.arange(3.0), 2.0, np.empty(4))
+    with pytest.raises(ValueError):
+        escala.stream(np.arange(3.0), 2.0, np.empty(3), threads=0)
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="ru_maxrss en KiB solo en Linux")
+def test_stream_keeps_resident_memory_bounded(tmp_path):
+    script = textwrap.dedent(
+        f"""
+        import resource
+        import numpy as np
+        from smooth_criminal.core import vectorized
+
+        @vectorized(["float64(float64)"])
+        def doble(x):
+            return x * 2.0
+
+        rows = 10_000_000  # 80 MB por fichero
+        with open({str(tmp_path / "in.raw")!r}, "wb") as f:
+            for _ in range(10):
+                np.ones(rows // 10).tofile(f)
+        src = np.memmap({str(tmp_path / "in.raw")!r}, dtype=np.float64, mode="r", shape=(rows,))
+        dst = np.memmap({str(tmp_path / "out.raw")!r}, dtype=np.float64, mode="w+", shape=(rows,))
+        doble(src[:10])
+        before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        doble.stream(src, out=dst)
+        after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        assert dst[-1] == 2.0
+        print((after - before) // 1024)
+        """
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, timeout=240
+    )
+    assert result.returncode == 0, result.stderr
+    assert int(result.stdout.split()[-1]) < 40
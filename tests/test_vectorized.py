@@ -1,4 +1,10 @@
+import json
+import threading
+import time
+
 import numpy as np
+import pytest
+from smooth_criminal import memory
 from smooth_criminal.core import vectorized
 
 
@@ -20,3 +26,112 @@ def test_vectorized_fallback():
 
     arr = np.array([1.0, 2.0])
     np.testing.assert_array_equal(inc(arr), np.array([2.0, 3.0]))
+
+
+def test_vectorized_remembers_failed_signatures(monkeypatch):
+    monkeypatch.setattr(memory, "log_execution_stats", lambda **kw: None)
+
+    @vectorized(["float64(float64)"])
+    def twice(x):
+        return x * 2
+
+    assert twice(["a", "b"]) == ["a", "b", "a", "b"]
+    assert list(twice.failed_signatures) == [("list[str]",)]
+    np.testing.assert_array_equal(twice(np.array([1.0])), np.array([2.0]))
+
+
+def _scale(x, y):
+    return x * y + 1.0
+
+
+def test_vectorized_auto_target_with_crossover():
+    scale = vectorized(["float64(float64, float64)"], auto_target=True, crossover=1000)(_scale)
+    small, large = np.ones(10), np.ones(5000)
+    assert scale.select_target(small, 2.0) == "cpu"
+    assert scale.select_target(large, 2.0) == "parallel"
+    np.testing.assert_array_equal(scale(large, 2.0), np.full(5000, 3.0))
+    np.testing.assert_array_equal(scale(small, 2.0), np.full(10, 3.0))
+
+
+def _wait_for_crossover(wrapper, timeout=30.0):
+    deadline = time.perf_counter() + timeout
+    while wrapper.crossover() is None and time.perf_counter() < deadline:
+        time.sleep(0.01)
+
+
+def test_vectorized_auto_target_calibrates_once(monkeypatch, tmp_path):
+    from smooth_criminal import crossover
+
+    monkeypatch.setenv("SMOOTH_CRIMINAL_CROSSOVER_PATH", str(tmp_path / "xo.json"))
+    monkeypatch.setattr(crossover, "CALIBRATION_SIZES", (16, 64))
+    calls = []
+    monkeypatch.setattr(crossover, "calibrate", lambda *a, **k: calls.append(a) or 64)
+
+    scale = vectorized(["float64(float64, float64)"], auto_target=True)(_scale)
+    assert scale.crossover() is None
+    assert scale.select_target(2.0, 3.0) == "cpu"  # sin arreglos no se calibra
+    np.testing.assert_array_equal(scale(np.ones(100), 3.0), np.full(100, 4.0))
+    _wait_for_crossover(scale)
+    assert scale.select_target(np.ones(100), 3.0) == "parallel"
+    assert scale.crossover() == 64 and len(calls) == 1
+    # La calibración usa una copia reducida, no la entrada de la llamada.
+    assert calls[0][2][0].shape == (16,)
+
+    again = vectorized(["float64(float64, float64)"], auto_target=True)(_scale)
+    assert again.crossover() == 64 and len(calls) == 1
+
+    data = json.loads((tmp_path / "xo.json").read_text())
+    (entry,) = data.values()
+    assert next(iter(entry.values()))["calibrated"].endswith("+00:00")
+
+
+def test_vectorized_auto_target_does_not_calibrate_on_the_request_path(monkeypatch, tmp_path):
+    from smooth_criminal import crossover
+
+    monkeypatch.setenv("SMOOTH_CRIMINAL_CROSSOVER_PATH", str(tmp_path / "xo.json"))
+    release = threading.Event()
+
+    def slow_calibrate(*args, **kwargs):
+        release.wait(30)
+        return 8
+
+    monkeypatch.setattr(crossover, "calibrate", slow_calibrate)
+    scale = vectorized(["float64(float64, float64)"], auto_target=True)(_scale)
+    start = time.perf_counter()
+    np.testing.assert_array_equal(scale(np.ones(10), 1.0), np.full(10, 2.0))
+    assert time.perf_counter() - start < 5
+    assert scale.select_target(np.ones(10), 1.0) == "cpu"
+    release.set()
+    _wait_for_crossover(scale)
+    assert scale.select_target(np.ones(10), 1.0) == "parallel"
+
+
+def test_vectorized_auto_target_explicit_calibrate(monkeypatch, tmp_path):
+    from smooth_criminal import crossover
+
+    monkeypatch.setenv("SMOOTH_CRIMINAL_CROSSOVER_PATH", str(tmp_path / "xo.json"))
+    monkeypatch.setattr(crossover, "calibrate", lambda *a, **k: float("inf"))
+    scale = vectorized(["float64(float64, float64)"], auto_target=True)(_scale)
+    assert scale.calibrate(np.ones(4), 2.0) == float("inf")
+    assert scale.select_target(np.ones(10_000), 2.0) == "cpu"
+
+
+def test_calibrate_returns_inf_when_parallel_never_wins():
+    from smooth_criminal import crossover
+
+    def slow(x):
+        time.sleep(0.002)
+        return x.copy()
+
+    def fast(x):
+        return x.copy()
+
+    assert crossover.calibrate(fast, slow, (np.ones(4),), sizes=(8, 16)) == float("inf")
+    assert crossover.calibrate(slow, fast, (np.ones(4),), sizes=(8, 16)) == 8
+
+
+def test_vectorized_auto_target_requires_signatures():
+    with pytest.raises(ValueError):
+        vectorized(auto_target=True)
+    with pytest.raises(ValueError):
+        vectorized(["float64(float64)"], crossover=10)